@@ -3,14 +3,9 @@ TaxCheck - 収入の壁チェッカー（Streamlitアプリ）
 """
 
 import streamlit as st
-import sys
-from pathlib import Path
 
-# バックエンドモジュールをインポート
-sys.path.append(str(Path(__file__).parent / "backend"))
-from calculator_parttime import calculate_parttime_tax
-from calculator_freelance import calculate_freelance_tax
-from walls_data import INCOME_WALLS_PARTTIME, INCOME_WALLS_FREELANCE, EXPENSE_RATES_BY_BUSINESS
+# バックエンドの各モジュールは最初に使うときに読み込まれる
+import backend
 
 # ページ設定
 st.set_page_config(
@@ -30,27 +25,95 @@ app_mode = st.sidebar.radio(
     ["アルバイト・パート版", "業務委託版", "収入の壁について"]
 )
 
+# 年分（控除額・壁の金額はこの年分のルールで計算）
+tax_years = backend.available_tax_years()
+tax_year = st.sidebar.selectbox(
+    "年分",
+    tax_years,
+    index=tax_years.index(backend.DEFAULT_TAX_YEAR),
+    format_func=lambda year: f"{year}年分"
+)
+
 # セッションステートの初期化
 if 'monthly_incomes' not in st.session_state:
     st.session_state.monthly_incomes = [0] * 12
 
+if 'income_tracker' not in st.session_state:
+    st.session_state.income_tracker = backend.IncomeTracker(year=backend.DEFAULT_TAX_YEAR)
+
 if 'monthly_revenues' not in st.session_state:
     st.session_state.monthly_revenues = [0] * 12
 
 if 'monthly_expenses' not in st.session_state:
     st.session_state.monthly_expenses = [0] * 12
 
+if 'parttime_calculated' not in st.session_state:
+    st.session_state.parttime_calculated = False
+
+if 'freelance_calculated' not in st.session_state:
+    st.session_state.freelance_calculated = False
+
+
+@st.cache_data(max_entries=4096, show_spinner=False)
+def cached_parttime_result(age, annual_income, is_student, dependent_code, company_size_code, weekly_hours, tax_year):
+    """入力の組ごとに計算結果をキャッシュ（アルバイト・パート版）"""
+    return backend.calculate_parttime_tax(
+        age=age,
+        annual_income=annual_income,
+        is_student=is_student,
+        dependent_type=dependent_code,
+        company_size=company_size_code,
+        weekly_hours=weekly_hours,
+        tax_year=tax_year
+    )
+
+
+@st.cache_data(max_entries=4096, show_spinner=False)
+def cached_freelance_result(
+    age, annual_revenue, annual_expense, is_student, dependent_code, tax_filing_code, business_type_code, tax_year
+):
+    """入力の組ごとに計算結果をキャッシュ（業務委託版）"""
+    return backend.calculate_freelance_tax(
+        age=age,
+        annual_revenue=annual_revenue,
+        annual_expense=annual_expense,
+        is_student=is_student,
+        dependent_type=dependent_code,
+        tax_filing_type=tax_filing_code,
+        business_type=business_type_code,
+        tax_year=tax_year
+    )
+
+
+# 年分ごとの典型的な境界早見表（アルバイト・パート版）
+BOUNDARY_TABLES = {
+    2024: [
+        ("〜103万円", "所得税なし", "扶養OK"),
+        ("103〜106万円", "所得税あり", "社保は条件次第"),
+        ("106〜130万円", "所得税あり", "学生除外なら社保なし"),
+        ("130〜150万円", "扶養喪失リスク", "親の負担増"),
+        ("150〜201万円", "所得税＋住民税発生", "完全自立ゾーン"),
+    ],
+    2025: [
+        ("〜106万円", "所得税なし", "扶養OK"),
+        ("106〜123万円", "所得税なし", "社保は条件次第"),
+        ("123〜130万円", "所得税なし", "親の扶養控除は特定親族特別控除へ（19〜22歳）"),
+        ("130〜160万円", "扶養喪失リスク", "社保の扶養から外れる・150万円超で親の控除が減少"),
+        ("160万円〜", "所得税発生", "完全自立ゾーン"),
+    ]
+}
+
 
 def display_walls_info():
     """収入の壁の情報を表示"""
-    st.header("📊 収入の壁について")
+    st.header(f"📊 収入の壁について（{tax_year}年分）")
 
     tab1, tab2 = st.tabs(["アルバイト・パート版", "業務委託版"])
 
     with tab1:
         st.subheader("アルバイト・パートの5本柱")
 
-        for wall in INCOME_WALLS_PARTTIME:
+        for wall in backend.get_rules(tax_year).walls["parttime"].walls:
             with st.expander(f"**{wall['name']}** - {wall['category']}", expanded=False):
                 st.markdown(f"**金額**: {wall['amount']:,}円")
                 st.markdown(f"**説明**: {wall['description']}")
@@ -68,15 +131,7 @@ def display_walls_info():
         st.markdown("---")
         st.markdown("### 典型的な境界早見表")
 
-        table_data = [
-            ("〜103万円", "所得税なし", "扶養OK"),
-            ("103〜106万円", "所得税あり", "社保は条件次第"),
-            ("106〜130万円", "所得税あり", "学生除外なら社保なし"),
-            ("130〜150万円", "扶養喪失リスク", "親の負担増"),
-            ("150〜201万円", "所得税＋住民税発生", "完全自立ゾーン"),
-        ]
-
-        for income_range, impact, detail in table_data:
+        for income_range, impact, detail in BOUNDARY_TABLES.get(tax_year, []):
             col1, col2, col3 = st.columns(3)
             col1.markdown(f"**{income_range}**")
             col2.markdown(impact)
@@ -85,7 +140,7 @@ def display_walls_info():
     with tab2:
         st.subheader("業務委託の5本柱")
 
-        for wall in INCOME_WALLS_FREELANCE:
+        for wall in backend.get_rules(tax_year).walls["freelance"].walls:
             with st.expander(f"**{wall['name']}** - {wall['category']}", expanded=False):
                 st.markdown(f"**金額**: {wall['amount']:,}円")
                 st.markdown(f"**説明**: {wall['description']}")
@@ -146,6 +201,12 @@ def display_parttime_app():
     }
     company_size_code = company_size_map[company_size]
 
+    parttime_income_and_result(age, is_student, dependent_code, company_size_code, weekly_hours, tax_year)
+
+
+@st.fragment
+def parttime_income_and_result(age, is_student, dependent_code, company_size_code, weekly_hours, tax_year):
+    """収入入力と計算結果（月別入力の変更時はこの部分だけ再実行）"""
     # 収入入力
     st.subheader("2. 月別収入入力")
 
@@ -176,67 +237,113 @@ def display_parttime_app():
                     key=f"income_{i}"
                 )
 
-        annual_income = sum(st.session_state.monthly_incomes)
+        # 年分を切り替えたら入力済みの月を引き継いで作り直す
+        tracker = st.session_state.income_tracker
+        if tracker.year != tax_year:
+            tracker = backend.IncomeTracker(tracker.entered_incomes, year=tax_year)
+            st.session_state.income_tracker = tracker
+
+        # 変更された月だけ累計に反映
+        for i, amount in enumerate(st.session_state.monthly_incomes):
+            if amount != tracker.monthly_incomes[i]:
+                tracker.update(i + 1, amount)
+
+        summary = tracker.summary()
+        annual_income = summary["total"]
         st.markdown(f"**年間合計**: {annual_income:,}円")
 
-    # 計算ボタン
+        # 入力済みの月のペースで壁を超える月を予測
+        if 0 < summary["enteredMonths"] < 12:
+            st.markdown(f"**年間見込み**: {summary['projectedAnnual']:,}円（月平均 {summary['monthlyAverage']:,}円）")
+            if summary["nextCrossing"]:
+                crossing = summary["nextCrossing"]
+                st.warning(f"⚠️ このペースだと{crossing['month']}月に{crossing['name']}を超える見込みです")
+
+            # 月収のぶれを含めた確率（シードを固定して再描画で値が揺れないようにする）
+            with st.expander("🎲 月収のぶれを含めた壁を超える確率", expanded=False):
+                volatility = st.slider(
+                    "月収のぶれ（変動係数・0で入力済みの月から推定）",
+                    min_value=0.0, max_value=1.0, value=0.0, step=0.05,
+                    key="parttime_volatility"
+                )
+                forecast = tracker.simulate_crossings(volatility=volatility or None, seed=0)
+                annual = forecast["annual"]
+                st.markdown(
+                    f"**年収の見込み**: {annual['p50']:,.0f}円"
+                    f"（10%〜90%: {annual['p10']:,.0f}〜{annual['p90']:,.0f}円）"
+                )
+                for wall in forecast["walls"]:
+                    if wall["alreadyExceeded"]:
+                        continue
+                    month = f"・{wall['expectedMonth']:.0f}月ごろ" if wall["expectedMonth"] is not None else ""
+                    st.markdown(f"- {wall['name']}: {wall['probability']:.0%}{month}")
+
+    # 計算ボタン（一度計算した後は入力の変更に合わせて結果を更新）
     if st.button("💡 計算する", type="primary"):
-        # 計算実行
-        result = calculate_parttime_tax(
-            age=age,
-            annual_income=annual_income,
-            is_student=is_student,
-            dependent_type=dependent_code,
-            company_size=company_size_code,
-            weekly_hours=weekly_hours
+        st.session_state.parttime_calculated = True
+
+    if st.session_state.parttime_calculated:
+        result = cached_parttime_result(
+            age, annual_income, is_student, dependent_code, company_size_code, weekly_hours, tax_year
         )
+        display_parttime_result(result)
+        if dependent_code != "none":
+            display_household_simulation(
+                "parttime", age, dependent_code, annual_income,
+                {"is_student": is_student, "company_size": company_size_code, "weekly_hours": weekly_hours},
+                tax_year
+            )
 
-        # 結果表示
-        st.markdown("---")
-        st.subheader("📊 計算結果")
 
-        # サマリー
-        col1, col2, col3, col4 = st.columns(4)
+def display_parttime_result(result):
+    """アルバイト・パート版の計算結果を表示"""
+    st.markdown("---")
+    st.subheader("📊 計算結果")
 
-        with col1:
-            st.metric("年収", f"{result['totalIncome']:,}円")
-        with col2:
-            st.metric("所得税", f"{result['incomeTax']:,}円")
-        with col3:
-            st.metric("住民税", f"{result['residentTax']:,}円")
-        with col4:
-            st.metric("社会保険料", f"{result['socialInsurance']['total']:,}円")
-
-        # 手取り額（大きく表示）
-        st.markdown("### 💰 手取り額")
-        st.markdown(f"# {result['netIncome']:,}円")
-
-        # 社会保険加入判定
-        if result['socialInsurance']['isRequired']:
-            st.warning("⚠️ 社会保険加入義務があります（106万円の壁）")
-
-            st.markdown("**加入条件チェック**:")
-            conditions = result['socialInsurance']['conditions']
-            st.markdown(f"- 週20時間以上: {'✅' if conditions['weeklyHours'] else '❌'}")
-            st.markdown(f"- 月88,000円以上: {'✅' if conditions['monthlyIncome'] else '❌'}")
-            st.markdown(f"- 2ヶ月超雇用: {'✅' if conditions['employmentPeriod'] else '❌'}")
-            st.markdown(f"- 学生でない: {'✅' if conditions['notStudent'] else '❌'}")
-            st.markdown(f"- 101人以上の企業: {'✅' if conditions['companySize'] else '❌'}")
-
-        # 超えた壁
-        if result['wallsExceeded']:
-            st.markdown("### 🚨 超えた壁")
-            for wall in result['wallsExceeded']:
-                st.error(f"**{wall['name']}**: {wall['impact']}")
-
-        # 次の壁
-        if result['nextWall']:
-            st.markdown("### 🎯 次の壁まで")
-            st.info(f"**{result['nextWall']['name']}** まで あと **{result['nextWall']['remaining']:,}円**")
-
-        # アドバイス
-        st.markdown("### 💡 アドバイス")
-        st.info(result['advice'])
+    # サマリー
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric("年収", f"{result['totalIncome']:,}円")
+    with col2:
+        st.metric("所得税", f"{result['incomeTax']:,}円")
+    with col3:
+        st.metric("住民税", f"{result['residentTax']:,}円")
+    with col4:
+        st.metric("社会保険料", f"{result['socialInsurance']['total']:,}円")
+
+    # 手取り額（大きく表示）
+    st.markdown("### 💰 手取り額")
+    st.markdown(f"# {result['netIncome']:,}円")
+
+    # 社会保険加入判定
+    if result['socialInsurance']['isRequired']:
+        st.warning("⚠️ 社会保険加入義務があります（106万円の壁）")
+
+        st.markdown("**加入条件チェック**:")
+        conditions = result['socialInsurance']['conditions']
+        st.markdown(f"- 週20時間以上: {'✅' if conditions['weeklyHours'] else '❌'}")
+        st.markdown(f"- 月88,000円以上: {'✅' if conditions['monthlyIncome'] else '❌'}")
+        st.markdown(f"- 2ヶ月超雇用: {'✅' if conditions['employmentPeriod'] else '❌'}")
+        st.markdown(f"- 学生でない: {'✅' if conditions['notStudent'] else '❌'}")
+        # 対象の企業規模は年分で異なる（2024年分は101人以上、2025年分は51人以上）
+        min_employees = 51 if "medium" in backend.get_rules(tax_year).social_insurance_company_sizes else 101
+        st.markdown(f"- {min_employees}人以上の企業: {'✅' if conditions['companySize'] else '❌'}")
+
+    # 超えた壁
+    if result['wallsExceeded']:
+        st.markdown("### 🚨 超えた壁")
+        for wall in result['wallsExceeded']:
+            st.error(f"**{wall['name']}**: {wall['impact']}")
+
+    # 次の壁
+    if result['nextWall']:
+        st.markdown("### 🎯 次の壁まで")
+        st.info(f"**{result['nextWall']['name']}** まで あと **{result['nextWall']['remaining']:,}円**")
+
+    # アドバイス
+    st.markdown("### 💡 アドバイス")
+    st.info(result['advice'])
 
 
 def display_freelance_app():
@@ -286,6 +393,20 @@ def display_freelance_app():
     }
     business_type_code = business_type_map[business_type]
 
+    # 扶養区分をコードに変換
+    dependent_map = {
+        "なし": "none",
+        "親の扶養": "parent",
+        "配偶者の扶養": "spouse"
+    }
+    dependent_code = dependent_map[dependent_type]
+
+    freelance_revenue_and_result(age, is_student, dependent_code, tax_filing_code, business_type_code, tax_year)
+
+
+@st.fragment
+def freelance_revenue_and_result(age, is_student, dependent_code, tax_filing_code, business_type_code, tax_year):
+    """売上・経費入力と計算結果（月別入力の変更時はこの部分だけ再実行）"""
     # 売上・経費入力
     st.subheader("2. 売上・経費入力")
 
@@ -351,117 +472,173 @@ def display_freelance_app():
             annual_expense = sum(st.session_state.monthly_expenses)
             st.markdown(f"**年間合計経費**: {annual_expense:,}円")
 
-    # 扶養区分をコードに変換
-    dependent_map = {
-        "なし": "none",
-        "親の扶養": "parent",
-        "配偶者の扶養": "spouse"
-    }
-    dependent_code = dependent_map[dependent_type]
-
-    # 計算ボタン
+    # 計算ボタン（一度計算した後は入力の変更に合わせて結果を更新）
     if st.button("💡 計算する", type="primary"):
-        # 計算実行
-        result = calculate_freelance_tax(
-            age=age,
-            annual_revenue=annual_revenue,
-            annual_expense=annual_expense,
-            is_student=is_student,
-            dependent_type=dependent_code,
-            tax_filing_type=tax_filing_code,
-            business_type=business_type_code
+        st.session_state.freelance_calculated = True
+
+    if st.session_state.freelance_calculated:
+        result = cached_freelance_result(
+            age, annual_revenue, annual_expense, is_student, dependent_code, tax_filing_code, business_type_code,
+            tax_year
         )
+        display_freelance_result(result)
+        if dependent_code != "none":
+            display_household_simulation(
+                "freelance", age, dependent_code, annual_revenue,
+                {
+                    "is_student": is_student,
+                    "tax_filing_type": tax_filing_code,
+                    "business_type": business_type_code,
+                    "expense_rate": annual_expense / annual_revenue * 100 if annual_revenue > 0 else 0
+                },
+                tax_year
+            )
 
-        # 結果表示
-        st.markdown("---")
-        st.subheader("📊 計算結果")
 
-        # サマリー
-        col1, col2, col3 = st.columns(3)
+def display_freelance_result(result):
+    """業務委託版の計算結果を表示"""
+    st.markdown("---")
+    st.subheader("📊 計算結果")
 
-        with col1:
-            st.metric("年間売上", f"{result['totalRevenue']:,}円")
-            st.metric("年間経費", f"{result['totalExpense']:,}円")
-            st.metric(f"経費率", f"{result['expenseRate']}%")
+    # サマリー
+    col1, col2, col3 = st.columns(3)
 
-        with col2:
-            st.metric("青色申告特別控除", f"{result['blueFilingDeduction']:,}円")
-            st.metric("事業所得", f"{result['businessIncome']:,}円")
+    with col1:
+        st.metric("年間売上", f"{result['totalRevenue']:,}円")
+        st.metric("年間経費", f"{result['totalExpense']:,}円")
+        st.metric(f"経費率", f"{result['expenseRate']}%")
 
-        with col3:
-            st.metric("所得税", f"{result['incomeTax']:,}円")
-            st.metric("住民税", f"{result['residentTax']:,}円")
-            st.metric("個人事業税", f"{result['businessTax']:,}円")
+    with col2:
+        st.metric("青色申告特別控除", f"{result['blueFilingDeduction']:,}円")
+        st.metric("事業所得", f"{result['businessIncome']:,}円")
 
-        # 社会保険料
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric("国民健康保険料", f"{result['healthInsurance']:,}円")
-        with col2:
-            pension_display = 0 if result['studentPensionExemption'] else result['pensionInsurance']
-            st.metric("国民年金保険料", f"{pension_display:,}円")
-            if result['studentPensionExemption']:
-                st.caption("（学生納付特例適用）")
-        with col3:
-            st.metric("合計税金", f"{result['totalTax']:,}円")
+    with col3:
+        st.metric("所得税", f"{result['incomeTax']:,}円")
+        st.metric("住民税", f"{result['residentTax']:,}円")
+        st.metric("個人事業税", f"{result['businessTax']:,}円")
 
-        # 手取り額（大きく表示）
-        st.markdown("### 💰 手取り額")
-        st.markdown(f"# {result['netIncome']:,}円")
+    # 社会保険料
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("国民健康保険料", f"{result['healthInsurance']:,}円")
+    with col2:
+        pension_display = 0 if result['studentPensionExemption'] else result['pensionInsurance']
+        st.metric("国民年金保険料", f"{pension_display:,}円")
+        if result['studentPensionExemption']:
+            st.caption("（学生納付特例適用）")
+    with col3:
+        st.metric("合計税金", f"{result['totalTax']:,}円")
 
-        # 経費率チェック
-        if result['expenseRate'] < result['industryAverageExpenseRate']:
-            st.warning(f"⚠️ 経費率が業種平均（{result['industryAverageExpenseRate']}%）より低いです")
-            st.info(f"適切な経費計上で、あと{result['remainingExpenseCapacity']:,}円計上できる可能性があります")
+    # 手取り額（大きく表示）
+    st.markdown("### 💰 手取り額")
+    st.markdown(f"# {result['netIncome']:,}円")
 
-        # 青色申告vs白色申告比較
-        st.markdown("### 📊 青色申告 vs 白色申告")
+    # 経費率チェック
+    if result['expenseRate'] < result['industryAverageExpenseRate']:
+        st.warning(f"⚠️ 経費率が業種平均（{result['industryAverageExpenseRate']}%）より低いです")
+        st.info(f"適切な経費計上で、あと{result['remainingExpenseCapacity']:,}円計上できる可能性があります")
 
-        comparison = result['blueVsWhiteComparison']
+    # 青色申告vs白色申告比較
+    st.markdown("### 📊 青色申告 vs 白色申告")
 
-        col1, col2, col3 = st.columns(3)
+    comparison = result['blueVsWhiteComparison']
 
-        with col1:
-            st.markdown("#### 白色申告")
-            st.markdown(f"所得: {comparison['white']['income']:,}円")
-            st.markdown(f"税額: {comparison['white']['tax']:,}円")
-            st.markdown(f"手取り: {comparison['white']['netIncome']:,}円")
+    col1, col2, col3 = st.columns(3)
 
-        with col2:
-            st.markdown("#### 青色10万円")
-            st.markdown(f"所得: {comparison['blue10']['income']:,}円")
-            st.markdown(f"税額: {comparison['blue10']['tax']:,}円")
-            st.markdown(f"手取り: {comparison['blue10']['netIncome']:,}円")
-            st.success(f"節税額: {comparison['savingsBlue10']:,}円")
-
-        with col3:
-            st.markdown("#### 青色65万円")
-            st.markdown(f"所得: {comparison['blue65']['income']:,}円")
-            st.markdown(f"税額: {comparison['blue65']['tax']:,}円")
-            st.markdown(f"手取り: {comparison['blue65']['netIncome']:,}円")
-            st.success(f"節税額: {comparison['savingsBlue65']:,}円")
-
-        # 超えた壁
-        if result['wallsExceeded']:
-            st.markdown("### 🚨 超えた壁")
-            for wall in result['wallsExceeded']:
-                st.error(f"**{wall['name']}**: {wall['impact']}")
-
-        # 次の壁
-        if result['nextWall']:
-            st.markdown("### 🎯 次の壁まで")
-            st.info(f"**{result['nextWall']['name']}** まで あと **{result['nextWall']['remaining']:,}円**")
-
-        # 確定申告
-        st.markdown("### 📝 確定申告")
-        if result['confirmationRequired']:
-            st.warning("確定申告が必要です（期限: 翌年3月15日）")
-        else:
-            st.success("確定申告は不要です")
-
-        # アドバイス
-        st.markdown("### 💡 アドバイス")
-        st.info(result['advice'])
+    with col1:
+        st.markdown("#### 白色申告")
+        st.markdown(f"所得: {comparison['white']['income']:,}円")
+        st.markdown(f"税額: {comparison['white']['tax']:,}円")
+        st.markdown(f"手取り: {comparison['white']['netIncome']:,}円")
+
+    with col2:
+        st.markdown("#### 青色10万円")
+        st.markdown(f"所得: {comparison['blue10']['income']:,}円")
+        st.markdown(f"税額: {comparison['blue10']['tax']:,}円")
+        st.markdown(f"手取り: {comparison['blue10']['netIncome']:,}円")
+        st.success(f"節税額: {comparison['savingsBlue10']:,}円")
+
+    with col3:
+        st.markdown("#### 青色65万円")
+        st.markdown(f"所得: {comparison['blue65']['income']:,}円")
+        st.markdown(f"税額: {comparison['blue65']['tax']:,}円")
+        st.markdown(f"手取り: {comparison['blue65']['netIncome']:,}円")
+        st.success(f"節税額: {comparison['savingsBlue65']:,}円")
+
+    # 超えた壁
+    if result['wallsExceeded']:
+        st.markdown("### 🚨 超えた壁")
+        for wall in result['wallsExceeded']:
+            st.error(f"**{wall['name']}**: {wall['impact']}")
+
+    # 次の壁
+    if result['nextWall']:
+        st.markdown("### 🎯 次の壁まで")
+        st.info(f"**{result['nextWall']['name']}** まで あと **{result['nextWall']['remaining']:,}円**")
+
+    # 確定申告
+    st.markdown("### 📝 確定申告")
+    if result['confirmationRequired']:
+        st.warning("確定申告が必要です（期限: 翌年3月15日）")
+    else:
+        st.success("確定申告は不要です")
+
+    # アドバイス
+    st.markdown("### 💡 アドバイス")
+    st.info(result['advice'])
+
+
+def display_household_simulation(child_type, age, dependent_code, current_income, child_profile, tax_year):
+    """扶養する側（親・配偶者）の税負担を含めた世帯の手取りを表示"""
+    supporter = "親" if dependent_code == "parent" else "配偶者"
+    income_label = "年収" if child_type == "parttime" else "売上"
+
+    st.markdown(f"### 👪 世帯の手取り（{supporter}の税負担を含む）")
+    parent_income = st.number_input(
+        f"{supporter}の年収（給与）",
+        min_value=0,
+        max_value=30000000,
+        value=6000000,
+        step=100000,
+        key=f"household_parent_income_{child_type}"
+    )
+
+    household = backend.simulate_household(
+        parent_income=parent_income,
+        child_type=child_type,
+        dependent_type=dependent_code,
+        child_age=age,
+        child_profile=child_profile,
+        tax_year=tax_year
+    )
+    st.line_chart(
+        {
+            f"本人の{income_label}（万円）": household["childIncome"] // 10000,
+            "世帯の手取り": household["householdNetIncome"],
+            "本人の手取り": household["childNetIncome"],
+            f"{supporter}の税負担の増加": household["parentTaxIncrease"]
+        },
+        x=f"本人の{income_label}（万円）"
+    )
+
+    optimum = household["optimum"]
+    i = min(int(household["childIncome"].searchsorted(current_income)), len(household["childIncome"]) - 1)
+    col1, col2 = st.columns(2)
+    col1.metric(f"いまの{income_label}での世帯の手取り", f"{household['householdNetIncome'][i]:,}円")
+    col2.metric(
+        f"{supporter}の税負担の増加",
+        f"{household['parentTaxIncrease'][i]:,}円"
+    )
+    st.info(
+        f"世帯の手取りが最も多いのは本人の{income_label}が **{optimum['childIncome']:,}円** のときです"
+        f"（世帯の手取り {optimum['householdNetIncome']:,}円）"
+    )
+    if household["drops"]:
+        st.markdown("**収入を増やすと世帯の手取りが減るところ**:")
+        for drop in household["drops"][:8]:
+            st.markdown(
+                f"- {drop['childIncome']:,}円 → {drop['nextChildIncome']:,}円で **{drop['loss']:,}円** 減少"
+            )
 
 
 # メイン処理
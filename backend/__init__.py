@@ -0,0 +1,69 @@
+"""
+税金・社会保険料の計算ロジック
+
+よく使う関数はパッケージから直接参照できる（例: backend.calculate_parttime_tax）。
+各モジュールは最初に参照したときに読み込むため、`import backend` だけでは
+NumPy や壁のマスターデータを読み込まない（起動時間のため typing も使わない）。
+"""
+
+from importlib import import_module
+
+# 公開名 → 定義しているモジュール
+_EXPORTS = {
+    # アルバイト・パート版
+    "calculate_parttime_tax": "calculator_parttime",
+    "generate_advice": "calculator_parttime",
+    # 業務委託版
+    "calculate_freelance_tax": "calculator_freelance",
+    "compare_blue_vs_white": "calculator_freelance",
+    "evaluate_filing_scenarios": "calculator_freelance",
+    "generate_advice_freelance": "calculator_freelance",
+    "FreelanceCalculation": "incremental",
+    # 一括計算（NumPy）
+    "calculate_parttime_tax_batch": "calculator_batch",
+    "calculate_freelance_tax_batch": "calculator_batch",
+    "evaluate_filing_scenarios_batch": "calculator_batch",
+    "calculate_by_tax_year": "calculator_batch",
+    # アドバイス（決定表のコードを表示する行だけ文にする）
+    "parttime_advice_codes": "advice",
+    "freelance_advice_codes": "advice",
+    "render_parttime_advice": "advice",
+    "render_freelance_advice": "advice",
+    # 年分ごとのルール
+    "DEFAULT_TAX_YEAR": "tax_rules",
+    "TaxRules": "tax_rules",
+    "get_rules": "tax_rules",
+    "available_tax_years": "tax_rules",
+    # 収入の壁
+    "get_next_wall": "walls_data",
+    "get_exceeded_walls": "walls_data",
+    "get_wall_index": "walls_data",
+    "EXPENSE_RATES_BY_BUSINESS": "walls_data",
+    # キャッシュ・累計・分析
+    "cached_calculate_parttime_tax": "result_cache",
+    "cached_calculate_freelance_tax": "result_cache",
+    "IncomeTracker": "income_tracker",
+    "simulate_wall_crossings": "wall_forecast",
+    "find_parttime_dead_zones": "dead_zones",
+    "find_freelance_dead_zones": "dead_zones",
+    "build_sensitivity_tensor": "sensitivity",
+    "simulate_household": "household",
+    "HistoryStore": "history_store",
+    "load_curve_store": "curve_store"
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module_name}", __name__), name)
+    # 2回目以降は通常の属性として引く
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,458 @@
+"""
+アドバイス文の決定表と文の関数
+
+アドバイスは計算時には文にせず、決定表で「アドバイスコード」（整数）だけを決める。
+文はコードごとの関数で、結果の advice を参照したときに作る。一括計算では
+コードを配列でまとめて求め、表示する行だけ文にできる。
+
+決定表は年分ごとに (超えた壁の数, 親の扶養か, 学生か) から作る。文が切り替わる収入
+（103万円・106万円など）はその年分の壁の金額に含まれるため、超えた壁の数だけで決まる。
+業務委託版の白色申告・経費・学生納付特例・次の壁の文はコードのビットで表す。
+"""
+
+from bisect import bisect_right
+from typing import Callable, Dict, Mapping, Optional, Sequence, Tuple
+
+from .wall_index import WallIndex, generate_wall_advice
+
+
+# アルバイト・パート版のアドバイスコード
+PT_WALLS = 0  # 専用の文がない年分（壁のマスターデータから作る）
+PT_SAFE_BEFORE_103 = 1
+PT_SAFE = 2
+PT_OVER_103_PARENT = 3
+PT_OVER_103 = 4
+PT_OVER_106_STUDENT = 5
+PT_OVER_106 = 6
+PT_OVER_130 = 7
+PT_OVER_150 = 8
+
+# コード → 文を作る関数（年収, 次の壁までの残り）
+PARTTIME_MESSAGES: Dict[int, Callable[[int, Optional[int]], str]] = {
+    PT_SAFE_BEFORE_103: lambda income, remaining: f"現在の年収は{income:,}円です。103万円の壁まであと{remaining:,}円です。このまま働いても扶養内で所得税もかかりません。",
+    PT_SAFE: lambda income, remaining: "安全圏です。このまま働いても問題ありません。",
+    PT_OVER_103_PARENT: lambda income, remaining: f"103万円を超えています。本人に所得税が発生し、親の扶養控除も外れるため、親の税負担が年間5〜16万円増えます。106万円の壁まであと{remaining:,}円です。",
+    PT_OVER_103: lambda income, remaining: "103万円を超えています。所得税が発生します。",
+    PT_OVER_106_STUDENT: lambda income, remaining: "106万円を超えていますが、学生の場合は学生除外特例により社会保険加入義務はありません（夜間・通信制除く）。130万円の壁まで注意しましょう。",
+    PT_OVER_106: lambda income, remaining: "106万円を超えています。大企業で条件を満たすと社会保険加入義務が発生します（年間約15万円の負担）。",
+    PT_OVER_130: lambda income, remaining: "130万円を超えています。親の社会保険扶養から外れ、国民健康保険・国民年金に加入する必要があります（年間約30万円の負担）。",
+    PT_OVER_150: lambda income, remaining: "150万円を超えています。配偶者控除も減少し、完全自立ゾーンです。"
+}
+
+# 業務委託版のアドバイスコード（下位3ビットが所得の文、上位が追加の文）
+FL_WALLS = 0  # 専用の文がない年分（壁のマスターデータから作る）
+FL_UNDER_48 = 1
+FL_OVER_48 = 2
+FL_OVER_103_PARENT = 3
+FL_OVER_103 = 4  # 文なし
+FL_OVER_130 = 5
+FL_OVER_290 = 6
+FL_INCOME_MASK = 0b111
+
+FL_WHITE_FILING = 1 << 3  # 白色申告で所得税が発生する
+FL_EXPENSE = 1 << 4  # 経費率が業種平均より低い
+FL_STUDENT_PENSION = 1 << 5  # 学生納付特例の対象
+FL_NEXT_WALL = 1 << 6  # 次の壁がある
+
+# 所得の文（コード → 関数(所得)。FL_OVER_103 は文なし）
+FREELANCE_INCOME_MESSAGES: Dict[int, Callable[[int], str]] = {
+    FL_UNDER_48: lambda income: f"現在の所得は{income:,}円です。基礎控除48万円以下のため所得税は発生しません。",
+    FL_OVER_48: lambda income: "所得が48万円を超えているため所得税が発生します。",
+    FL_OVER_103_PARENT: lambda income: "103万円（給与所得換算）を超えているため、親の扶養控除が外れます。親の税負担が年間5〜16万円増える可能性があります。",
+    FL_OVER_130: lambda income: "130万円を超えているため、親の社会保険扶養から外れます。国民健康保険・国民年金に加入が必要です。",
+    FL_OVER_290: lambda income: "290万円を超えているため、個人事業税が発生します。"
+}
+
+
+def _white_filing_message(saving: float) -> str:
+    return f"青色申告65万円控除を使えば、年間約{saving:,.0f}円の節税が可能です。"
+
+
+def _expense_message(industry_average: float, remaining_expense: int) -> str:
+    return f"経費率が業種平均({industry_average}%)より低いです。適切な経費計上であと{remaining_expense:,}円計上できる可能性があります。"
+
+
+def _next_wall_message(name: str, remaining: int) -> str:
+    return f"次の壁は{name}（あと{remaining:,}円）です。"
+
+
+FREELANCE_STUDENT_PENSION_MESSAGE = "学生納付特例により、国民年金の納付を猶予できます。"
+
+FREELANCE_DEFAULT_ADVICE = "適切に収入管理ができています。"
+
+# 文が切り替わる収入（円）
+_PARTTIME_BANDS = (1030000, 1060000, 1300000, 1500000)
+_FREELANCE_BANDS = (480000, 1030000, 1300000, 2900000)
+
+# (壁の種類, 年分) → 決定表
+_TABLES: Dict[Tuple[str, int], Tuple] = {}
+
+# 1件ずつの文（parttime_advice / freelance_advice）で使う年分の値（引数の年分 → _scalar_rules() の結果）
+_SCALAR_RULES: Dict[Optional[int], Tuple] = {}
+
+
+def parttime_advice_code(
+    annual_income: int,
+    next_wall_amount: Optional[int],
+    is_student: bool,
+    is_parent: bool,
+    detailed: bool
+) -> int:
+    """
+    アルバイト・パート版のアドバイスコードを決める
+
+    Args:
+        annual_income: 年収
+        next_wall_amount: 次の壁の金額（次の壁がない場合は None）
+        is_student: 学生かどうか
+        is_parent: 扶養区分が親かどうか
+        detailed: 年分ごとの専用の文があるか（TaxRules.detailed_advice）
+
+    Returns:
+        アドバイスコード（PT_*）
+    """
+    if not detailed:
+        return PT_WALLS
+    band = bisect_right(_PARTTIME_BANDS, annual_income)
+    if band == 0:
+        return PT_SAFE_BEFORE_103 if next_wall_amount == 1030000 else PT_SAFE
+    if band == 1:
+        return PT_OVER_103_PARENT if is_parent else PT_OVER_103
+    if band == 2:
+        return PT_OVER_106_STUDENT if is_student else PT_OVER_106
+    return PT_OVER_130 if band == 3 else PT_OVER_150
+
+
+def freelance_advice_code(
+    business_income: int,
+    has_next_wall: bool,
+    is_parent: bool,
+    detailed: bool,
+    white_filing: bool = False,
+    expense_below_average: bool = False,
+    student_pension_exemption: bool = False
+) -> int:
+    """
+    業務委託版のアドバイスコードを決める
+
+    Args:
+        business_income: 事業所得
+        has_next_wall: 次の壁があるか
+        is_parent: 扶養区分が親かどうか
+        detailed: 年分ごとの専用の文があるか（TaxRules.detailed_advice）
+        white_filing: 白色申告で所得が基礎控除を超えるか
+        expense_below_average: 経費率が業種平均より低く、まだ経費を計上できるか
+        student_pension_exemption: 学生納付特例の対象か
+
+    Returns:
+        アドバイスコード（FL_* の組み合わせ）
+    """
+    if not detailed:
+        code = FL_WALLS
+    else:
+        band = bisect_right(_FREELANCE_BANDS, business_income)
+        if band == 2:
+            code = FL_OVER_103_PARENT if is_parent else FL_OVER_103
+        else:
+            code = (FL_UNDER_48, FL_OVER_48, None, FL_OVER_130, FL_OVER_290)[band]
+    return code | freelance_advice_flags(white_filing, expense_below_average, student_pension_exemption, has_next_wall)
+
+
+def freelance_advice_flags(
+    white_filing: bool,
+    expense_below_average: bool,
+    student_pension_exemption: bool,
+    has_next_wall: bool = False
+) -> int:
+    """業務委託版の追加の文のビット（FL_WHITE_FILING など）"""
+    return (
+        (FL_WHITE_FILING if white_filing else 0)
+        | (FL_EXPENSE if expense_below_average else 0)
+        | (FL_STUDENT_PENSION if student_pension_exemption else 0)
+        | (FL_NEXT_WALL if has_next_wall else 0)
+    )
+
+
+def _check_bands(wall_index: WallIndex, bands: Sequence[int], wall_type: str, year: int) -> None:
+    """文が切り替わる収入が壁の金額に含まれるか確認（含まれないと壁の数で文が決まらない）"""
+    missing = [amount for amount in bands if amount not in wall_index.amounts]
+    if missing:
+        raise ValueError(
+            f"{year}年分の{wall_type}の壁に、アドバイスの区切り {missing} がありません"
+        )
+
+
+def advice_table(wall_type: str, rules) -> Tuple:
+    """
+    年分ごとの決定表（初回に作って使い回す）
+
+    Args:
+        wall_type: "parttime" | "freelance"
+        rules: 年分のルール（TaxRules）
+
+    Returns:
+        parttime: table[超えた壁の数][親の扶養か][学生か] → コード
+        freelance: table[超えた壁の数][親の扶養か] → コード（所得の文と FL_NEXT_WALL）
+    """
+    key = (wall_type, rules.year)
+    table = _TABLES.get(key)
+    if table is not None:
+        return table
+
+    wall_index = rules.walls[wall_type]
+    amounts = wall_index.amounts
+    detailed = rules.detailed_advice
+    if detailed:
+        _check_bands(wall_index, _PARTTIME_BANDS if wall_type == "parttime" else _FREELANCE_BANDS, wall_type, rules.year)
+
+    rows = []
+    for level in range(len(amounts) + 1):
+        # その壁の数になる収入の代表値（区切りは壁の金額に含まれるため、文は同じになる）
+        income = amounts[level - 1] if level else 0
+        next_amount = amounts[level] if level < len(amounts) else None
+        if wall_type == "parttime":
+            rows.append(tuple(
+                tuple(parttime_advice_code(income, next_amount, student, parent, detailed) for student in (False, True))
+                for parent in (False, True)
+            ))
+        else:
+            rows.append(tuple(
+                freelance_advice_code(income, next_amount is not None, parent, detailed)
+                for parent in (False, True)
+            ))
+    table = _TABLES[key] = tuple(rows)
+    return table
+
+
+def parttime_advice_codes(wall_level, is_student, is_parent, tax_year: Optional[int] = None):
+    """
+    アルバイト・パート版のアドバイスコードを配列でまとめて求める
+
+    Args:
+        wall_level: 超えた壁の数（配列）
+        is_student: 学生かどうか（配列またはスカラー）
+        is_parent: 扶養区分が親かどうか（配列またはスカラー）
+        tax_year: 年分（省略時は tax_rules.DEFAULT_TAX_YEAR）
+
+    Returns:
+        アドバイスコードの配列
+    """
+    import numpy as np
+    from .tax_rules import get_rules
+
+    table = np.asarray(advice_table("parttime", get_rules(tax_year)), dtype=np.int8)
+    return table[np.asarray(wall_level), np.asarray(is_parent, dtype=np.intp), np.asarray(is_student, dtype=np.intp)]
+
+
+def freelance_advice_codes(
+    wall_level,
+    is_parent,
+    white_filing,
+    expense_below_average,
+    student_pension_exemption,
+    tax_year: Optional[int] = None
+):
+    """
+    業務委託版のアドバイスコードを配列でまとめて求める
+
+    Args:
+        wall_level: 超えた壁の数（配列）
+        is_parent: 扶養区分が親かどうか
+        white_filing: 白色申告で所得が基礎控除を超えるか
+        expense_below_average: 経費率が業種平均より低く、まだ経費を計上できるか
+        student_pension_exemption: 学生納付特例の対象か
+        tax_year: 年分（省略時は tax_rules.DEFAULT_TAX_YEAR）
+
+    Returns:
+        アドバイスコードの配列
+    """
+    import numpy as np
+    from .tax_rules import get_rules
+
+    table = np.asarray(advice_table("freelance", get_rules(tax_year)), dtype=np.int8)
+    codes = table[np.asarray(wall_level), np.asarray(is_parent, dtype=np.intp)]
+    codes = codes | np.where(white_filing, FL_WHITE_FILING, 0)
+    codes = codes | np.where(expense_below_average, FL_EXPENSE, 0)
+    return codes | np.where(student_pension_exemption, FL_STUDENT_PENSION, 0)
+
+
+def render_parttime_advice(
+    code: int,
+    annual_income: int,
+    exceeded_walls: Sequence[Mapping],
+    next_wall: Optional[Mapping]
+) -> str:
+    """
+    アルバイト・パート版のアドバイスコードを文にする
+
+    Args:
+        code: アドバイスコード（PT_*）
+        annual_income: 年収
+        exceeded_walls: 超えた壁
+        next_wall: 次の壁（残り金額つき）
+
+    Returns:
+        アドバイス文
+    """
+    if code == PT_WALLS:
+        return generate_wall_advice(annual_income, exceeded_walls, next_wall)
+    return PARTTIME_MESSAGES[code](annual_income, next_wall["remaining"] if next_wall else None)
+
+
+def render_freelance_advice(
+    code: int,
+    business_income: int,
+    exceeded_walls: Sequence[Mapping],
+    next_wall: Optional[Mapping],
+    industry_average: float,
+    remaining_expense: int
+) -> str:
+    """
+    業務委託版のアドバイスコードを文にする
+
+    Args:
+        code: アドバイスコード（FL_* の組み合わせ）
+        business_income: 事業所得
+        exceeded_walls: 超えた壁
+        next_wall: 次の壁（残り金額つき）
+        industry_average: 業種平均経費率
+        remaining_expense: 残り経費計上可能額
+
+    Returns:
+        アドバイス文
+    """
+    parts = []
+    income_code = code & FL_INCOME_MASK
+    if income_code == FL_WALLS:
+        parts.append(generate_wall_advice(business_income, exceeded_walls, income_label="所得"))
+    elif income_code != FL_OVER_103:
+        parts.append(FREELANCE_INCOME_MESSAGES[income_code](business_income))
+
+    if code & FL_WHITE_FILING:
+        parts.append(_white_filing_message(abs(business_income * 0.15)))
+    if code & FL_EXPENSE:
+        parts.append(_expense_message(industry_average, remaining_expense))
+    if code & FL_STUDENT_PENSION:
+        parts.append(FREELANCE_STUDENT_PENSION_MESSAGE)
+    if code & FL_NEXT_WALL:
+        parts.append(_next_wall_message(next_wall["name"], next_wall["remaining"]))
+
+    return " ".join(parts) if parts else FREELANCE_DEFAULT_ADVICE
+
+
+def _white_filing_from(basic_deduction) -> int:
+    """
+    「所得 > 基礎控除」になる最低の所得（基礎控除の階段の区間を順に見る）
+
+    基礎控除は所得が増えると減る（増えない）階段のため、これ以上の所得は必ず基礎控除を超える。
+    """
+    intercepts = basic_deduction.intercepts
+    if any(basic_deduction.slopes) or list(intercepts) != sorted(intercepts, reverse=True):
+        raise ValueError("基礎控除が所得の増えない階段でないため、白色申告の文の区切りを決められません")
+    lower = 0
+    for upper, amount in zip(basic_deduction.thresholds, intercepts):
+        # この区間（upper 以下）で基礎控除を超える最低の所得
+        income = max(lower, int(amount) + 1)
+        if income <= upper:
+            return income
+        lower = upper + 1
+    return max(lower, int(intercepts[-1]) + 1)
+
+
+def _scalar_rules(tax_year: Optional[int]) -> Tuple:
+    """
+    1件ずつの文で使う年分の値（初回だけ get_rules で引く）
+
+    Returns:
+        (parttime の壁の金額, parttime の決定表, freelance の壁の金額, freelance の決定表,
+         白色申告の文を出す最低の所得, 学生納付特例の所得の上限)
+    """
+    from .tax_rules import get_rules
+
+    rules = get_rules(tax_year)
+    scalar = _SCALAR_RULES[tax_year] = (
+        rules.walls["parttime"].amounts,
+        advice_table("parttime", rules),
+        rules.walls["freelance"].amounts,
+        advice_table("freelance", rules),
+        _white_filing_from(rules.basic_deduction),
+        rules.student_pension_exemption_limit
+    )
+    return scalar
+
+
+def parttime_advice(
+    annual_income: int,
+    exceeded_walls: Sequence[Mapping],
+    next_wall: Optional[Mapping],
+    is_student: bool,
+    dependent_type: str,
+    tax_year: Optional[int] = None
+) -> str:
+    """
+    アルバイト・パート版のアドバイス文を1件作る（calculator_parttime.generate_advice の実体）
+
+    年分の決定表からコードを引き、render_parttime_advice で文にする。
+
+    Args:
+        annual_income: 年収
+        exceeded_walls: 超えた壁
+        next_wall: 次の壁（残り金額つき）
+        is_student: 学生かどうか
+        dependent_type: 扶養区分
+        tax_year: 年分（省略時は tax_rules.DEFAULT_TAX_YEAR）
+
+    Returns:
+        アドバイス文
+    """
+    try:
+        amounts, table, _, _, _, _ = _SCALAR_RULES[tax_year]
+    except KeyError:
+        amounts, table, _, _, _, _ = _scalar_rules(tax_year)
+    # 超えた壁の数（WallIndex.level と同じ）で決定表を引く
+    code = table[bisect_right(amounts, annual_income)][dependent_type == "parent"][1 if is_student else 0]
+    return render_parttime_advice(code, annual_income, exceeded_walls, next_wall)
+
+
+def freelance_advice(
+    business_income: int,
+    exceeded_walls: Sequence[Mapping],
+    next_wall: Optional[Mapping],
+    is_student: bool,
+    dependent_type: str,
+    tax_filing_type: str,
+    expense_rate: float,
+    industry_average: float,
+    remaining_expense: int,
+    tax_year: Optional[int] = None
+) -> str:
+    """
+    業務委託版のアドバイス文を1件作る（calculator_freelance.generate_advice_freelance の実体）
+
+    年分の決定表から所得の文のコードを引き、追加の文のビットを加えて render_freelance_advice で文にする。
+
+    Args:
+        business_income: 事業所得
+        exceeded_walls: 超えた壁
+        next_wall: 次の壁（残り金額つき）
+        is_student: 学生かどうか
+        dependent_type: 扶養区分
+        tax_filing_type: 申告タイプ
+        expense_rate: 経費率
+        industry_average: 業種平均経費率
+        remaining_expense: 残り経費計上可能額
+        tax_year: 年分（省略時は tax_rules.DEFAULT_TAX_YEAR）
+
+    Returns:
+        アドバイス文
+    """
+    try:
+        _, _, amounts, table, white_filing_from, student_pension_limit = _SCALAR_RULES[tax_year]
+    except KeyError:
+        _, _, amounts, table, white_filing_from, student_pension_limit = _scalar_rules(tax_year)
+    code = table[bisect_right(amounts, business_income)][dependent_type == "parent"] | freelance_advice_flags(
+        tax_filing_type == "white" and business_income >= white_filing_from,
+        expense_rate < industry_average and remaining_expense > 0,
+        bool(is_student) and business_income <= student_pension_limit
+    )
+    return render_freelance_advice(code, business_income, exceeded_walls, next_wall, industry_average, remaining_expense)
@@ -0,0 +1,531 @@
+"""
+計算ロジックの JSON HTTP API（ASGI）
+
+フレームワークを使わない ASGI アプリケーション。ASGI サーバーで起動する:
+    uvicorn backend.api:app --port 8000
+    TAXCHECK_API_WORKERS=4 uvicorn backend.api:app --port 8000  # 一括計算をプロセスプールで並列化
+
+エンドポイント:
+    GET  /health                     稼働確認
+    POST /parttime                   calculate_parttime_tax（本文は引数名をキーにした JSON オブジェクト）
+    POST /freelance                  calculate_freelance_tax
+    POST /freelance/compare          申告種類ごとの比較（compare_blue_vs_white）
+    GET  /walls/{parttime|freelance}?income=...&tax_year=...
+                                     超えた壁と次の壁
+    POST /batch/{parttime|freelance} 一括計算（本文は JSONL または JSON 配列）
+
+一括計算は入力を BATCH_CHUNK_SIZE 行ずつ計算し、結果を JSONL で入力と同じ順に返す
+（JSONL の入力は読みながら計算を始める）。出力行は bulk_cli と同じ列で、計算できない行は
+{"line", "error", "record"} の行になる。?advice=0 の場合はアドバイス文を省き、
+NumPy の一括計算エンジン（calculator_batch）で計算する。それ以外は1行ずつ計算し、
+TAXCHECK_API_WORKERS が2以上ならチャンクをプロセスプールで並列に計算する。
+応答を送り始めた後に続けられない誤り（JSONL の1行が MAX_BATCH_LINE_BYTES を超えるなど）は、
+最後に {"error"} の行を送って応答を終える。
+"""
+
+import asyncio
+import json
+import os
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import AsyncIterator, Deque, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from .bulk_cli import CALCULATORS, process_records
+from .calculator_freelance import evaluate_filing_scenarios, compare_blue_vs_white
+from .records import parse_freelance_record, parse_parttime_record
+from .result_cache import cached_calculate_parttime_tax, cached_calculate_freelance_tax
+from .tax_rules import get_rules
+
+
+# 1回の一括計算でまとめて計算する行数
+BATCH_CHUNK_SIZE = 2000
+
+# 単票のリクエスト本文の上限
+MAX_BODY_BYTES = 64 * 1024
+
+# JSON 配列で受け取る一括計算の本文の上限（JSONL は読みながら計算するため本文全体の上限なし）
+MAX_BATCH_ARRAY_BYTES = 64 * 1024 * 1024
+
+# JSONL の1行の上限（改行が届くまで読みためる量）
+MAX_BATCH_LINE_BYTES = 64 * 1024
+
+# 一括計算のワーカープロセス数（1以下はプロセスプールを使わない）
+API_WORKERS = int(os.environ.get("TAXCHECK_API_WORKERS", "1"))
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+class _HTTPError(Exception):
+    """エラー応答にする例外"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _get_process_pool() -> Optional[Executor]:
+    """一括計算用のプロセスプール（初回の利用時に作る）"""
+    global _process_pool
+    if API_WORKERS <= 1:
+        return None
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=API_WORKERS)
+    return _process_pool
+
+
+def _error_row(line_no: int, error: Exception, record) -> Dict:
+    """計算できなかった行（bulk_cli の隔離ファイルと同じ形式）"""
+    return {
+        "line": line_no,
+        "error": f"{type(error).__name__}: {error}",
+        "record": record if isinstance(record, dict) else None
+    }
+
+
+def _parse_parttime(record: Dict) -> Tuple:
+    """一括計算エンジン用に1行を変換（年分, 年収, 月収, 学生, 企業規模, 週の勤務時間）"""
+    arguments = parse_parttime_record(record)
+    monthly_income = arguments["monthly_income"]
+    return (
+        arguments["tax_year"],
+        arguments["annual_income"],
+        monthly_income if monthly_income is not None else arguments["annual_income"] // 12,
+        arguments["is_student"],
+        arguments["company_size"],
+        arguments["weekly_hours"]
+    )
+
+
+def _parse_freelance(record: Dict) -> Tuple:
+    """一括計算エンジン用に1行を変換（年分, 売上, 経費, 申告種類, 業種, 学生）"""
+    arguments = parse_freelance_record(record)
+    return (
+        arguments["tax_year"],
+        arguments["annual_revenue"],
+        arguments["annual_expense"],
+        arguments["tax_filing_type"],
+        arguments["business_type"],
+        arguments["is_student"]
+    )
+
+
+def _wall_fields(levels: List[int], remaining: List[int], walls) -> List[Tuple]:
+    """壁のレベルを出力行の (wallsExceeded, nextWall, nextWallRemaining) にする"""
+    return [
+        (level, walls[level]["name"], rest) if level < len(walls) else (level, None, None)
+        for level, rest in zip(levels, remaining)
+    ]
+
+
+def _vectorized_parttime(records: List[Dict], parsed: List[Tuple], tax_year: Optional[int]) -> List[Dict]:
+    """同じ年分の行をまとめて計算し、bulk_cli と同じ出力行（アドバイス文なし）にする"""
+    from .calculator_batch import calculate_parttime_tax_batch
+
+    _, annual_income, monthly_income, is_student, company_size, weekly_hours = zip(*parsed)
+    columns = calculate_parttime_tax_batch(
+        annual_income=annual_income,
+        monthly_income=monthly_income,
+        is_student=list(is_student),
+        company_size=list(company_size),
+        weekly_hours=list(weekly_hours),
+        tax_year=tax_year
+    )
+    walls = _wall_fields(
+        columns["wallLevel"].tolist(), columns["nextWallRemaining"].tolist(),
+        get_rules(tax_year).walls["parttime"].walls
+    )
+
+    rows = []
+    for i, (record, wall) in enumerate(zip(records, walls)):
+        rows.append({
+            "id": record.get("id"),
+            "totalIncome": int(columns["totalIncome"][i]),
+            "monthlyAverage": int(columns["monthlyAverage"][i]),
+            "incomeTax": int(columns["incomeTax"][i]),
+            "residentTax": int(columns["residentTax"][i]),
+            "socialInsuranceRequired": bool(columns["socialInsuranceRequired"][i]),
+            "socialInsuranceType": str(columns["socialInsuranceType"][i]) or None,
+            "socialInsuranceTotal": int(columns["socialInsuranceTotal"][i]),
+            "netIncome": int(columns["netIncome"][i]),
+            "wallsExceeded": wall[0],
+            "nextWall": wall[1],
+            "nextWallRemaining": wall[2]
+        })
+    return rows
+
+
+def _vectorized_freelance(records: List[Dict], parsed: List[Tuple], tax_year: Optional[int]) -> List[Dict]:
+    """同じ年分の行をまとめて計算し、bulk_cli と同じ出力行（アドバイス文なし）にする"""
+    from .calculator_batch import calculate_freelance_tax_batch
+
+    _, annual_revenue, annual_expense, tax_filing_type, business_type, is_student = zip(*parsed)
+    columns = calculate_freelance_tax_batch(
+        annual_revenue=annual_revenue,
+        annual_expense=annual_expense,
+        tax_filing_type=list(tax_filing_type),
+        business_type=list(business_type),
+        is_student=list(is_student),
+        tax_year=tax_year
+    )
+    walls = _wall_fields(
+        columns["wallLevel"].tolist(), columns["nextWallRemaining"].tolist(),
+        get_rules(tax_year).walls["freelance"].walls
+    )
+    int_fields = (
+        "totalRevenue", "totalExpense", "blueFilingDeduction", "businessIncome", "incomeTax",
+        "residentTax", "businessTax", "healthInsurance", "pensionInsurance", "totalTax",
+        "totalInsurance", "netIncome"
+    )
+    values = {field: columns[field].tolist() for field in int_fields}
+    expense_rate = columns["expenseRate"].tolist()
+    student_pension_exemption = columns["studentPensionExemption"].tolist()
+    confirmation_required = columns["confirmationRequired"].tolist()
+
+    rows = []
+    for i, (record, wall) in enumerate(zip(records, walls)):
+        row = {"id": record.get("id")}
+        row.update((field, values[field][i]) for field in int_fields)
+        row["expenseRate"] = expense_rate[i]
+        row["studentPensionExemption"] = student_pension_exemption[i]
+        row["wallsExceeded"], row["nextWall"], row["nextWallRemaining"] = wall
+        row["confirmationRequired"] = confirmation_required[i]
+        rows.append({field: row[field] for field in CALCULATORS["freelance"][1] if field in row})
+    return rows
+
+
+_VECTORIZED = {
+    "parttime": (_parse_parttime, _vectorized_parttime),
+    "freelance": (_parse_freelance, _vectorized_freelance)
+}
+
+
+def _calculate_rows(kind: str, chunk: List[Tuple[int, object]]) -> List[Dict]:
+    """1行ずつ計算する（計算できない行はその位置にエラー行を入れる）"""
+    rows: List[Dict] = []
+    process_records(kind, chunk, rows.append, rows.append)
+    return rows
+
+
+def _calculate_vectorized(kind: str, chunk: List[Tuple[int, object]]) -> List[Dict]:
+    """
+    年分ごとにまとめて一括計算エンジンで計算する
+
+    一括計算エンジンが受け付けない値（未対応の年分など）を含む年分は、
+    1行ずつの計算に切り替えてその行だけをエラーにする。
+    """
+    parse, calculate = _VECTORIZED[kind]
+    rows: List[Optional[Dict]] = [None] * len(chunk)
+    groups: Dict[Optional[int], List[int]] = {}
+    parsed: List[Optional[Tuple]] = [None] * len(chunk)
+
+    for i, (line_no, record) in enumerate(chunk):
+        try:
+            if isinstance(record, Exception):
+                raise record
+            if not isinstance(record, dict):
+                raise ValueError("行データがオブジェクトではありません")
+            parsed[i] = parse(record)
+        except Exception as e:
+            # 1行の誤り（OverflowError なども含む）はその行だけエラー行にする
+            rows[i] = _error_row(line_no, e, record)
+            continue
+        groups.setdefault(parsed[i][0], []).append(i)
+
+    for tax_year, positions in groups.items():
+        try:
+            results = calculate([chunk[i][1] for i in positions], [parsed[i] for i in positions], tax_year)
+        except Exception:
+            results = _calculate_rows(kind, [chunk[i] for i in positions])
+        for i, row in zip(positions, results):
+            rows[i] = row
+    return rows
+
+
+def encode_chunk(kind: str, chunk: List[Tuple[int, object]], advice: bool = True) -> bytes:
+    """
+    1チャンクを計算して JSONL にする（プロセスプールのワーカーでも実行する）
+
+    Args:
+        kind: "parttime" または "freelance"
+        chunk: (行番号, 行データ) のリスト
+        advice: アドバイス文を含めるか（False の場合は一括計算エンジンを使う）
+
+    Returns:
+        入力と同じ順の出力行（JSONL）
+    """
+    rows = _calculate_rows(kind, chunk) if advice else _calculate_vectorized(kind, chunk)
+    return "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows).encode("utf-8")
+
+
+async def _read_body(receive, limit: int) -> bytes:
+    """リクエスト本文をすべて読む"""
+    body = bytearray()
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            raise _HTTPError(400, "リクエストの途中で切断されました")
+        body += message.get("body", b"")
+        if len(body) > limit:
+            raise _HTTPError(413, f"リクエスト本文は{limit:,}バイトまでです")
+        if not message.get("more_body", False):
+            return bytes(body)
+
+
+async def _read_json_object(receive) -> Dict:
+    """本文を JSON オブジェクトとして読む"""
+    try:
+        value = json.loads(await _read_body(receive, MAX_BODY_BYTES) or b"{}")
+    except ValueError as e:
+        raise _HTTPError(400, f"JSONとして解析できません: {e}")
+    if not isinstance(value, dict):
+        raise _HTTPError(400, "本文は JSON オブジェクトで指定してください")
+    return value
+
+
+async def _iter_batch_records(receive) -> AsyncIterator[Tuple[int, object]]:
+    """
+    一括計算の本文を1行ずつ読む
+
+    JSON 配列は本文をすべて読んでから要素を返す。JSONL は届いた分から返し、
+    解析できない行は行データに例外を入れて返す（bulk_cli.iter_records と同じ）。
+    """
+    buffer = b""
+    line_no = 0
+    first = True
+    more_body = True
+
+    while more_body:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return
+        buffer += message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if first and buffer.strip():
+            first = False
+            if buffer.lstrip().startswith(b"["):
+                while more_body:
+                    message = await receive()
+                    if message["type"] == "http.disconnect":
+                        return
+                    buffer += message.get("body", b"")
+                    more_body = message.get("more_body", False)
+                    if len(buffer) > MAX_BATCH_ARRAY_BYTES:
+                        raise _HTTPError(413, f"JSON 配列の本文は{MAX_BATCH_ARRAY_BYTES:,}バイトまでです")
+                try:
+                    records = json.loads(buffer)
+                except ValueError as e:
+                    raise _HTTPError(400, f"JSONとして解析できません: {e}")
+                for index, record in enumerate(records, start=1):
+                    yield index, record
+                return
+
+        lines = buffer.split(b"\n")
+        buffer = b"" if not more_body else lines.pop()
+        for line in lines:
+            line_no += 1
+            if not line.strip():
+                continue
+            try:
+                yield line_no, json.loads(line)
+            except ValueError as e:
+                yield line_no, ValueError(f"JSONとして解析できません: {e}")
+        if len(buffer) > MAX_BATCH_LINE_BYTES:
+            raise _HTTPError(413, f"JSONL の1行は{MAX_BATCH_LINE_BYTES:,}バイトまでです（{line_no + 1}行目）")
+
+
+def _json_default(value):
+    """計算結果のオブジェクトを JSON にする"""
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    raise TypeError(f"{type(value).__name__} は JSON にできません")
+
+
+async def _send_json(send, status: int, payload) -> None:
+    """JSON の応答を送る"""
+    body = json.dumps(payload, ensure_ascii=False, default=_json_default).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json; charset=utf-8"),
+            (b"content-length", str(len(body)).encode("ascii"))
+        ]
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+def _query_value(query: Dict[str, List[str]], key: str, convert=str, default=None):
+    """クエリ文字列の値を取得"""
+    values = query.get(key)
+    if not values or values[0] == "":
+        return default
+    try:
+        return convert(values[0])
+    except ValueError:
+        raise _HTTPError(400, f"{key} の値が不正です: {values[0]!r}")
+
+
+def _call(function, arguments: Dict):
+    """計算関数を呼ぶ（引数や値の誤りは400にする）"""
+    try:
+        return function(**arguments)
+    except (ArithmeticError, KeyError, TypeError, ValueError) as e:
+        # 1e400 のような値は OverflowError になる
+        raise _HTTPError(400, f"{type(e).__name__}: {e}")
+
+
+def _compare_filing_types(
+    annual_revenue: int,
+    annual_expense: int = 0,
+    tax_filing_type: str = "white",
+    tax_year: Optional[int] = None
+) -> Dict:
+    """現在の申告種類の結果を求めてから青色vs白色を比較"""
+    current = evaluate_filing_scenarios(annual_revenue, annual_expense, (tax_filing_type,), tax_year=tax_year)
+    current = current[tax_filing_type]
+    return compare_blue_vs_white(
+        annual_revenue, annual_expense, current["income"], current["incomeTax"], current["tax"],
+        current["netIncome"], tax_filing_type, current_resident_tax=current["residentTax"], tax_year=tax_year
+    )
+
+
+def _walls(kind: str, query: Dict[str, List[str]]) -> Dict:
+    """超えた壁と次の壁"""
+    income = _query_value(query, "income", int)
+    if income is None:
+        raise _HTTPError(400, "income を指定してください")
+    try:
+        index = get_rules(_query_value(query, "tax_year", int)).walls[kind]
+    except ValueError as e:
+        raise _HTTPError(400, str(e))
+    return {"exceeded": index.exceeded(income), "next": index.next_wall(income)}
+
+
+async def _batch(kind: str, query: Dict[str, List[str]], receive, send) -> None:
+    """一括計算（チャンクごとに計算して JSONL で順に返す）"""
+    advice = _query_value(query, "advice", default="1") not in ("0", "false")
+    loop = asyncio.get_running_loop()
+    # 一括計算エンジンは NumPy が GIL を手放すためスレッドで十分。1行ずつの計算はプロセスプールがあれば使う
+    executor = None if not advice else _get_process_pool()
+    max_pending = max(API_WORKERS, 1) * 2
+    pending: Deque[asyncio.Future] = deque()
+    started = False
+
+    async def send_oldest() -> None:
+        nonlocal started
+        body = await pending.popleft()
+        if not started:
+            started = True
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/x-ndjson; charset=utf-8")]
+            })
+        await send({"type": "http.response.body", "body": body, "more_body": True})
+
+    chunk: List[Tuple[int, object]] = []
+    try:
+        async for item in _iter_batch_records(receive):
+            chunk.append(item)
+            if len(chunk) >= BATCH_CHUNK_SIZE:
+                pending.append(loop.run_in_executor(executor, encode_chunk, kind, chunk, advice))
+                chunk = []
+                if len(pending) >= max_pending:
+                    await send_oldest()
+        if chunk:
+            pending.append(loop.run_in_executor(executor, encode_chunk, kind, chunk, advice))
+        while pending:
+            await send_oldest()
+    except BaseException:
+        # 応答の終わらせ方は app で決める（送り始めていれば最後にエラー行を送る）
+        for future in pending:
+            future.cancel()
+        raise
+
+    if not started:
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"application/x-ndjson; charset=utf-8")]
+        })
+    await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+async def _route(scope, receive, send) -> None:
+    """パスとメソッドで振り分ける"""
+    method = scope["method"]
+    path = scope["path"].rstrip("/") or "/"
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+
+    if path == "/health" and method == "GET":
+        await _send_json(send, 200, {"status": "ok"})
+    elif path == "/parttime" and method == "POST":
+        await _send_json(send, 200, _call(cached_calculate_parttime_tax, await _read_json_object(receive)))
+    elif path == "/freelance" and method == "POST":
+        await _send_json(send, 200, _call(cached_calculate_freelance_tax, await _read_json_object(receive)))
+    elif path == "/freelance/compare" and method == "POST":
+        await _send_json(send, 200, _call(_compare_filing_types, await _read_json_object(receive)))
+    elif path in ("/walls/parttime", "/walls/freelance") and method == "GET":
+        await _send_json(send, 200, _walls(path.rsplit("/", 1)[1], query))
+    elif path in ("/batch/parttime", "/batch/freelance") and method == "POST":
+        await _batch(path.rsplit("/", 1)[1], query, receive, send)
+    else:
+        raise _HTTPError(404, f"{method} {path} はありません")
+
+
+async def _lifespan(receive, send) -> None:
+    """起動・終了の通知（終了時にプロセスプールを閉じる）"""
+    global _process_pool
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            if _process_pool is not None:
+                _process_pool.shutdown()
+                _process_pool = None
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send) -> None:
+    """ASGI アプリケーション"""
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+
+    # 応答を送り始めたか・送り終えたか（エラー時の応答の終わらせ方を決める）
+    response = {"started": False, "finished": False}
+
+    async def tracked_send(message) -> None:
+        if message["type"] == "http.response.start":
+            response["started"] = True
+        elif message["type"] == "http.response.body" and not message.get("more_body", False):
+            response["finished"] = True
+        await send(message)
+
+    try:
+        await _route(scope, receive, tracked_send)
+    except Exception as e:
+        if isinstance(e, _HTTPError):
+            message = e.message
+            status = e.status
+        else:
+            message = "サーバー内部でエラーが発生しました"
+            status = 500
+        if response["finished"]:
+            pass
+        elif not response["started"]:
+            await _send_json(send, status, {"error": message})
+        else:
+            # 状態コードは変えられないため、一括計算の応答の最後にエラー行を送って終える
+            body = json.dumps({"error": message}, ensure_ascii=False).encode("utf-8") + b"\n"
+            await send({"type": "http.response.body", "body": body, "more_body": False})
+        if not isinstance(e, _HTTPError):
+            # 想定外の誤りは応答を終えてから ASGI サーバーに渡して記録させる
+            raise
@@ -0,0 +1,329 @@
+"""
+給与・業務委託データの一括計算（コマンドライン）
+
+CSV / JSONL の入力を1行ずつ読み、calculate_parttime_tax / calculate_freelance_tax
+で計算した結果をチャンク単位で書き出す。ファイル全体をメモリに載せないため、
+入力が大きくてもメモリ使用量は一定。計算できない行は隔離ファイルに書き出す。
+
+使い方:
+    python -m backend.bulk_cli parttime workers.csv -o results.csv
+    python -m backend.bulk_cli freelance contractors.jsonl -o results.jsonl --quarantine errors.jsonl
+    python -m backend.bulk_cli parttime workers.csv -o results.csv --workers 8
+    python -m backend.bulk_cli parttime workers.csv -o results_2025.csv --tax-year 2025
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+from contextlib import ExitStack
+from typing import Callable, Dict, IO, Iterable, Iterator, List, Optional, Tuple
+
+from .calculator_parttime import calculate_parttime_tax
+from .calculator_freelance import calculate_freelance_tax
+from .records import optional_field, parse_freelance_record, parse_parttime_record
+
+
+# 出力列（CSVの列順）
+PARTTIME_OUTPUT_FIELDS = [
+    "id", "totalIncome", "monthlyAverage", "incomeTax", "residentTax",
+    "socialInsuranceRequired", "socialInsuranceType", "socialInsuranceTotal",
+    "netIncome", "wallsExceeded", "nextWall", "nextWallRemaining", "advice"
+]
+
+FREELANCE_OUTPUT_FIELDS = [
+    "id", "totalRevenue", "totalExpense", "expenseRate", "blueFilingDeduction",
+    "businessIncome", "incomeTax", "residentTax", "businessTax", "healthInsurance",
+    "pensionInsurance", "studentPensionExemption", "totalTax", "totalInsurance",
+    "netIncome", "wallsExceeded", "nextWall", "nextWallRemaining",
+    "confirmationRequired", "advice"
+]
+
+
+def calculate_parttime_record(record: Dict) -> Dict:
+    """
+    1行分のアルバイト・パートデータを計算して出力行を返す
+
+    Args:
+        record: 入力行（列名は calculate_parttime_tax の引数名）
+
+    Returns:
+        出力行（PARTTIME_OUTPUT_FIELDS）
+    """
+    result = calculate_parttime_tax(**parse_parttime_record(record))
+
+    return {
+        "id": record.get("id"),
+        "totalIncome": result["totalIncome"],
+        "monthlyAverage": result["monthlyAverage"],
+        "incomeTax": result["incomeTax"],
+        "residentTax": result["residentTax"],
+        "socialInsuranceRequired": result["socialInsurance"]["isRequired"],
+        "socialInsuranceType": result["socialInsurance"]["type"],
+        "socialInsuranceTotal": result["socialInsurance"]["total"],
+        "netIncome": result["netIncome"],
+        "wallsExceeded": len(result["wallsExceeded"]),
+        "nextWall": result["nextWall"]["name"] if result["nextWall"] else None,
+        "nextWallRemaining": result["nextWall"]["remaining"] if result["nextWall"] else None,
+        "advice": result["advice"]
+    }
+
+
+def calculate_freelance_record(record: Dict) -> Dict:
+    """
+    1行分の業務委託データを計算して出力行を返す
+
+    Args:
+        record: 入力行（列名は calculate_freelance_tax の引数名）
+
+    Returns:
+        出力行（FREELANCE_OUTPUT_FIELDS）
+    """
+    result = calculate_freelance_tax(**parse_freelance_record(record))
+
+    return {
+        "id": record.get("id"),
+        "totalRevenue": result["totalRevenue"],
+        "totalExpense": result["totalExpense"],
+        "expenseRate": result["expenseRate"],
+        "blueFilingDeduction": result["blueFilingDeduction"],
+        "businessIncome": result["businessIncome"],
+        "incomeTax": result["incomeTax"],
+        "residentTax": result["residentTax"],
+        "businessTax": result["businessTax"],
+        "healthInsurance": result["healthInsurance"],
+        "pensionInsurance": result["pensionInsurance"],
+        "studentPensionExemption": result["studentPensionExemption"],
+        "totalTax": result["totalTax"],
+        "totalInsurance": result["totalInsurance"],
+        "netIncome": result["netIncome"],
+        "wallsExceeded": len(result["wallsExceeded"]),
+        "nextWall": result["nextWall"]["name"] if result["nextWall"] else None,
+        "nextWallRemaining": result["nextWall"]["remaining"] if result["nextWall"] else None,
+        "confirmationRequired": result["confirmationRequired"],
+        "advice": result["advice"]
+    }
+
+
+CALCULATORS: Dict[str, Tuple[Callable[[Dict], Dict], List[str]]] = {
+    "parttime": (calculate_parttime_record, PARTTIME_OUTPUT_FIELDS),
+    "freelance": (calculate_freelance_record, FREELANCE_OUTPUT_FIELDS)
+}
+
+
+def _detect_format(path: str, explicit: Optional[str]) -> str:
+    """拡張子から形式を判定（標準入出力は JSONL）"""
+    if explicit:
+        return explicit
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def iter_records(stream: IO[str], fmt: str) -> Iterator[Tuple[int, object]]:
+    """
+    入力を1行ずつ読む
+
+    Args:
+        stream: 入力ストリーム
+        fmt: "csv" または "jsonl"
+
+    Yields:
+        (行番号, 行データ)。JSONLで解析できない行は行データに例外を入れて返す
+    """
+    if fmt == "csv":
+        # ヘッダが1行目なのでデータは2行目から
+        for line_no, record in enumerate(csv.DictReader(stream), start=2):
+            yield line_no, record
+    else:
+        for line_no, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_no, json.loads(line)
+            except ValueError as e:
+                yield line_no, ValueError(f"JSONとして解析できません: {e}")
+
+
+class _ChunkedWriter:
+    """出力行をチャンク単位でまとめて書き出す"""
+
+    def __init__(self, stream: IO[str], fmt: str, fields: List[str], chunk_size: int):
+        self.stream = stream
+        self.fmt = fmt
+        self.chunk_size = chunk_size
+        self.buffer: List[Dict] = []
+        self.csv_writer = None
+        if fmt == "csv":
+            self.csv_writer = csv.DictWriter(stream, fieldnames=fields, extrasaction="ignore")
+            self.csv_writer.writeheader()
+
+    def write(self, row: Dict) -> None:
+        self.buffer.append(row)
+        if len(self.buffer) >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.buffer:
+            return
+        if self.csv_writer is not None:
+            self.csv_writer.writerows(self.buffer)
+        else:
+            self.stream.write(
+                "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in self.buffer)
+            )
+        self.buffer.clear()
+        self.stream.flush()
+
+
+def process_records(
+    kind: str,
+    records: Iterable[Tuple[int, object]],
+    write_row: Callable[[Dict], None],
+    quarantine_row: Optional[Callable[[Dict], None]] = None,
+    progress: Optional[Callable[[Dict], None]] = None,
+    progress_every: int = 100000
+) -> Dict:
+    """
+    行を順に計算する
+
+    Args:
+        kind: "parttime" または "freelance"
+        records: (行番号, 行データ) の反復
+        write_row: 計算結果の出力先
+        quarantine_row: 計算できなかった行の出力先
+        progress: 進捗の通知先（progress_every 行ごと）
+        progress_every: 進捗を通知する間隔（行）
+
+    Returns:
+        処理件数・エラー件数・経過時間
+    """
+    calculate = CALCULATORS[kind][0]
+    stats = {"rows": 0, "errors": 0, "elapsedSeconds": 0.0}
+    started = time.perf_counter()
+
+    for line_no, record in records:
+        stats["rows"] += 1
+        try:
+            if isinstance(record, Exception):
+                raise record
+            if not isinstance(record, dict):
+                raise ValueError("行データがオブジェクトではありません")
+            row = calculate(record)
+        except Exception as e:
+            # 1行の失敗（OverflowError などの想定外の値も含む）で全体を止めず隔離する
+            stats["errors"] += 1
+            if quarantine_row is not None:
+                quarantine_row({
+                    "line": line_no,
+                    "error": f"{type(e).__name__}: {e}",
+                    "record": record if isinstance(record, dict) else None
+                })
+        else:
+            # 出力先のエラーは行の失敗ではないため隔離しない
+            write_row(row)
+
+        if progress is not None and stats["rows"] % progress_every == 0:
+            stats["elapsedSeconds"] = time.perf_counter() - started
+            progress(stats)
+
+    stats["elapsedSeconds"] = time.perf_counter() - started
+    return stats
+
+
+def _print_progress(stats: Dict) -> None:
+    """進捗を標準エラー出力に表示"""
+    rate = stats["rows"] / stats["elapsedSeconds"] if stats["elapsedSeconds"] > 0 else 0
+    print(
+        f"処理済み: {stats['rows']:,}行（エラー {stats['errors']:,}行） {rate:,.0f}行/秒",
+        file=sys.stderr
+    )
+
+
+def _with_default_tax_year(records: Iterable[Tuple[int, object]], tax_year: int) -> Iterator[Tuple[int, object]]:
+    """tax_year 列が空欄の行に既定の年分を補う"""
+    for line_no, record in records:
+        if isinstance(record, dict) and optional_field(record, "tax_year") is None:
+            record = {**record, "tax_year": tax_year}
+        yield line_no, record
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """コマンドラインのエントリポイント"""
+    parser = argparse.ArgumentParser(description="TaxCheck 一括計算")
+    parser.add_argument("kind", choices=sorted(CALCULATORS), help="計算タイプ")
+    parser.add_argument("input", help="入力ファイル（CSV / JSONL、- で標準入力）")
+    parser.add_argument("-o", "--output", default="-", help="出力ファイル（- で標準出力）")
+    parser.add_argument("--input-format", choices=["csv", "jsonl"], help="入力形式（省略時は拡張子から判定）")
+    parser.add_argument("--output-format", choices=["csv", "jsonl"], help="出力形式（省略時は拡張子から判定）")
+    parser.add_argument("--quarantine", help="計算できなかった行の出力先（JSONL）")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="まとめて書き出す行数（並列時は1チャンクの行数）")
+    parser.add_argument("--progress-every", type=int, default=100000, help="進捗を表示する間隔（行）")
+    parser.add_argument("--workers", type=int, default=1, help="並列に計算するプロセス数（1で直列）")
+    parser.add_argument("--quiet", action="store_true", help="進捗を表示しない")
+    parser.add_argument("--tax-year", type=int, help="年分（tax_year 列が空欄の行に使う）")
+    args = parser.parse_args(argv)
+
+    input_format = _detect_format(args.input, args.input_format)
+    output_format = _detect_format(args.output, args.output_format)
+
+    with ExitStack() as stack:
+        if args.input == "-":
+            input_stream = sys.stdin
+        else:
+            input_stream = stack.enter_context(open(args.input, encoding="utf-8", newline=""))
+        if args.output == "-":
+            output_stream = sys.stdout
+        else:
+            output_stream = stack.enter_context(open(args.output, "w", encoding="utf-8", newline=""))
+
+        writer = _ChunkedWriter(output_stream, output_format, CALCULATORS[args.kind][1], args.chunk_size)
+        quarantine = None
+        if args.quarantine:
+            quarantine_stream = stack.enter_context(open(args.quarantine, "w", encoding="utf-8"))
+            quarantine = _ChunkedWriter(quarantine_stream, "jsonl", [], args.chunk_size)
+
+        records = iter_records(input_stream, input_format)
+        if args.tax_year is not None:
+            records = _with_default_tax_year(records, args.tax_year)
+        try:
+            if args.workers > 1:
+                from .parallel import run_parallel
+
+                reported = {"rows": 0}
+
+                def progress(stats: Dict) -> None:
+                    if stats["rows"] - reported["rows"] >= args.progress_every:
+                        reported["rows"] = stats["rows"]
+                        _print_progress(stats)
+
+                stats = run_parallel(
+                    args.kind,
+                    records,
+                    writer.write,
+                    quarantine.write if quarantine else None,
+                    workers=args.workers,
+                    chunk_size=args.chunk_size,
+                    progress=None if args.quiet else progress
+                )
+            else:
+                stats = process_records(
+                    args.kind,
+                    records,
+                    writer.write,
+                    quarantine.write if quarantine else None,
+                    None if args.quiet else _print_progress,
+                    args.progress_every
+                )
+        finally:
+            # 途中で止まっても計算済みの行は書き出す
+            writer.flush()
+            if quarantine:
+                quarantine.flush()
+
+    if not args.quiet:
+        _print_progress(stats)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,543 @@
+"""
+税金・社会保険料計算ロジックのバッチ版（NumPy配列による一括計算）
+
+calculator_parttime / calculator_freelance と同じ計算を、1人ずつではなく
+列（配列）単位でまとめて行う。結果は列ごとの配列を持つ dict で返す。
+
+税額・保険料は率を有理数として int64 のまま計算する（fixed_point）。rounding="reference"
+（既定）はスカラー版と同じ1円未満の切り捨て、rounding="legal" は課税標準の1,000円未満と
+税額の100円未満を切り捨てる。
+"""
+
+from typing import Callable, Dict, Iterable, Optional
+
+import numpy as np
+
+from .advice import freelance_advice_codes, parttime_advice_codes
+from .fixed_point import (
+    BUSINESS_TAX_DEDUCTION,
+    BUSINESS_TAX_RATE,
+    HEALTH_INSURANCE_RATE,
+    NATIONAL_HEALTH_INSURANCE_FLAT,
+    NATIONAL_HEALTH_INSURANCE_RATE,
+    PENSION_INSURANCE_RATE,
+    check_rounding,
+    mul_rate,
+    resident_tax_from_taxable,
+    round_tax,
+    round_taxable_income
+)
+from .wall_index import WallIndex
+from .tax_rules import get_rules
+from .calculator_freelance import COMPARISON_FILING_TYPES
+
+
+def _as_int_array(values, size: Optional[int] = None) -> np.ndarray:
+    """整数列に変換（スカラーは size 分に展開）"""
+    array = np.asarray(values, dtype=np.int64)
+    if size is not None and array.ndim == 0:
+        array = np.full(size, array, dtype=np.int64)
+    return array
+
+
+def _as_column(values, size: int, dtype=None) -> np.ndarray:
+    """任意の列に変換（スカラーは size 分に展開）"""
+    array = np.asarray(values, dtype=dtype)
+    if array.ndim == 0:
+        array = np.full(size, array, dtype=array.dtype)
+    return array
+
+
+def truncate_to_int(values: np.ndarray) -> np.ndarray:
+    """int() と同じく0方向へ切り捨てて整数化"""
+    return np.trunc(values).astype(np.int64)
+
+
+def calculate_income_tax_batch(
+    taxable_income: np.ndarray,
+    tax_year: Optional[int] = None,
+    rounding: str = "reference"
+) -> np.ndarray:
+    """
+    所得税を一括計算
+
+    Args:
+        taxable_income: 課税所得（円）の配列
+        tax_year: 年分（省略時は tax_rules.DEFAULT_TAX_YEAR）
+        rounding: 端数処理（"reference" | "legal"）
+
+    Returns:
+        所得税額（円）の配列
+    """
+    return _income_tax(get_rules(tax_year), np.asarray(taxable_income, dtype=np.int64), check_rounding(rounding))
+
+
+def _income_tax(rules, taxable_income: np.ndarray, rounding: str) -> np.ndarray:
+    """所得税（課税所得・税額の端数処理つき）"""
+    return round_tax(rules.income_tax.evaluate_array(round_taxable_income(taxable_income, rounding)), rounding)
+
+
+def calculate_employment_income_deduction_batch(
+    annual_income: np.ndarray,
+    tax_year: Optional[int] = None
+) -> np.ndarray:
+    """
+    給与所得控除を一括計算
+
+    Args:
+        annual_income: 年収（円）の配列
+        tax_year: 年分（省略時は tax_rules.DEFAULT_TAX_YEAR）
+
+    Returns:
+        給与所得控除額（円）の配列
+    """
+    return get_rules(tax_year).employment_income_deduction.evaluate_array(annual_income)
+
+
+def calculate_resident_tax_batch(
+    annual_income: np.ndarray,
+    tax_year: Optional[int] = None,
+    rounding: str = "reference"
+) -> np.ndarray:
+    """
+    住民税を一括計算（簡易版）
+
+    Args:
+        annual_income: 年収（円）の配列
+        tax_year: 年分（省略時は tax_rules.DEFAULT_TAX_YEAR）
+        rounding: 端数処理（"reference" | "legal"）
+
+    Returns:
+        住民税額（円）の配列
+    """
+    rules = get_rules(tax_year)
+    annual_income = np.asarray(annual_income, dtype=np.int64)
+    income = annual_income - rules.employment_income_deduction.evaluate_array(annual_income)
+    taxable_income = np.maximum(income - rules.resident_basic_deduction, 0)
+    return resident_tax_from_taxable(taxable_income, check_rounding(rounding))
+
+
+def _wall_columns(income: np.ndarray, wall_index: WallIndex) -> Dict[str, np.ndarray]:
+    """超えた壁の数と次の壁までの距離を一括計算"""
+    # 超えた壁の数 = 次の壁のインデックス
+    wall_level, next_wall_remaining = wall_index.next_remaining(income)
+    wall_amounts = np.array(wall_index.amounts + (0,), dtype=np.int64)
+
+    return {
+        "wallsExceeded": wall_amounts[np.newaxis, :-1] <= income[:, np.newaxis],
+        "wallLevel": wall_level,
+        "nextWallAmount": wall_amounts[wall_level],
+        "nextWallRemaining": next_wall_remaining
+    }
+
+
+def calculate_parttime_tax_batch(
+    annual_income,
+    monthly_income=None,
+    is_student=False,
+    company_size="small",
+    weekly_hours=0,
+    dependent_type="none",
+    tax_year: Optional[int] = None,
+    rounding: str = "reference"
+) -> Dict[str, np.ndarray]:
+    """
+    アルバイト・パートの税金・社会保険料を一括計算
+
+    calculate_parttime_tax と同じ結果を列単位で返す（アドバイスは文ではなくコードの列
+    adviceCode で返す）。各引数は配列またはスカラー（全行共通）で指定できる。
+
+    Args:
+        annual_income: 年収（円）
+        monthly_income: 月収（円）※社会保険判定用。None の場合は年収から計算
+        is_student: 学生かどうか
+        company_size: 企業規模（"small" | "medium" | "large"）
+        weekly_hours: 週の勤務時間
+        dependent_type: 扶養区分（"parent" | "spouse" | "none"）※アドバイス用で税額には影響しない
+        tax_year: 年分（省略時は tax_rules.DEFAULT_TAX_YEAR）
+        rounding: 端数処理（"reference" はスカラー版と同じ、"legal" は1,000円・100円未満を切り捨て）
+
+    Returns:
+        列ごとの計算結果（キーは calculate_parttime_tax の結果に対応）
+    """
+    rules = get_rules(tax_year)
+    check_rounding(rounding)
+    annual_income = _as_int_array(annual_income)
+    size = annual_income.shape[0]
+
+    # 月収が指定されていない場合は年収から計算
+    if monthly_income is None:
+        monthly_income = annual_income // 12
+    else:
+        monthly_income = _as_int_array(monthly_income, size)
+
+    is_student = _as_column(is_student, size, dtype=bool)
+    company_size = _as_column(company_size, size)
+    weekly_hours = _as_column(weekly_hours, size, dtype=np.float64)
+    dependent_type = _as_column(dependent_type, size)
+
+    # 所得
+    income = annual_income - rules.employment_income_deduction.evaluate_array(annual_income)
+
+    # 勤労学生控除（学生で所得75万円以下の場合。2025年分からは85万円以下）
+    student_deduction = np.where(
+        is_student & (income <= rules.student_deduction_income_limit), rules.student_deduction, 0
+    )
+
+    # 課税所得（基礎控除は所得に応じた額）
+    taxable_income = np.maximum(income - rules.basic_deduction.evaluate_array(income) - student_deduction, 0)
+
+    # 所得税・住民税
+    income_tax = _income_tax(rules, taxable_income, rounding)
+    resident_tax = resident_tax_from_taxable(np.maximum(income - rules.resident_basic_deduction, 0), rounding)
+
+    # 社会保険加入判定（106万円の壁）
+    social_insurance_required = (
+        (weekly_hours >= 20)
+        & (monthly_income >= rules.social_insurance_monthly_threshold)
+        & ~is_student
+        & np.isin(company_size, rules.social_insurance_company_sizes)
+    )
+
+    # 130万円の壁（扶養から外れる）
+    over_130 = ~social_insurance_required & (annual_income >= rules.dependent_insurance_threshold)
+
+    # 社会保険料（106万円の壁は月額×12、130万円の壁は国保・国民年金の概算）
+    health_insurance = np.select(
+        [social_insurance_required, over_130],
+        [mul_rate(monthly_income, HEALTH_INSURANCE_RATE) * 12, 100000],
+        default=0
+    )
+    pension_insurance = np.select(
+        [social_insurance_required, over_130],
+        [mul_rate(monthly_income, PENSION_INSURANCE_RATE) * 12, rules.national_pension_annual],
+        default=0
+    )
+    social_insurance_total = health_insurance + pension_insurance
+
+    # 手取り額
+    net_income = annual_income - income_tax - resident_tax - social_insurance_total
+    walls = _wall_columns(annual_income, rules.walls["parttime"])
+
+    return {
+        "totalIncome": annual_income,
+        "monthlyAverage": monthly_income,
+        "incomeTax": income_tax,
+        "residentTax": resident_tax,
+        "socialInsuranceRequired": social_insurance_required,
+        "socialInsuranceType": np.select(
+            [social_insurance_required, over_130], ["106万", "130万"], default=""
+        ),
+        "healthInsurance": health_insurance,
+        "pensionInsurance": pension_insurance,
+        "socialInsuranceTotal": social_insurance_total,
+        "netIncome": net_income,
+        **walls,
+        "dependentType": dependent_type,
+        "adviceCode": parttime_advice_codes(walls["wallLevel"], is_student, dependent_type == "parent", rules.year)
+    }
+
+
+def calculate_resident_tax_freelance_batch(
+    business_income: np.ndarray,
+    tax_year: Optional[int] = None,
+    rounding: str = "reference"
+) -> np.ndarray:
+    """
+    住民税を一括計算（事業所得ベース）
+
+    Args:
+        business_income: 事業所得（円）の配列
+        tax_year: 年分（省略時は tax_rules.DEFAULT_TAX_YEAR）
+        rounding: 端数処理（"reference" | "legal"）
+
+    Returns:
+        住民税額（円）の配列
+    """
+    basic_deduction = get_rules(tax_year).resident_basic_deduction
+    taxable_income = np.maximum(np.asarray(business_income, dtype=np.int64) - basic_deduction, 0)
+    return resident_tax_from_taxable(taxable_income, check_rounding(rounding))
+
+
+def calculate_business_tax_batch(business_income: np.ndarray, rounding: str = "reference") -> np.ndarray:
+    """
+    個人事業税を一括計算（事業主控除290万円・税率5%）
+
+    Args:
+        business_income: 事業所得（円）の配列
+        rounding: 端数処理（"reference" | "legal"）
+
+    Returns:
+        個人事業税額（円）の配列
+    """
+    check_rounding(rounding)
+    taxable_income = np.maximum(np.asarray(business_income, dtype=np.int64) - BUSINESS_TAX_DEDUCTION, 0)
+    return round_tax(mul_rate(round_taxable_income(taxable_income, rounding), BUSINESS_TAX_RATE), rounding)
+
+
+def calculate_national_health_insurance_batch(
+    business_income: np.ndarray,
+    tax_year: Optional[int] = None
+) -> np.ndarray:
+    """
+    国民健康保険料を一括計算（概算）
+
+    Args:
+        business_income: 事業所得（円）の配列
+        tax_year: 年分（省略時は tax_rules.DEFAULT_TAX_YEAR）
+
+    Returns:
+        国民健康保険料（円）の配列
+    """
+    basic_deduction = get_rules(tax_year).resident_basic_deduction
+    income = np.maximum(np.asarray(business_income, dtype=np.int64) - basic_deduction, 0)
+    return mul_rate(income, NATIONAL_HEALTH_INSURANCE_RATE) + NATIONAL_HEALTH_INSURANCE_FLAT
+
+
+def _round_1(values: np.ndarray) -> np.ndarray:
+    """round(x, 1) と同じ結果になるよう小数第1位に丸める"""
+    rounded = np.round(values, 1)
+    # 0.05刻みの境界付近だけは np.round と組み込み round で結果が分かれるため個別に丸める
+    near_half = np.abs(np.abs(np.modf(values * 10)[0]) - 0.5) < 1e-6
+    if near_half.any():
+        rounded[near_half] = [round(value, 1) for value in values[near_half].tolist()]
+    return rounded
+
+
+def _lookup_column(keys: np.ndarray, table: Dict, default_key: str, field: str) -> np.ndarray:
+    """文字列の列をマスターデータの値に変換（ユニーク値ごとに1回だけ引く）"""
+    unique_keys, inverse = np.unique(keys, return_inverse=True)
+    values = np.array([table.get(key, table[default_key])[field] for key in unique_keys.tolist()])
+    return values[inverse.reshape(keys.shape)]
+
+
+def calculate_freelance_tax_batch(
+    annual_revenue,
+    annual_expense,
+    tax_filing_type="white",
+    business_type="other",
+    is_student=False,
+    dependent_type="none",
+    tax_year: Optional[int] = None,
+    rounding: str = "reference"
+) -> Dict[str, np.ndarray]:
+    """
+    業務委託・フリーランスの税金・社会保険料を一括計算
+
+    calculate_freelance_tax と同じ結果を列単位で返す（青色vs白色の比較は含まない。
+    アドバイスは文ではなくコードの列 adviceCode で返し、advice.render_freelance_advice で
+    表示する行だけ文にする）。各引数は配列またはスカラー（全行共通）で指定できる。
+
+    Args:
+        annual_revenue: 年間売上（円）
+        annual_expense: 年間経費（円）
+        tax_filing_type: 申告種類（"white" | "blue10" | "blue55" | "blue65"）
+        business_type: 事業種類（"writer" | "designer" | "engineer" | "video_editor" | "other"）
+        is_student: 学生かどうか
+        dependent_type: 扶養区分（"parent" | "spouse" | "none"）※アドバイス用で税額には影響しない
+        tax_year: 年分（省略時は tax_rules.DEFAULT_TAX_YEAR）
+        rounding: 端数処理（"reference" はスカラー版と同じ、"legal" は1,000円・100円未満を切り捨て）
+
+    Returns:
+        列ごとの計算結果（キーは calculate_freelance_tax の結果に対応）
+    """
+    rules = get_rules(tax_year)
+    check_rounding(rounding)
+    annual_revenue = _as_int_array(annual_revenue)
+    size = annual_revenue.shape[0]
+    annual_expense = _as_int_array(annual_expense, size)
+    tax_filing_type = _as_column(tax_filing_type, size)
+    business_type = _as_column(business_type, size)
+    is_student = _as_column(is_student, size, dtype=bool)
+    dependent_type = _as_column(dependent_type, size)
+
+    # 青色申告特別控除
+    blue_filing_deduction = np.select(
+        [tax_filing_type == filing_type for filing_type in rules.blue_filing_deductions],
+        list(rules.blue_filing_deductions.values()),
+        default=0
+    )
+
+    # 事業所得
+    business_income = annual_revenue - annual_expense - blue_filing_deduction
+
+    # 課税所得（基礎控除は所得に応じた額）
+    basic_deduction = rules.basic_deduction.evaluate_array(business_income)
+    taxable_income = np.maximum(business_income - basic_deduction, 0)
+
+    # 所得税・住民税・個人事業税
+    income_tax = _income_tax(rules, taxable_income, rounding)
+    resident_tax = resident_tax_from_taxable(np.maximum(business_income - rules.resident_basic_deduction, 0), rounding)
+    business_tax = calculate_business_tax_batch(business_income, rounding)
+
+    # 国民健康保険料・国民年金保険料
+    health_insurance = calculate_national_health_insurance_batch(business_income, rules.year)
+    pension_insurance = np.full(size, rules.national_pension_annual, dtype=np.int64)
+
+    # 学生納付特例（所得118万円以下）
+    student_pension_exemption = is_student & (business_income <= rules.student_pension_exemption_limit)
+
+    # 手取り額
+    total_tax = income_tax + resident_tax + business_tax
+    total_insurance = health_insurance + np.where(student_pension_exemption, 0, pension_insurance)
+    net_income = annual_revenue - annual_expense - total_tax - total_insurance
+
+    # 経費率
+    positive_revenue = annual_revenue > 0
+    expense_rate = np.divide(
+        annual_expense, annual_revenue,
+        out=np.zeros(size, dtype=np.float64),
+        where=positive_revenue
+    ) * 100
+
+    # 業種平均経費率と残り経費計上可能額（業種平均まで）
+    industry_average_expense_rate = _lookup_column(
+        business_type, rules.expense_rates, "other", "averageRate"
+    )
+    remaining_expense_capacity = np.maximum(
+        truncate_to_int(annual_revenue * industry_average_expense_rate / 100) - annual_expense,
+        0
+    )
+    walls = _wall_columns(business_income, rules.walls["freelance"])
+    confirmation_required = business_income > basic_deduction
+
+    # アドバイスコード（白色申告・経費・学生納付特例の文は行ごとの条件で加える）
+    advice_code = freelance_advice_codes(
+        walls["wallLevel"],
+        dependent_type == "parent",
+        (tax_filing_type == "white") & confirmation_required,
+        (expense_rate < industry_average_expense_rate) & (remaining_expense_capacity > 0),
+        student_pension_exemption,
+        rules.year
+    )
+
+    return {
+        "totalRevenue": annual_revenue,
+        "totalExpense": annual_expense,
+        "expenseRate": _round_1(expense_rate),
+        "industryAverageExpenseRate": industry_average_expense_rate,
+        "blueFilingDeduction": blue_filing_deduction,
+        "businessIncome": business_income,
+        "incomeTax": income_tax,
+        "residentTax": resident_tax,
+        "businessTax": business_tax,
+        "healthInsurance": health_insurance,
+        "pensionInsurance": pension_insurance,
+        "studentPensionExemption": student_pension_exemption,
+        "totalTax": total_tax,
+        "totalInsurance": total_insurance,
+        "netIncome": net_income,
+        **walls,
+        "remainingExpenseCapacity": remaining_expense_capacity,
+        "confirmationRequired": confirmation_required,
+        "adviceCode": advice_code
+    }
+
+
+def evaluate_filing_scenarios_batch(
+    revenue,
+    expense,
+    filing_types=COMPARISON_FILING_TYPES,
+    tax_year: Optional[int] = None,
+    rounding: str = "reference"
+) -> Dict[str, np.ndarray]:
+    """
+    申告種類ごとの所得・税額・手取りを一括計算
+
+    evaluate_filing_scenarios と同じ結果を（行 × 申告種類）の2次元配列で返す。
+    全行・全申告種類の所得を1つの配列にまとめ、所得税と住民税を1回ずつ計算する。
+
+    Args:
+        revenue: 売上（配列またはスカラー）
+        expense: 経費（配列またはスカラー）
+        filing_types: 評価する申告種類（BLUE_FILING_DEDUCTIONS のキー）
+        tax_year: 年分（省略時は tax_rules.DEFAULT_TAX_YEAR）
+        rounding: 端数処理（"reference" | "legal"）
+
+    Returns:
+        列ごとの計算結果（"filingTypes" 以外は 行 × 申告種類 の配列）
+    """
+    rules = get_rules(tax_year)
+    check_rounding(rounding)
+    revenue = _as_int_array(revenue)
+    expense = _as_int_array(expense, revenue.shape[0])
+    deductions = np.array(
+        [rules.blue_filing_deductions[filing_type] for filing_type in filing_types], dtype=np.int64
+    )
+
+    # 全シナリオ共通の売上−経費
+    profit = revenue - expense
+    income = profit[:, None] - deductions[None, :]
+
+    taxable_income = np.maximum(income - rules.basic_deduction.evaluate_array(income), 0)
+    income_tax = _income_tax(rules, taxable_income, rounding)
+    resident_tax = resident_tax_from_taxable(np.maximum(income - rules.resident_basic_deduction, 0), rounding)
+    tax = income_tax + resident_tax
+
+    return {
+        "filingTypes": tuple(filing_types),
+        "income": income,
+        "incomeTax": income_tax,
+        "residentTax": resident_tax,
+        "tax": tax,
+        "netIncome": profit[:, None] - tax
+    }
+
+
+def calculate_by_tax_year(
+    batch_function: Callable[..., Dict[str, np.ndarray]],
+    tax_years: Iterable[int],
+    **columns
+) -> Dict[int, Dict[str, np.ndarray]]:
+    """
+    同じ入力を複数の年分で一括計算（年分の比較用）
+
+    入力のリストは最初に1回だけ配列へ変換し、各年分の変換済みルールで計算する。
+
+    Args:
+        batch_function: calculate_parttime_tax_batch などの一括計算関数
+        tax_years: 年分
+        **columns: batch_function の引数（tax_year 以外）
+
+    Returns:
+        年分 → 列ごとの計算結果
+    """
+    columns = {
+        name: np.asarray(values) if isinstance(values, (list, tuple)) else values
+        for name, values in columns.items()
+    }
+    return {tax_year: batch_function(**columns, tax_year=tax_year) for tax_year in tax_years}
+
+
+if __name__ == "__main__":
+    # テスト実行
+    result = calculate_parttime_tax_batch(
+        annual_income=[900000, 1200000, 1200000, 1400000, 2500000],
+        is_student=[True, True, False, False, False],
+        company_size="large",
+        weekly_hours=25
+    )
+
+    print("=== 一括計算結果 ===")
+    for i, annual_income in enumerate(result["totalIncome"]):
+        print(
+            f"年収: {annual_income:,}円 / 所得税: {result['incomeTax'][i]:,}円 / "
+            f"住民税: {result['residentTax'][i]:,}円 / 社会保険料: {result['socialInsuranceTotal'][i]:,}円 / "
+            f"手取り: {result['netIncome'][i]:,}円"
+        )
+
+    result = calculate_freelance_tax_batch(
+        annual_revenue=[500000, 1500000, 1500000, 4000000],
+        annual_expense=[100000, 300000, 300000, 800000],
+        tax_filing_type=["white", "white", "blue65", "blue65"],
+        business_type="writer",
+        is_student=True
+    )
+
+    print("\n=== 一括計算結果（業務委託版） ===")
+    for i, annual_revenue in enumerate(result["totalRevenue"]):
+        print(
+            f"売上: {annual_revenue:,}円 / 事業所得: {result['businessIncome'][i]:,}円 / "
+            f"税金合計: {result['totalTax'][i]:,}円 / 保険料合計: {result['totalInsurance'][i]:,}円 / "
+            f"手取り: {result['netIncome'][i]:,}円 / 次の壁まで: {result['nextWallRemaining'][i]:,}円"
+        )
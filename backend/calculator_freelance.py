@@ -2,46 +2,45 @@
 業務委託版の税金・社会保険料計算ロジック
 """
 
-from typing import Dict, List, Optional
-from walls_data import get_next_wall, get_exceeded_walls, EXPENSE_RATES_BY_BUSINESS
+from typing import Dict, List, Optional, Sequence, Tuple
+from .advice import advice_table, freelance_advice, freelance_advice_flags
+from .tax_rules import get_rules
+from .results import FreelanceResult, FilingComparison
+from . import instrumentation
 
 
-def calculate_income_tax_freelance(taxable_income: int) -> int:
+# 青色vs白色の比較で評価する申告種類（青色55万円は65万円の要件を一部満たさない場合の控除で、
+# 比較の結果 savingsBlue10 / savingsBlue65 の対象ではないため含めない）
+COMPARISON_FILING_TYPES = ("white", "blue10", "blue65")
+
+
+def calculate_income_tax_freelance(taxable_income: int, tax_year: Optional[int] = None) -> int:
     """
     所得税を計算（事業所得ベース）
 
     Args:
         taxable_income: 課税所得（円）
+        tax_year: 年分（省略時は tax_rules.DEFAULT_TAX_YEAR）
 
     Returns:
         所得税額（円）
     """
-    if taxable_income <= 0:
-        return 0
-    elif taxable_income <= 1950000:
-        return int(taxable_income * 0.05)
-    elif taxable_income <= 3300000:
-        return int(taxable_income * 0.10 - 97500)
-    elif taxable_income <= 6950000:
-        return int(taxable_income * 0.20 - 427500)
-    elif taxable_income <= 9000000:
-        return int(taxable_income * 0.23 - 636000)
-    else:
-        return int(taxable_income * 0.33 - 1536000)
-
-
-def calculate_resident_tax_freelance(business_income: int) -> int:
+    return get_rules(tax_year).income_tax(taxable_income)
+
+
+def calculate_resident_tax_freelance(business_income: int, tax_year: Optional[int] = None) -> int:
     """
     住民税を計算（事業所得ベース）
 
     Args:
         business_income: 事業所得（円）
+        tax_year: 年分（省略時は tax_rules.DEFAULT_TAX_YEAR）
 
     Returns:
         住民税額（円）
     """
     # 基礎控除（住民税は43万円）
-    basic_deduction = 430000
+    basic_deduction = get_rules(tax_year).resident_basic_deduction
 
     # 課税所得
     taxable_income = max(business_income - basic_deduction, 0)
@@ -80,18 +79,19 @@ def calculate_business_tax(business_income: int, business_type: str) -> int:
     return int(taxable_income * tax_rate)
 
 
-def calculate_national_health_insurance(business_income: int) -> int:
+def calculate_national_health_insurance(business_income: int, tax_year: Optional[int] = None) -> int:
     """
     国民健康保険料を計算（概算）
 
     Args:
         business_income: 事業所得（円）
+        tax_year: 年分（省略時は tax_rules.DEFAULT_TAX_YEAR）
 
     Returns:
         国民健康保険料（円）
     """
     # 基礎控除
-    basic_deduction = 430000
+    basic_deduction = get_rules(tax_year).resident_basic_deduction
 
     # 所得
     income = max(business_income - basic_deduction, 0)
@@ -104,15 +104,18 @@ def calculate_national_health_insurance(business_income: int) -> int:
     return income_based + flat_rate
 
 
-def calculate_national_pension() -> int:
+def calculate_national_pension(tax_year: Optional[int] = None) -> int:
     """
     国民年金保険料を計算
 
+    Args:
+        tax_year: 年分（省略時は tax_rules.DEFAULT_TAX_YEAR）
+
     Returns:
         国民年金保険料（円/年）
     """
-    # 2024年度の国民年金保険料（月額16,980円）
-    return 16980 * 12
+    # その年度の国民年金保険料（2024年度は月額16,980円）
+    return get_rules(tax_year).national_pension_annual
 
 
 def calculate_freelance_tax(
@@ -122,8 +125,9 @@ def calculate_freelance_tax(
     is_student: bool = False,
     dependent_type: str = "none",
     tax_filing_type: str = "white",
-    business_type: str = "other"
-) -> Dict:
+    business_type: str = "other",
+    tax_year: Optional[int] = None
+) -> FreelanceResult:
     """
     業務委託・フリーランスの税金・社会保険料を計算
 
@@ -133,46 +137,50 @@ def calculate_freelance_tax(
         annual_expense: 年間経費（円）
         is_student: 学生かどうか
         dependent_type: 扶養区分（"parent" | "spouse" | "none"）
-        tax_filing_type: 申告種類（"white" | "blue10" | "blue65"）
+        tax_filing_type: 申告種類（"white" | "blue10" | "blue55" | "blue65"）
         business_type: 事業種類（"writer" | "designer" | "engineer" | "video_editor" | "other"）
+        tax_year: 年分（省略時は tax_rules.DEFAULT_TAX_YEAR）
 
     Returns:
-        計算結果
+        計算結果（camelCase のキーで参照できる。to_dict() で dict に変換）
     """
+    timer = instrumentation.start("freelance")
+    rules = get_rules(tax_year)
+
     # 青色申告特別控除
-    if tax_filing_type == "blue65":
-        blue_filing_deduction = 650000
-    elif tax_filing_type == "blue10":
-        blue_filing_deduction = 100000
-    else:
-        blue_filing_deduction = 0
+    blue_filing_deduction = rules.blue_filing_deductions.get(tax_filing_type, 0)
 
     # 事業所得
     business_income = annual_revenue - annual_expense - blue_filing_deduction
 
-    # 基礎控除
-    basic_deduction = 480000
+    # 基礎控除（2025年分からは所得に応じて段階的）
+    basic_deduction = rules.basic_deduction(business_income)
 
     # 課税所得
     taxable_income = max(business_income - basic_deduction, 0)
+    timer.mark("deductions")
 
     # 所得税
-    income_tax = calculate_income_tax_freelance(taxable_income)
+    income_tax = rules.income_tax(taxable_income)
+    timer.mark("income_tax")
 
     # 住民税
-    resident_tax = calculate_resident_tax_freelance(business_income)
+    resident_tax = calculate_resident_tax_freelance(business_income, rules.year)
+    timer.mark("resident_tax")
 
     # 個人事業税
     business_tax = calculate_business_tax(business_income, business_type)
+    timer.mark("business_tax")
 
     # 国民健康保険料
-    health_insurance = calculate_national_health_insurance(business_income)
+    health_insurance = calculate_national_health_insurance(business_income, rules.year)
 
     # 国民年金保険料
-    pension_insurance = calculate_national_pension()
+    pension_insurance = rules.national_pension_annual
 
     # 学生納付特例（所得118万円以下）
-    student_pension_exemption = is_student and business_income <= 1180000
+    student_pension_exemption = is_student and business_income <= rules.student_pension_exemption_limit
+    timer.mark("insurance")
 
     # 手取り額
     total_tax = income_tax + resident_tax + business_tax
@@ -183,7 +191,7 @@ def calculate_freelance_tax(
     expense_rate = (annual_expense / annual_revenue * 100) if annual_revenue > 0 else 0
 
     # 業種平均経費率
-    industry_data = EXPENSE_RATES_BY_BUSINESS.get(business_type, EXPENSE_RATES_BY_BUSINESS["other"])
+    industry_data = rules.expense_rates.get(business_type, rules.expense_rates["other"])
     industry_average_expense_rate = industry_data["averageRate"]
 
     # 残り経費計上可能額（業種平均まで）
@@ -191,64 +199,131 @@ def calculate_freelance_tax(
         int(annual_revenue * industry_average_expense_rate / 100) - annual_expense,
         0
     )
+    timer.mark("expense")
 
-    # 超えた壁（所得ベース）
-    exceeded_walls = get_exceeded_walls(business_income, "freelance")
-
-    # 次の壁（所得ベース）
-    next_wall = get_next_wall(business_income, "freelance")
+    # 超えた壁の数（所得ベース。超えた壁・次の壁は結果を参照したときに作る）
+    wall_index = rules.walls["freelance"]
+    wall_level = wall_index.level(business_income)
+    timer.mark("walls")
 
     # 青色申告vs白色申告の比較
     blue_vs_white_comparison = compare_blue_vs_white(
-        annual_revenue, annual_expense, business_income, income_tax, total_tax, net_income, tax_filing_type
+        annual_revenue, annual_expense, business_income, income_tax, total_tax, net_income, tax_filing_type,
+        current_resident_tax=resident_tax, tax_year=rules.year
     )
+    timer.mark("comparison")
 
     # 確定申告が必要かどうか
-    confirmation_required = business_income > 480000  # 基礎控除を超える場合
-
-    # アドバイス生成
-    advice = generate_advice_freelance(
-        business_income,
-        exceeded_walls,
-        next_wall,
-        is_student,
-        dependent_type,
-        tax_filing_type,
-        expense_rate,
-        industry_average_expense_rate,
-        remaining_expense_capacity
+    confirmation_required = business_income > basic_deduction  # 基礎控除を超える場合
+
+    # アドバイスは決定表でコードだけを決める（文は結果の advice を参照したときに作る）
+    advice_code = advice_table("freelance", rules)[wall_level][dependent_type == "parent"] | freelance_advice_flags(
+        tax_filing_type == "white" and confirmation_required,
+        expense_rate < industry_average_expense_rate and remaining_expense_capacity > 0,
+        student_pension_exemption
+    )
+    timer.mark("advice")
+
+    result = FreelanceResult(
+        total_revenue=annual_revenue,
+        total_expense=annual_expense,
+        expense_rate=round(expense_rate, 1),
+        industry_average_expense_rate=industry_average_expense_rate,
+        blue_filing_deduction=blue_filing_deduction,
+        business_income=business_income,
+        income_tax=income_tax,
+        resident_tax=resident_tax,
+        business_tax=business_tax,
+        health_insurance=health_insurance,
+        pension_insurance=pension_insurance,
+        student_pension_exemption=student_pension_exemption,
+        total_tax=total_tax,
+        total_insurance=total_insurance if not student_pension_exemption else health_insurance,
+        net_income=net_income,
+        wall_index=wall_index,
+        wall_level=wall_level,
+        blue_vs_white_comparison=blue_vs_white_comparison,
+        remaining_expense_capacity=remaining_expense_capacity,
+        confirmation_required=confirmation_required,
+        advice_code=advice_code
     )
+    timer.mark("result")
+
+    return result
+
+
+def _scenario_taxes(
+    rules,
+    profit: int,
+    filing_types: Sequence[str],
+    computed: Optional[Dict[str, Tuple[int, int, int]]]
+) -> List[Tuple[int, int, int]]:
+    """申告種類ごとの (所得, 所得税, 住民税)（evaluate_filing_scenarios と compare_blue_vs_white で共通）"""
+    computed = computed or {}
+    deductions = rules.blue_filing_deductions
+    income_tax = rules.income_tax
+    basic_deduction = rules.basic_deduction
+    year = rules.year
+    scenarios = []
+    for filing_type in filing_types:
+        known = computed.get(filing_type)
+        if known is not None:
+            scenarios.append(known)
+        else:
+            income = profit - deductions[filing_type]
+            scenarios.append((
+                income,
+                income_tax(max(income - basic_deduction(income), 0)),
+                calculate_resident_tax_freelance(income, year)
+            ))
+    return scenarios
+
+
+def evaluate_filing_scenarios(
+    revenue: int,
+    expense: int,
+    filing_types: Sequence[str] = COMPARISON_FILING_TYPES,
+    computed: Optional[Dict[str, Dict]] = None,
+    tax_year: Optional[int] = None
+) -> Dict[str, Dict]:
+    """
+    申告種類ごとの所得・税額・手取りをまとめて計算
 
-    return {
-        "totalRevenue": annual_revenue,
-        "totalExpense": annual_expense,
-        "expenseRate": round(expense_rate, 1),
-        "industryAverageExpenseRate": industry_average_expense_rate,
-        "blueFilingDeduction": blue_filing_deduction,
-        "businessIncome": business_income,
-        "incomeTax": income_tax,
-        "residentTax": resident_tax,
-        "businessTax": business_tax,
-        "healthInsurance": health_insurance,
-        "pensionInsurance": pension_insurance,
-        "studentPensionExemption": student_pension_exemption,
-        "totalTax": total_tax,
-        "totalInsurance": total_insurance if not student_pension_exemption else health_insurance,
-        "netIncome": net_income,
-        "wallsExceeded": [
-            {
-                "amount": wall["amount"],
-                "name": wall["name"],
-                "impact": wall["impacts"]["self"] or wall["impacts"]["family"]
-            }
-            for wall in exceeded_walls
-        ],
-        "nextWall": next_wall,
-        "blueVsWhiteComparison": blue_vs_white_comparison,
-        "remainingExpenseCapacity": remaining_expense_capacity,
-        "confirmationRequired": confirmation_required,
-        "advice": advice
-    }
+    売上−経費は全シナリオで共通のため1回だけ計算する。computed に含まれる申告種類は
+    計算済みの値をそのまま使う。税額は所得税＋住民税（個人事業税と社会保険料は含まない）。
+
+    Args:
+        revenue: 売上
+        expense: 経費
+        filing_types: 評価する申告種類（BLUE_FILING_DEDUCTIONS のキー）
+        computed: 申告種類 → 計算済みの {"income", "incomeTax", "residentTax"}
+        tax_year: 年分（省略時は tax_rules.DEFAULT_TAX_YEAR）
+
+    Returns:
+        申告種類 → {"income", "incomeTax", "residentTax", "tax", "netIncome"}
+    """
+    # 全シナリオ共通の売上−経費
+    profit = revenue - expense
+    if computed:
+        computed = {
+            filing_type: (known["income"], known["incomeTax"], known["residentTax"])
+            for filing_type, known in computed.items()
+        }
+
+    scenarios = {}
+    for filing_type, (income, income_tax, resident_tax) in zip(
+        filing_types, _scenario_taxes(get_rules(tax_year), profit, filing_types, computed)
+    ):
+        tax = income_tax + resident_tax
+        scenarios[filing_type] = {
+            "income": income,
+            "incomeTax": income_tax,
+            "residentTax": resident_tax,
+            "tax": tax,
+            "netIncome": profit - tax
+        }
+
+    return scenarios
 
 
 def compare_blue_vs_white(
@@ -258,11 +333,17 @@ def compare_blue_vs_white(
     current_income_tax: int,
     current_total_tax: int,
     current_net_income: int,
-    current_type: str
-) -> Dict:
+    current_type: str,
+    current_resident_tax: Optional[int] = None,
+    tax_year: Optional[int] = None
+) -> FilingComparison:
     """
     青色申告vs白色申告の比較
 
+    申告種類ごとの計算は evaluate_filing_scenarios と共通（結果の dict は作らない）。
+    比較するのは COMPARISON_FILING_TYPES（白色・青色10万円・青色65万円）だけ。現在の申告タイプが
+    青色55万円のときは計算済みの結果を使わず、3種類とも計算する。
+
     Args:
         revenue: 売上
         expense: 経費
@@ -271,119 +352,33 @@ def compare_blue_vs_white(
         current_total_tax: 現在の合計税額
         current_net_income: 現在の手取り
         current_type: 現在の申告タイプ
+        current_resident_tax: 現在の住民税（指定時は現在の申告タイプを計算し直さない）
+        tax_year: 年分（省略時は tax_rules.DEFAULT_TAX_YEAR）
 
     Returns:
-        比較結果
-    """
-    # 白色申告の場合
-    white_income = revenue - expense
-    white_taxable_income = max(white_income - 480000, 0)
-    white_income_tax = calculate_income_tax_freelance(white_taxable_income)
-    white_resident_tax = calculate_resident_tax_freelance(white_income)
-    white_total_tax = white_income_tax + white_resident_tax
-    white_net_income = revenue - expense - white_total_tax
-
-    # 青色申告10万円の場合
-    blue10_income = revenue - expense - 100000
-    blue10_taxable_income = max(blue10_income - 480000, 0)
-    blue10_income_tax = calculate_income_tax_freelance(blue10_taxable_income)
-    blue10_resident_tax = calculate_resident_tax_freelance(blue10_income)
-    blue10_total_tax = blue10_income_tax + blue10_resident_tax
-    blue10_net_income = revenue - expense - blue10_total_tax
-
-    # 青色申告65万円の場合
-    blue65_income = revenue - expense - 650000
-    blue65_taxable_income = max(blue65_income - 480000, 0)
-    blue65_income_tax = calculate_income_tax_freelance(blue65_taxable_income)
-    blue65_resident_tax = calculate_resident_tax_freelance(blue65_income)
-    blue65_total_tax = blue65_income_tax + blue65_resident_tax
-    blue65_net_income = revenue - expense - blue65_total_tax
-
-    # 節税額
-    savings_blue10 = white_total_tax - blue10_total_tax
-    savings_blue65 = white_total_tax - blue65_total_tax
-
-    return {
-        "white": {
-            "income": white_income,
-            "tax": white_total_tax,
-            "netIncome": white_net_income
-        },
-        "blue10": {
-            "income": blue10_income,
-            "tax": blue10_total_tax,
-            "netIncome": blue10_net_income
-        },
-        "blue65": {
-            "income": blue65_income,
-            "tax": blue65_total_tax,
-            "netIncome": blue65_net_income
-        },
-        "savingsBlue10": savings_blue10,
-        "savingsBlue65": savings_blue65
-    }
-
-
-def generate_advice_freelance(
-    business_income: int,
-    exceeded_walls: List,
-    next_wall: Optional[Dict],
-    is_student: bool,
-    dependent_type: str,
-    tax_filing_type: str,
-    expense_rate: float,
-    industry_average: float,
-    remaining_expense: int
-) -> str:
+        比較結果（申告種類 → {income, tax, netIncome} と savingsBlue10 / savingsBlue65）
     """
-    状況に応じたアドバイスを生成（業務委託版）
+    rules = get_rules(tax_year)
 
-    Args:
-        business_income: 事業所得
-        exceeded_walls: 超えた壁のリスト
-        next_wall: 次の壁
-        is_student: 学生かどうか
-        dependent_type: 扶養区分
-        tax_filing_type: 申告タイプ
-        expense_rate: 経費率
-        industry_average: 業種平均経費率
-        remaining_expense: 残り経費計上可能額
+    # 現在の申告タイプは計算済みの結果を使う（未知の申告タイプは控除なし＝白色と同じ）
+    computed = None
+    if current_resident_tax is not None:
+        current_key = current_type if current_type in rules.blue_filing_deductions else "white"
+        computed = {current_key: (current_income, current_income_tax, current_resident_tax)}
 
-    Returns:
-        アドバイス文
-    """
-    advice_parts = []
-
-    # 所得に関するアドバイス
-    if business_income < 480000:
-        advice_parts.append(f"現在の所得は{business_income:,}円です。基礎控除48万円以下のため所得税は発生しません。")
-    elif business_income < 1030000:
-        advice_parts.append(f"所得が48万円を超えているため所得税が発生します。")
-    elif business_income < 1300000:
-        if dependent_type == "parent":
-            advice_parts.append("103万円（給与所得換算）を超えているため、親の扶養控除が外れます。親の税負担が年間5〜16万円増える可能性があります。")
-    elif business_income < 2900000:
-        advice_parts.append("130万円を超えているため、親の社会保険扶養から外れます。国民健康保険・国民年金に加入が必要です。")
-    else:
-        advice_parts.append("290万円を超えているため、個人事業税が発生します。")
-
-    # 青色申告に関するアドバイス
-    if tax_filing_type == "white" and business_income > 480000:
-        advice_parts.append(f"青色申告65万円控除を使えば、年間約{abs(business_income * 0.15):,.0f}円の節税が可能です。")
-
-    # 経費に関するアドバイス
-    if expense_rate < industry_average and remaining_expense > 0:
-        advice_parts.append(f"経費率が業種平均({industry_average}%)より低いです。適切な経費計上であと{remaining_expense:,}円計上できる可能性があります。")
-
-    # 学生納付特例
-    if is_student and business_income <= 1180000:
-        advice_parts.append("学生納付特例により、国民年金の納付を猶予できます。")
-
-    # 次の壁へのアドバイス
-    if next_wall:
-        advice_parts.append(f"次の壁は{next_wall['name']}（あと{next_wall['remaining']:,}円）です。")
-
-    return " ".join(advice_parts) if advice_parts else "適切に収入管理ができています。"
+    profit = revenue - expense
+    incomes = []
+    taxes = []
+    for income, income_tax, resident_tax in _scenario_taxes(rules, profit, COMPARISON_FILING_TYPES, computed):
+        incomes.append(income)
+        taxes.append(income_tax + resident_tax)
+
+    # 手取り・節税額は参照したときに求める
+    return FilingComparison(COMPARISON_FILING_TYPES, profit, tuple(incomes), tuple(taxes))
+
+
+# 状況に応じたアドバイスを生成（文の選び方は advice の決定表と同じ。1件ずつの速い経路をそのまま使う）
+generate_advice_freelance = freelance_advice
 
 
 if __name__ == "__main__":
@@ -2,63 +2,48 @@
 アルバイト・パート版の税金・社会保険料計算ロジック
 """
 
-from typing import Dict, List, Optional
-from walls_data import get_next_wall, get_exceeded_walls
+from typing import Dict, Optional
+from .advice import advice_table, parttime_advice
+from .tax_rules import get_rules
+from .results import ParttimeResult
+from . import instrumentation
 
 
-def calculate_income_tax(taxable_income: int) -> int:
+def calculate_income_tax(taxable_income: int, tax_year: Optional[int] = None) -> int:
     """
     所得税を計算
 
     Args:
         taxable_income: 課税所得（円）
+        tax_year: 年分（省略時は tax_rules.DEFAULT_TAX_YEAR）
 
     Returns:
         所得税額（円）
     """
-    if taxable_income <= 0:
-        return 0
-    elif taxable_income <= 1950000:
-        return int(taxable_income * 0.05)
-    elif taxable_income <= 3300000:
-        return int(taxable_income * 0.10 - 97500)
-    elif taxable_income <= 6950000:
-        return int(taxable_income * 0.20 - 427500)
-    elif taxable_income <= 9000000:
-        return int(taxable_income * 0.23 - 636000)
-    else:
-        return int(taxable_income * 0.33 - 1536000)
+    return get_rules(tax_year).income_tax(taxable_income)
 
 
-def calculate_resident_tax(annual_income: int) -> int:
+def calculate_resident_tax(annual_income: int, tax_year: Optional[int] = None) -> int:
     """
     住民税を計算（簡易版）
 
     Args:
         annual_income: 年収（円）
+        tax_year: 年分（省略時は tax_rules.DEFAULT_TAX_YEAR）
 
     Returns:
         住民税額（円）
     """
+    rules = get_rules(tax_year)
+
     # 給与所得控除
-    if annual_income <= 1625000:
-        employment_income_deduction = 550000
-    elif annual_income <= 1800000:
-        employment_income_deduction = int(annual_income * 0.4 - 100000)
-    elif annual_income <= 3600000:
-        employment_income_deduction = int(annual_income * 0.3 + 80000)
-    elif annual_income <= 6600000:
-        employment_income_deduction = int(annual_income * 0.2 + 440000)
-    elif annual_income <= 8500000:
-        employment_income_deduction = int(annual_income * 0.1 + 1100000)
-    else:
-        employment_income_deduction = 1950000
+    employment_income_deduction = rules.employment_income_deduction(annual_income)
 
     # 所得
     income = annual_income - employment_income_deduction
 
     # 基礎控除（住民税は43万円）
-    basic_deduction = 430000
+    basic_deduction = rules.resident_basic_deduction
 
     # 課税所得
     taxable_income = max(income - basic_deduction, 0)
@@ -75,7 +60,8 @@ def check_social_insurance_requirement(
     monthly_income: int,
     weekly_hours: float,
     is_student: bool,
-    company_size: str
+    company_size: str,
+    tax_year: Optional[int] = None
 ) -> Dict:
     """
     106万円の壁の社会保険加入要件をチェック
@@ -85,16 +71,18 @@ def check_social_insurance_requirement(
         weekly_hours: 週の勤務時間
         is_student: 学生かどうか
         company_size: 企業規模（"small" | "medium" | "large"）
+        tax_year: 年分（省略時は tax_rules.DEFAULT_TAX_YEAR）
 
     Returns:
         加入要件のチェック結果
     """
+    rules = get_rules(tax_year)
     conditions = {
         "weeklyHours": weekly_hours >= 20,
-        "monthlyIncome": monthly_income >= 88000,
+        "monthlyIncome": monthly_income >= rules.social_insurance_monthly_threshold,
         "employmentPeriod": True,  # 2ヶ月超は入力で判定困難なためTrue
         "notStudent": not is_student,  # 学生除外特例（夜間・通信制除く）
-        "companySize": company_size == "large"  # 101人以上
+        "companySize": company_size in rules.social_insurance_company_sizes  # 2024年分は101人以上、2025年分は51人以上
     }
 
     # すべての条件を満たす場合、加入義務あり
@@ -136,8 +124,9 @@ def calculate_parttime_tax(
     is_student: bool = False,
     dependent_type: str = "none",
     company_size: str = "small",
-    weekly_hours: float = 0
-) -> Dict:
+    weekly_hours: float = 0,
+    tax_year: Optional[int] = None
+) -> ParttimeResult:
     """
     アルバイト・パートの税金・社会保険料を計算
 
@@ -149,49 +138,47 @@ def calculate_parttime_tax(
         dependent_type: 扶養区分（"parent" | "spouse" | "none"）
         company_size: 企業規模（"small" | "medium" | "large"）
         weekly_hours: 週の勤務時間
+        tax_year: 年分（省略時は tax_rules.DEFAULT_TAX_YEAR）
 
     Returns:
-        計算結果
+        計算結果（camelCase のキーで参照できる。to_dict() で dict に変換）
     """
+    timer = instrumentation.start("parttime")
+    rules = get_rules(tax_year)
+
     # 月収が指定されていない場合は年収から計算
     if monthly_income is None:
         monthly_income = annual_income // 12
 
     # 給与所得控除
-    if annual_income <= 1625000:
-        employment_income_deduction = 550000
-    elif annual_income <= 1800000:
-        employment_income_deduction = int(annual_income * 0.4 - 100000)
-    elif annual_income <= 3600000:
-        employment_income_deduction = int(annual_income * 0.3 + 80000)
-    elif annual_income <= 6600000:
-        employment_income_deduction = int(annual_income * 0.2 + 440000)
-    elif annual_income <= 8500000:
-        employment_income_deduction = int(annual_income * 0.1 + 1100000)
-    else:
-        employment_income_deduction = 1950000
+    employment_income_deduction = rules.employment_income_deduction(annual_income)
 
     # 所得
     income = annual_income - employment_income_deduction
 
-    # 基礎控除
-    basic_deduction = 480000
+    # 基礎控除（2025年分からは所得に応じて段階的）
+    basic_deduction = rules.basic_deduction(income)
 
-    # 勤労学生控除（学生で所得75万円以下の場合）
-    student_deduction = 270000 if (is_student and income <= 750000) else 0
+    # 勤労学生控除（学生で所得75万円以下の場合。2025年分からは85万円以下）
+    student_deduction = (
+        rules.student_deduction if (is_student and income <= rules.student_deduction_income_limit) else 0
+    )
 
     # 課税所得
     taxable_income = max(income - basic_deduction - student_deduction, 0)
+    timer.mark("deductions")
 
     # 所得税
-    income_tax = calculate_income_tax(taxable_income)
+    income_tax = rules.income_tax(taxable_income)
+    timer.mark("income_tax")
 
     # 住民税
-    resident_tax = calculate_resident_tax(annual_income)
+    resident_tax = calculate_resident_tax(annual_income, rules.year)
+    timer.mark("resident_tax")
 
     # 社会保険加入判定（106万円の壁）
     social_insurance_check = check_social_insurance_requirement(
-        monthly_income, weekly_hours, is_student, company_size
+        monthly_income, weekly_hours, is_student, company_size, rules.year
     )
 
     # 社会保険料計算
@@ -204,98 +191,54 @@ def calculate_parttime_tax(
             "total": monthly_si["total"] * 12
         }
         social_insurance_type = "106万"
-    elif annual_income >= 1300000:
+    elif annual_income >= rules.dependent_insurance_threshold:
         # 130万円の壁（扶養から外れる）
         # 国民健康保険・国民年金に加入
         # ※ここでは簡易計算として年間20万円と仮定
         social_insurance = {
             "healthInsurance": 100000,
-            "pensionInsurance": 203760,  # 2024年度の国民年金保険料
-            "total": 303760
+            "pensionInsurance": rules.national_pension_annual,  # その年度の国民年金保険料
+            "total": 100000 + rules.national_pension_annual
         }
         social_insurance_type = "130万"
     else:
         social_insurance_type = None
+    timer.mark("social_insurance")
 
     # 手取り額
     net_income = annual_income - income_tax - resident_tax - social_insurance["total"]
 
-    # 超えた壁
-    exceeded_walls = get_exceeded_walls(annual_income, "parttime")
-
-    # 次の壁
-    next_wall = get_next_wall(annual_income, "parttime")
-
-    # アドバイス生成
-    advice = generate_advice(
-        annual_income, exceeded_walls, next_wall, is_student, dependent_type
+    # 超えた壁の数（超えた壁・次の壁は結果を参照したときに作る）
+    wall_index = rules.walls["parttime"]
+    wall_level = wall_index.level(annual_income)
+    timer.mark("walls")
+
+    # アドバイスは決定表でコードだけを決める（文は結果の advice を参照したときに作る）
+    advice_code = advice_table("parttime", rules)[wall_level][dependent_type == "parent"][bool(is_student)]
+    timer.mark("advice")
+
+    result = ParttimeResult(
+        total_income=annual_income,
+        monthly_average=monthly_income,
+        income_tax=income_tax,
+        resident_tax=resident_tax,
+        social_insurance_required=social_insurance_check["isRequired"],
+        social_insurance_type=social_insurance_type,
+        health_insurance=social_insurance["healthInsurance"],
+        pension_insurance=social_insurance["pensionInsurance"],
+        condition_values=tuple(social_insurance_check["conditions"].values()),
+        net_income=net_income,
+        wall_index=wall_index,
+        wall_level=wall_level,
+        advice_code=advice_code
     )
+    timer.mark("result")
 
-    return {
-        "totalIncome": annual_income,
-        "monthlyAverage": monthly_income,
-        "incomeTax": income_tax,
-        "residentTax": resident_tax,
-        "socialInsurance": {
-            "isRequired": social_insurance_check["isRequired"],
-            "type": social_insurance_type,
-            **social_insurance,
-            "conditions": social_insurance_check["conditions"]
-        },
-        "netIncome": net_income,
-        "wallsExceeded": [
-            {
-                "amount": wall["amount"],
-                "name": wall["name"],
-                "impact": wall["impacts"]["self"] or wall["impacts"]["family"]
-            }
-            for wall in exceeded_walls
-        ],
-        "nextWall": next_wall,
-        "advice": advice
-    }
-
+    return result
 
-def generate_advice(
-    annual_income: int,
-    exceeded_walls: List,
-    next_wall: Optional[Dict],
-    is_student: bool,
-    dependent_type: str
-) -> str:
-    """
-    状況に応じたアドバイスを生成
 
-    Args:
-        annual_income: 年収
-        exceeded_walls: 超えた壁のリスト
-        next_wall: 次の壁
-        is_student: 学生かどうか
-        dependent_type: 扶養区分
-
-    Returns:
-        アドバイス文
-    """
-    if annual_income < 1030000:
-        if next_wall and next_wall["amount"] == 1030000:
-            return f"現在の年収は{annual_income:,}円です。103万円の壁まであと{next_wall['remaining']:,}円です。このまま働いても扶養内で所得税もかかりません。"
-        return "安全圏です。このまま働いても問題ありません。"
-
-    elif annual_income < 1060000:
-        if dependent_type == "parent":
-            return f"103万円を超えています。本人に所得税が発生し、親の扶養控除も外れるため、親の税負担が年間5〜16万円増えます。106万円の壁まであと{next_wall['remaining']:,}円です。"
-        return "103万円を超えています。所得税が発生します。"
-
-    elif annual_income < 1300000:
-        if is_student:
-            return "106万円を超えていますが、学生の場合は学生除外特例により社会保険加入義務はありません（夜間・通信制除く）。130万円の壁まで注意しましょう。"
-        return "106万円を超えています。大企業で条件を満たすと社会保険加入義務が発生します（年間約15万円の負担）。"
-
-    elif annual_income < 1500000:
-        return "130万円を超えています。親の社会保険扶養から外れ、国民健康保険・国民年金に加入する必要があります（年間約30万円の負担）。"
-
-    else:
-        return "150万円を超えています。配偶者控除も減少し、完全自立ゾーンです。"
+# 状況に応じたアドバイスを生成（文の選び方は advice の決定表と同じ。1件ずつの速い経路をそのまま使う）
+generate_advice = parttime_advice
 
 
 if __name__ == "__main__":
@@ -0,0 +1,376 @@
+"""
+手取り曲線の事前計算ストア
+
+年収（業務委託版は売上－経費）を一定刻みのグリッドで事前計算した手取り額を
+バイナリファイルに保存し、起動時にメモリマップで読み込む。グラフ表示や
+「あとX円稼いだら手取りはどうなるか」の問い合わせは配列の参照だけで済む。
+
+ファイルは年分ごとに作る。ヘッダの年分・ルールのチェックサムが読み込む年分のルールと
+一致しない（ルールの変更前に作った）ファイルは読み込まずにエラーにする。読み込みのたびに
+作り直すと最初の問い合わせが数秒止まるため、作り直しはデプロイなどの手順で明示的に行う:
+    python -m backend.curve_store --tax-year 2025
+
+ファイル形式（リトルエンディアン）:
+    ヘッダ 64バイト: マジック(8) + 刻み・点数・アルバイト版曲線数・業務委託版曲線数・年分・
+        ルールのチェックサム（int64 × 6）+ 予約
+    本体: int32 の手取り額 [アルバイト版曲線数 + 業務委託版曲線数, 点数]
+"""
+
+import os
+import struct
+from itertools import product
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from .calculator_batch import calculate_parttime_tax_batch, calculate_freelance_tax_batch
+from .calculator_parttime import calculate_parttime_tax
+from .calculator_freelance import calculate_freelance_tax
+from .tax_rules import TaxRules, get_rules
+
+
+CURVE_DIRECTORY = Path(__file__).parent / "data"
+
+_MAGIC = b"TXCURVE2"
+_HEADER = struct.Struct("<8s6q8x")
+
+# アルバイト版の曲線（手取りに影響するフラグの組: 学生, 106万円の壁の対象の企業規模, 週20時間以上）
+PARTTIME_COMBOS = tuple(product((False, True), (False, True), (False, True)))
+
+
+def _freelance_combos(rules: TaxRules) -> Tuple[Tuple[str, bool], ...]:
+    """
+    業務委託版の曲線（申告種類, 学生）。申告種類はその年分の青色申告特別控除のすべてのキー
+
+    手取りは「売上－経費」だけで決まるためその値を横軸にする。
+    """
+    return tuple(product(rules.blue_filing_deductions, (False, True)))
+
+
+def _parttime_combo_index(rules: TaxRules, is_student: bool, company_size: str, weekly_hours: float) -> int:
+    """アルバイト版のフラグから曲線のインデックスを求める"""
+    covered = company_size in rules.social_insurance_company_sizes
+    return PARTTIME_COMBOS.index((bool(is_student), covered, weekly_hours >= 20))
+
+
+def _freelance_combo_index(rules: TaxRules, tax_filing_type: str, is_student: bool) -> int:
+    """業務委託版のフラグから曲線のインデックスを求める"""
+    if tax_filing_type not in rules.blue_filing_deductions:
+        raise ValueError(f"対応していない申告種類です: {tax_filing_type!r}")
+    return _freelance_combos(rules).index((tax_filing_type, bool(is_student)))
+
+
+def default_curve_path(tax_year: Optional[int] = None) -> Path:
+    """年分ごとの手取り曲線のファイル（省略時は tax_rules.DEFAULT_TAX_YEAR）"""
+    return CURVE_DIRECTORY / f"take_home_curves_{get_rules(tax_year).year}.bin"
+
+
+def _read_header(path: Union[str, Path]) -> Tuple:
+    """ヘッダ（マジック, 刻み, 点数, アルバイト版曲線数, 業務委託版曲線数, 年分, ルールのチェックサム）"""
+    with open(path, "rb") as f:
+        return _HEADER.unpack(f.read(_HEADER.size))
+
+
+def _is_current(header: Tuple, rules: TaxRules) -> bool:
+    """ヘッダが今の形式・この年分のルールで作ったファイルのものか"""
+    magic, _, _, n_parttime, n_freelance, year, fingerprint = header
+    return (
+        magic == _MAGIC
+        and n_parttime == len(PARTTIME_COMBOS)
+        and n_freelance == len(_freelance_combos(rules))
+        and year == rules.year
+        and fingerprint == rules.fingerprint()
+    )
+
+
+def build_curve_store(
+    path: Union[str, Path, None] = None,
+    step: int = 1000,
+    max_income: int = 10000000,
+    tax_year: Optional[int] = None
+) -> Path:
+    """
+    手取り曲線を計算してファイルに書き出す
+
+    Args:
+        path: 出力先（省略時は default_curve_path(tax_year)）
+        step: グリッドの刻み（円）
+        max_income: グリッドの上限（円・この値を含む）
+        tax_year: 年分（省略時は tax_rules.DEFAULT_TAX_YEAR）
+
+    Returns:
+        出力先のパス
+    """
+    if step <= 0 or max_income < 0:
+        raise ValueError("step は1以上、max_income は0以上で指定してください")
+
+    incomes = np.arange(0, max_income + 1, step, dtype=np.int64)
+    n_points = len(incomes)
+
+    rules = get_rules(tax_year)
+    freelance_combos = _freelance_combos(rules)
+
+    path = Path(path) if path is not None else default_curve_path(rules.year)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # 作り直すときに読み込み中のファイルを書き換えないよう、書き終えてから置き換える
+    temporary = path.with_name(path.name + ".tmp")
+    with open(temporary, "wb") as f:
+        f.write(_HEADER.pack(
+            _MAGIC, step, n_points, len(PARTTIME_COMBOS), len(freelance_combos), rules.year, rules.fingerprint()
+        ))
+
+    curves = np.memmap(
+        temporary, dtype="<i4", mode="r+", offset=_HEADER.size,
+        shape=(len(PARTTIME_COMBOS) + len(freelance_combos), n_points)
+    )
+
+    for i, (is_student, covered, is_long_hours) in enumerate(PARTTIME_COMBOS):
+        result = calculate_parttime_tax_batch(
+            annual_income=incomes,
+            is_student=is_student,
+            company_size=rules.social_insurance_company_sizes[0] if covered else "small",
+            weekly_hours=20 if is_long_hours else 0,
+            tax_year=rules.year
+        )
+        curves[i] = result["netIncome"]
+
+    for i, (tax_filing_type, is_student) in enumerate(freelance_combos):
+        result = calculate_freelance_tax_batch(
+            annual_revenue=incomes,
+            annual_expense=0,
+            tax_filing_type=tax_filing_type,
+            is_student=is_student,
+            tax_year=rules.year
+        )
+        curves[len(PARTTIME_COMBOS) + i] = result["netIncome"]
+
+    curves.flush()
+    del curves
+    os.replace(temporary, path)
+    return path
+
+
+class CurveStore:
+    """
+    メモリマップした手取り曲線
+
+    グリッド上の金額は配列を参照するだけで返す。グリッド外の金額は
+    計算関数にフォールバックする。
+    """
+
+    def __init__(self, path: Union[str, Path, None] = None, tax_year: Optional[int] = None):
+        """
+        Args:
+            path: build_curve_store で書き出したファイル（省略時は default_curve_path(tax_year)）
+            tax_year: 年分（省略時は tax_rules.DEFAULT_TAX_YEAR）
+        """
+        rules = get_rules(tax_year)
+        if path is None:
+            path = default_curve_path(rules.year)
+        header = _read_header(path)
+        magic, step, n_points, n_parttime, n_freelance, _, _ = header
+        # マジックの末尾は形式の版
+        if magic[:-1] != _MAGIC[:-1]:
+            raise ValueError(f"手取り曲線のファイルではありません: {path}")
+        if not _is_current(header, rules):
+            raise ValueError(
+                f"手取り曲線のファイルが古い形式か、{rules.year}年分のルールで作ったものではありません。"
+                f"python -m backend.curve_store --tax-year {rules.year} で作り直してください: {path}"
+            )
+
+        self.path = Path(path)
+        self.rules = rules
+        self.step = step
+        self.n_points = n_points
+        self.max_income = step * (n_points - 1)
+        self._curves = np.memmap(
+            path, dtype="<i4", mode="r", offset=_HEADER.size,
+            shape=(n_parttime + n_freelance, n_points)
+        )
+
+    @property
+    def incomes(self) -> np.ndarray:
+        """グリッドの金額（横軸）"""
+        return np.arange(0, self.max_income + 1, self.step, dtype=np.int64)
+
+    def _grid_index(self, amount: int) -> Optional[int]:
+        """金額がグリッド上にあればそのインデックス"""
+        if 0 <= amount <= self.max_income and amount % self.step == 0:
+            return amount // self.step
+        return None
+
+    def parttime_curve(
+        self,
+        is_student: bool = False,
+        company_size: str = "small",
+        weekly_hours: float = 0
+    ) -> np.ndarray:
+        """
+        アルバイト・パート版の手取り曲線
+
+        Returns:
+            incomes に対応する手取り額（読み取り専用）
+        """
+        return self._curves[_parttime_combo_index(self.rules, is_student, company_size, weekly_hours)]
+
+    def freelance_curve(self, tax_filing_type: str = "white", is_student: bool = False) -> np.ndarray:
+        """
+        業務委託版の手取り曲線（横軸は売上－経費）
+
+        Returns:
+            incomes に対応する手取り額（読み取り専用）
+        """
+        return self._curves[len(PARTTIME_COMBOS) + _freelance_combo_index(self.rules, tax_filing_type, is_student)]
+
+    def parttime_net_income(
+        self,
+        annual_income: int,
+        is_student: bool = False,
+        company_size: str = "small",
+        weekly_hours: float = 0
+    ) -> int:
+        """
+        アルバイト・パート版の手取り額
+
+        Args:
+            annual_income: 年収（円）
+
+        Returns:
+            手取り額（円）
+        """
+        i = self._grid_index(annual_income)
+        if i is None:
+            return calculate_parttime_tax(
+                age=20,
+                annual_income=annual_income,
+                is_student=is_student,
+                company_size=company_size,
+                weekly_hours=weekly_hours,
+                tax_year=self.rules.year
+            )["netIncome"]
+        return int(self.parttime_curve(is_student, company_size, weekly_hours)[i])
+
+    def freelance_net_income(
+        self,
+        annual_revenue: int,
+        annual_expense: int = 0,
+        tax_filing_type: str = "white",
+        is_student: bool = False
+    ) -> int:
+        """
+        業務委託版の手取り額
+
+        Args:
+            annual_revenue: 年間売上（円）
+            annual_expense: 年間経費（円）
+
+        Returns:
+            手取り額（円）
+        """
+        # 未知の申告種類はグリッド外でもエラーにする（計算関数は白色として扱うため）
+        curve = self.freelance_curve(tax_filing_type, is_student)
+        i = self._grid_index(annual_revenue - annual_expense)
+        if i is None:
+            return calculate_freelance_tax(
+                age=20,
+                annual_revenue=annual_revenue,
+                annual_expense=annual_expense,
+                is_student=is_student,
+                tax_filing_type=tax_filing_type,
+                tax_year=self.rules.year
+            )["netIncome"]
+        return int(curve[i])
+
+    def parttime_what_if(self, annual_income: int, additional_income: int, **flags) -> Dict:
+        """
+        あと additional_income 円稼いだ場合の手取りの変化（アルバイト・パート版）
+
+        Args:
+            annual_income: 現在の年収（円）
+            additional_income: 追加で稼ぐ金額（円）
+            **flags: is_student / company_size / weekly_hours
+
+        Returns:
+            現在と追加後の手取り額、手取りの増加額
+        """
+        current = self.parttime_net_income(annual_income, **flags)
+        new = self.parttime_net_income(annual_income + additional_income, **flags)
+        return {
+            "currentNetIncome": current,
+            "newNetIncome": new,
+            "netIncomeChange": new - current
+        }
+
+    def freelance_what_if(
+        self,
+        annual_revenue: int,
+        annual_expense: int,
+        additional_revenue: int,
+        **flags
+    ) -> Dict:
+        """
+        あと additional_revenue 円売り上げた場合の手取りの変化（業務委託版）
+
+        Args:
+            annual_revenue: 現在の年間売上（円）
+            annual_expense: 年間経費（円）
+            additional_revenue: 追加の売上（円）
+            **flags: tax_filing_type / is_student
+
+        Returns:
+            現在と追加後の手取り額、手取りの増加額
+        """
+        current = self.freelance_net_income(annual_revenue, annual_expense, **flags)
+        new = self.freelance_net_income(annual_revenue + additional_revenue, annual_expense, **flags)
+        return {
+            "currentNetIncome": current,
+            "newNetIncome": new,
+            "netIncomeChange": new - current
+        }
+
+
+def load_curve_store(path: Union[str, Path, None] = None, tax_year: Optional[int] = None) -> Optional[CurveStore]:
+    """
+    手取り曲線を読み込む（ファイルがなければ None）
+
+    ヘッダの年分・ルールのチェックサムが一致しない（古いルールや別の年分で作った）ファイルは
+    作り直さずに ValueError にする（作り直しは build_curve_store で明示的に行う）。
+
+    Args:
+        path: 手取り曲線のファイル（省略時は default_curve_path(tax_year)）
+        tax_year: 年分（省略時は tax_rules.DEFAULT_TAX_YEAR）
+
+    Returns:
+        CurveStore または None
+    """
+    rules = get_rules(tax_year)
+    path = Path(path) if path is not None else default_curve_path(rules.year)
+    if not path.exists():
+        return None
+
+    return CurveStore(path, rules.year)
+
+
+if __name__ == "__main__":
+    # 手取り曲線を作成（ルールを変更したら年分ごとに作り直す）
+    import argparse
+
+    parser = argparse.ArgumentParser(description="手取り曲線のファイルを作成する")
+    parser.add_argument("--tax-year", type=int, default=None, help="年分（省略時は既定の年分）")
+    parser.add_argument("--step", type=int, default=1000, help="グリッドの刻み（円）")
+    parser.add_argument("--max-income", type=int, default=10000000, help="グリッドの上限（円）")
+    args = parser.parse_args()
+
+    path = build_curve_store(step=args.step, max_income=args.max_income, tax_year=args.tax_year)
+    store = CurveStore(path, args.tax_year)
+
+    print("=== 手取り曲線 ===")
+    print(f"ファイル: {path}（{path.stat().st_size:,}バイト）")
+    print(f"グリッド: 0〜{store.max_income:,}円（{store.step:,}円刻み・{store.n_points:,}点）")
+
+    what_if = store.parttime_what_if(1290000, 10000, is_student=False)
+    print(f"\n年収129万円 → 130万円: 手取り {what_if['netIncomeChange']:+,}円")
+
+    what_if = store.freelance_what_if(1500000, 300000, 100000, tax_filing_type="blue65", is_student=True)
+    print(f"売上150万円 → 160万円（青色65万円・学生）: 手取り {what_if['netIncomeChange']:+,}円")
@@ -0,0 +1,262 @@
+"""
+「働き損」ゾーンの検出
+
+税率表の区分と壁の閾値から手取り額の折れ点・不連続点を求め、手取り額を
+区分線形の区間に分解する。収入が増えたのに手取りが減る区間（働き損ゾーン）と、
+元の手取りに戻るまでに必要な収入を、全額を走査せずに求める。
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .calculator_parttime import calculate_parttime_tax
+from .calculator_freelance import calculate_freelance_tax
+from .tax_rules import get_rules
+
+
+def _first_above(func: Callable[[int], int], threshold: int, hi: int) -> Optional[int]:
+    """
+    単調非減少な func について func(x) > threshold となる最小の整数 x（0〜hi）
+
+    Returns:
+        該当する x または None
+    """
+    if func(hi) <= threshold:
+        return None
+    lo = 0
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if func(mid) > threshold:
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+def _build_segments(
+    net_income: Callable[[int], int],
+    breakpoints: List[Tuple[int, str]],
+    max_income: int
+) -> Dict:
+    """
+    折れ点で区切った区間と働き損ゾーンを求める
+
+    Args:
+        net_income: 収入 → 手取り額
+        breakpoints: (折れ点の収入, 原因) のリスト
+        max_income: 対象とする収入の上限
+
+    Returns:
+        区間と働き損ゾーン
+    """
+    # 折れ点を整理（同じ金額の原因はまとめる）
+    causes: Dict[int, List[str]] = {}
+    for x, cause in breakpoints:
+        if 0 < x <= max_income and cause not in causes.setdefault(x, []):
+            causes[x].append(cause)
+    starts = [0] + sorted(causes)
+    ends = [x - 1 for x in starts[1:]] + [max_income]
+
+    segments = []
+    for start, end in zip(starts, ends):
+        net_at_start = net_income(start)
+        net_at_end = net_income(end)
+        segments.append({
+            "start": start,
+            "end": end,
+            "slope": (net_at_end - net_at_start) / (end - start) if end > start else 0.0,
+            "netAtStart": net_at_start,
+            "netAtEnd": net_at_end,
+            "cause": "・".join(causes.get(start, []))
+        })
+
+    loss_zones = []
+    for i in range(1, len(segments)):
+        segment = segments[i]
+        before = segments[i - 1]["netAtEnd"]
+        if segment["netAtStart"] >= before:
+            continue
+
+        # 元の手取りに戻る最初の収入を、手取りが回復する区間の中で二分探索する
+        recovery = None
+        for later in segments[i:]:
+            if later["netAtEnd"] >= before:
+                lo, hi = later["start"], later["end"]
+                while lo < hi:
+                    mid = (lo + hi) // 2
+                    if net_income(mid) >= before:
+                        hi = mid
+                    else:
+                        lo = mid + 1
+                recovery = lo
+                break
+
+        # 前の働き損ゾーンの中でさらに手取りが下がる場合は1つのゾーンにまとめる
+        previous = loss_zones[-1] if loss_zones else None
+        if previous is not None and (previous["end"] is None or segment["start"] < previous["end"]):
+            previous["loss"] = max(previous["loss"], previous["netBefore"] - segment["netAtStart"])
+            previous["cause"] += "・" + segment["cause"]
+            continue
+
+        loss_zones.append({
+            "start": segment["start"],
+            "end": recovery,
+            "loss": before - segment["netAtStart"],
+            "recoveryIncome": recovery - segment["start"] if recovery is not None else None,
+            "cause": segment["cause"],
+            "netBefore": before
+        })
+
+    return {
+        "segments": segments,
+        "lossZones": loss_zones
+    }
+
+
+def find_parttime_dead_zones(
+    is_student: bool = False,
+    company_size: str = "small",
+    weekly_hours: float = 0,
+    max_income: int = 10000000,
+    tax_year: Optional[int] = None
+) -> Dict:
+    """
+    アルバイト・パートの働き損ゾーンを求める
+
+    Args:
+        is_student: 学生かどうか
+        company_size: 企業規模（"small" | "medium" | "large"）
+        weekly_hours: 週の勤務時間
+        max_income: 対象とする年収の上限（円）
+        tax_year: 年分（省略時は tax_rules.DEFAULT_TAX_YEAR）
+
+    Returns:
+        segments: 手取り額の区間（start〜end の年収で手取りがほぼ直線）
+        lossZones: 働き損ゾーン（start から手取りが最大 loss 円減り、end で netBefore に戻る）
+    """
+    rules = get_rules(tax_year)
+
+    def net_income(annual_income: int) -> int:
+        return calculate_parttime_tax(
+            age=20,
+            annual_income=annual_income,
+            is_student=is_student,
+            company_size=company_size,
+            weekly_hours=weekly_hours,
+            tax_year=rules.year
+        )["netIncome"]
+
+    def income(annual_income: int) -> int:
+        return annual_income - rules.employment_income_deduction(annual_income)
+
+    breakpoints = [
+        (threshold + 1, "給与所得控除の区分変更")
+        for threshold in rules.employment_income_deduction.thresholds
+    ]
+
+    # 基礎控除の区分（2025年分からは所得に応じて段階的）
+    for threshold in rules.basic_deduction.thresholds:
+        breakpoints.append((_first_above(income, threshold, max_income), "基礎控除の区分変更"))
+
+    # 所得税の区分（課税所得 = 所得 - 基礎控除 - 勤労学生控除）
+    basic_deductions = sorted({int(intercept) for intercept in rules.basic_deduction.intercepts})
+    deductions = basic_deductions + (
+        [deduction + rules.student_deduction for deduction in basic_deductions] if is_student else []
+    )
+    for deduction in deductions:
+        for threshold in rules.income_tax.thresholds:
+            breakpoints.append((_first_above(income, threshold + deduction, max_income), "所得税の区分変更"))
+
+    # 勤労学生控除（所得75万円以下。2025年分からは85万円以下）
+    if is_student:
+        breakpoints.append(
+            (_first_above(income, rules.student_deduction_income_limit, max_income), "勤労学生控除の適用終了")
+        )
+
+    # 住民税（所得 - 基礎控除43万円 が0を超えると均等割＋所得割が発生）
+    breakpoints.append((_first_above(income, rules.resident_basic_deduction, max_income), "住民税の発生"))
+
+    # 社会保険（106万円の壁は月収88,000円以上、それ以外は130万円の壁）
+    social_insurance_required = (
+        weekly_hours >= 20 and not is_student and company_size in rules.social_insurance_company_sizes
+    )
+    if social_insurance_required:
+        breakpoints.append((rules.social_insurance_monthly_threshold * 12, "106万円の壁（社会保険加入）"))
+    else:
+        breakpoints.append((rules.dependent_insurance_threshold, "130万円の壁（国民健康保険・国民年金）"))
+
+    return _build_segments(
+        net_income,
+        [(x, cause) for x, cause in breakpoints if x is not None],
+        max_income
+    )
+
+
+def find_freelance_dead_zones(
+    annual_expense: int = 0,
+    tax_filing_type: str = "white",
+    is_student: bool = False,
+    max_revenue: int = 10000000,
+    tax_year: Optional[int] = None
+) -> Dict:
+    """
+    業務委託・フリーランスの働き損ゾーンを求める（経費は固定し、売上を動かす）
+
+    Args:
+        annual_expense: 年間経費（円）
+        tax_filing_type: 申告種類（"white" | "blue10" | "blue65"）
+        is_student: 学生かどうか
+        max_revenue: 対象とする売上の上限（円）
+        tax_year: 年分（省略時は tax_rules.DEFAULT_TAX_YEAR）
+
+    Returns:
+        segments: 手取り額の区間（start〜end の売上で手取りがほぼ直線）
+        lossZones: 働き損ゾーン（start から手取りが最大 loss 円減り、end で netBefore に戻る）
+    """
+    rules = get_rules(tax_year)
+
+    def net_income(annual_revenue: int) -> int:
+        return calculate_freelance_tax(
+            age=20,
+            annual_revenue=annual_revenue,
+            annual_expense=annual_expense,
+            is_student=is_student,
+            tax_filing_type=tax_filing_type,
+            tax_year=rules.year
+        )["netIncome"]
+
+    # 事業所得 = 売上 - 経費 - 青色申告特別控除 なので、事業所得の閾値 t は売上 t + offset + 1 で超える
+    offset = annual_expense + rules.blue_filing_deductions.get(tax_filing_type, 0)
+
+    breakpoints = [
+        (threshold + offset + 1, "基礎控除の区分変更")
+        for threshold in rules.basic_deduction.thresholds
+    ]
+    for deduction in sorted({int(intercept) for intercept in rules.basic_deduction.intercepts}):
+        breakpoints += [
+            (threshold + deduction + offset + 1, "所得税の区分変更")
+            for threshold in rules.income_tax.thresholds
+        ]
+    breakpoints.append((rules.resident_basic_deduction + offset + 1, "住民税・国民健康保険料（所得割）の発生"))
+    breakpoints.append((2900000 + offset + 1, "290万円の壁（個人事業税）"))
+    if is_student:
+        breakpoints.append(
+            (rules.student_pension_exemption_limit + offset + 1, "学生納付特例の適用終了（国民年金）")
+        )
+
+    return _build_segments(net_income, breakpoints, max_revenue)
+
+
+if __name__ == "__main__":
+    # テスト実行
+    for title, result in [
+        ("アルバイト（学生・50人以下）", find_parttime_dead_zones(is_student=True)),
+        ("アルバイト（101人以上・週25時間）", find_parttime_dead_zones(company_size="large", weekly_hours=25)),
+        ("業務委託（白色・学生）", find_freelance_dead_zones(tax_filing_type="white", is_student=True)),
+    ]:
+        print(f"=== 働き損ゾーン: {title} ===")
+        for zone in result["lossZones"]:
+            end = f"{zone['end']:,}円" if zone["end"] is not None else "回復しない"
+            print(
+                f"  {zone['start']:,}円〜{end}: 手取り -{zone['loss']:,}円"
+                f"（原因: {zone['cause']}）"
+            )
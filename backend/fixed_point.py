@@ -0,0 +1,97 @@
+"""
+整数だけの固定小数点計算（率は有理数・端数処理は明示）
+
+率は (分子, 分母) の整数の組で持ち、「金額 × 分子 // 分母」で計算する。0.1 や 0.0915 のように
+2進数で表せない率でも浮動小数点の丸めによる1円のずれが出ず、NumPy の int64 配列のまま
+計算できる。関数は int と int64 の配列のどちらにも使える（NumPy は読み込まない）。
+
+端数処理（rounding）:
+    "reference"  スカラー版（calculator_parttime / calculator_freelance）と同じく1円未満を切り捨て
+    "legal"      課税標準の1,000円未満と税額の100円未満を切り捨てる（国税通則法118条・119条、
+                 地方税法20条の4の2）。所得税・住民税の所得割・個人事業税に使い、社会保険料と
+                 国民健康保険料（いずれも概算）は1円未満の切り捨てのまま。給与所得控除の
+                 4,000円単位の計算（所得税法別表第五）は含まない
+"""
+
+from typing import Tuple, Union
+
+# 率（分子, 分母）
+Rate = Tuple[int, int]
+
+# 端数処理の種類
+ROUNDING_MODES = ("reference", "legal")
+
+# 法定の端数処理の単位（課税標準・税額）
+TAXABLE_INCOME_UNIT = 1000
+TAX_UNIT = 100
+
+# 住民税（所得割10% + 均等割5,000円の簡易計算）
+RESIDENT_TAX_RATE: Rate = (10, 100)
+RESIDENT_TAX_PER_CAPITA = 5000
+
+# 社会保険料の本人負担（健康保険 約5%・厚生年金 約9.15%）
+HEALTH_INSURANCE_RATE: Rate = (5, 100)
+PENSION_INSURANCE_RATE: Rate = (915, 10000)
+
+# 個人事業税（事業主控除290万円・税率5%）
+BUSINESS_TAX_DEDUCTION = 2900000
+BUSINESS_TAX_RATE: Rate = (5, 100)
+
+# 国民健康保険料（所得の約10% + 均等割40,000円の概算）
+NATIONAL_HEALTH_INSURANCE_RATE: Rate = (10, 100)
+NATIONAL_HEALTH_INSURANCE_FLAT = 40000
+
+
+def as_rate(value: Union[int, float, str]) -> Rate:
+    """率を既約の (分子, 分母) にする（float は10進の表記どおりに読む: 0.1 → (1, 10)）"""
+    # 配列の計算で表を初めて使うときだけ読み込む（起動時間のため）
+    from fractions import Fraction
+
+    fraction = Fraction(repr(value)) if isinstance(value, float) else Fraction(value)
+    return fraction.numerator, fraction.denominator
+
+
+def check_rounding(rounding: str) -> str:
+    if rounding not in ROUNDING_MODES:
+        raise ValueError(f"rounding は {' / '.join(ROUNDING_MODES)} のいずれかを指定してください: {rounding!r}")
+    return rounding
+
+
+def div_trunc(numerator, denominator: int):
+    """0方向へ切り捨てた商（int() と同じ向き。分母は正の整数）"""
+    if isinstance(numerator, int):
+        return numerator // denominator if numerator >= 0 else -(-numerator // denominator)
+    quotient = numerator // denominator
+    negative = numerator < 0
+    if not negative.any():
+        return quotient
+    # 負の数で割り切れない場合は床関数の商に1を足す
+    return quotient + (negative & (quotient * denominator != numerator))
+
+
+def mul_rate(amount, rate: Rate):
+    """金額 × 率（1円未満を0方向へ切り捨て）"""
+    numerator, denominator = rate
+    return div_trunc(amount * numerator, denominator)
+
+
+def floor_to(amount, unit: int):
+    """unit 未満を切り捨て（0以上の金額）"""
+    return amount // unit * unit
+
+
+def round_taxable_income(taxable_income, rounding: str):
+    """課税標準の端数処理（legal は1,000円未満を切り捨て）"""
+    return floor_to(taxable_income, TAXABLE_INCOME_UNIT) if rounding == "legal" else taxable_income
+
+
+def round_tax(tax, rounding: str):
+    """税額の端数処理（legal は100円未満を切り捨て）"""
+    return floor_to(tax, TAX_UNIT) if rounding == "legal" else tax
+
+
+def resident_tax_from_taxable(taxable_income, rounding: str):
+    """住民税（所得割10% + 均等割5,000円。課税所得が0円の場合は0円）"""
+    levy = round_tax(mul_rate(round_taxable_income(taxable_income, rounding), RESIDENT_TAX_RATE), rounding)
+    # 課税所得が0円以下なら0倍（int と配列のどちらでも同じ式で計算する）
+    return (levy + RESIDENT_TAX_PER_CAPITA) * (taxable_income > 0)
@@ -0,0 +1,419 @@
+"""
+計算履歴のストア（SQLite）
+
+月別の入力（収入・経費）と計算結果をローカルの SQLite ファイルに保存する。ブラウザの
+localStorage や st.session_state と違い、セッションが終わっても残り、複数年分の履歴や
+利用者をまたいだ集計（「10月までの累計が100万円を超えた利用者」など）を SQL で引ける。
+
+テーブル:
+    monthly_inputs  利用者・年分・月・種類ごとの入力（主キー (user_id, tax_year, month, kind)）
+    ytd_totals      利用者・年分・月ごとの年初からの累計（入力を保存するたびに更新）
+    results         計算結果（集計に使う項目は列、結果全体は JSON）
+
+書き込みは executemany で1トランザクションにまとめ、書き込んだ利用者・年分の累計だけを
+作り直す。「10月までの累計が100万円を超えた利用者」は累計の (tax_year, kind, month, total)
+の索引を範囲で引くため、利用者が増えても該当する利用者の数に比例する時間で済む。
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+from .income_tracker import IncomeTracker
+
+
+# 既定の保存先（環境変数 TAXCHECK_HISTORY_PATH で変更できる）
+DEFAULT_HISTORY_PATH = Path(os.environ.get(
+    "TAXCHECK_HISTORY_PATH", Path(__file__).parent / "data" / "history.sqlite3"
+))
+
+# 入力・結果の種類
+KINDS = ("parttime", "freelance")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS monthly_inputs (
+    user_id TEXT NOT NULL,
+    tax_year INTEGER NOT NULL,
+    month INTEGER NOT NULL CHECK (month BETWEEN 1 AND 12),
+    kind TEXT NOT NULL,
+    income INTEGER NOT NULL,
+    expense INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (user_id, tax_year, month, kind)
+) WITHOUT ROWID;
+
+-- 年分・月ごとの集計（本体の行を読まずに索引だけで求める）
+CREATE INDEX IF NOT EXISTS monthly_inputs_by_year
+    ON monthly_inputs (tax_year, kind, user_id, month, income);
+
+CREATE TABLE IF NOT EXISTS ytd_totals (
+    tax_year INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    month INTEGER NOT NULL,
+    user_id TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    PRIMARY KEY (tax_year, kind, month, user_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS ytd_totals_by_total
+    ON ytd_totals (tax_year, kind, month, total);
+
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    tax_year INTEGER NOT NULL,
+    month INTEGER NOT NULL CHECK (month BETWEEN 1 AND 12),
+    kind TEXT NOT NULL,
+    calculated_at REAL NOT NULL,
+    income INTEGER NOT NULL,
+    net_income INTEGER NOT NULL,
+    total_tax INTEGER NOT NULL,
+    total_insurance INTEGER NOT NULL,
+    wall_level INTEGER NOT NULL,
+    payload TEXT
+);
+
+CREATE INDEX IF NOT EXISTS results_by_user
+    ON results (user_id, tax_year, month);
+"""
+
+
+# 1人・1年分の累計（1〜12月）を入力から作り直す
+_REFRESH_YTD = """
+INSERT OR REPLACE INTO ytd_totals (tax_year, kind, month, user_id, total)
+WITH RECURSIVE months (month) AS (SELECT 1 UNION ALL SELECT month + 1 FROM months WHERE month < 12)
+SELECT :tax_year, :kind, months.month, :user_id, (
+    SELECT COALESCE(SUM(income), 0) FROM monthly_inputs
+    WHERE user_id = :user_id AND tax_year = :tax_year AND kind = :kind AND month <= months.month
+)
+FROM months
+"""
+
+
+def _check_kind(kind: str) -> str:
+    if kind not in KINDS:
+        raise ValueError(f"kind は {' / '.join(KINDS)} のいずれかを指定してください: {kind!r}")
+    return kind
+
+
+def _result_columns(kind: str, result: Mapping) -> Tuple[int, int, int, int, int]:
+    """
+    計算結果から集計用の列を取り出す
+
+    Returns:
+        (収入, 手取り, 税額の合計, 社会保険料の合計, 超えた壁の数)
+    """
+    wall_level = getattr(result, "wall_level", None)
+    if wall_level is None:
+        wall_level = len(result["wallsExceeded"])
+    if kind == "parttime":
+        return (
+            result["totalIncome"],
+            result["netIncome"],
+            result["incomeTax"] + result["residentTax"],
+            result["socialInsurance"]["total"],
+            wall_level
+        )
+    return (
+        result["totalRevenue"],
+        result["netIncome"],
+        result["totalTax"],
+        result["totalInsurance"],
+        wall_level
+    )
+
+
+def _payload(result: Mapping) -> str:
+    """計算結果全体の JSON"""
+    data = result.to_dict() if hasattr(result, "to_dict") else result
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+class HistoryStore:
+    """
+    計算履歴のストア
+
+    1つの接続を使い回す（Streamlit のスレッドから使えるよう、接続の利用はロックで順番にする）。
+    with 文で使うと抜けるときに閉じる。
+    """
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_HISTORY_PATH):
+        """
+        Args:
+            path: SQLite ファイルのパス（":memory:" でメモリ上に作る）
+        """
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._connection = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            if str(path) != ":memory:":
+                # 書き込み中も読み取りを止めない
+                self._connection.execute("PRAGMA journal_mode=WAL")
+                self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self) -> "HistoryStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """ロックを取り、1トランザクションで実行する（例外時はロールバック）"""
+        with self._lock, self._connection:
+            yield self._connection
+
+    @staticmethod
+    def _refresh_ytd(connection: sqlite3.Connection, keys: Iterable[Tuple[str, int]], kind: str) -> None:
+        """書き込んだ利用者・年分の累計を作り直す"""
+        connection.executemany(
+            _REFRESH_YTD,
+            ({"user_id": user_id, "tax_year": tax_year, "kind": kind} for user_id, tax_year in keys)
+        )
+
+    def _query(self, sql: str, parameters: Sequence = ()) -> List[Tuple]:
+        with self._lock:
+            return self._connection.execute(sql, parameters).fetchall()
+
+    # ---- 月別の入力 ----
+
+    def save_monthly_inputs(
+        self,
+        rows: Iterable[Sequence],
+        kind: str = "parttime"
+    ) -> int:
+        """
+        月別の入力をまとめて保存する（同じ利用者・年分・月・種類は上書き）
+
+        Args:
+            rows: (user_id, tax_year, month, income) または (user_id, tax_year, month, income, expense)
+            kind: "parttime" | "freelance"
+
+        Returns:
+            保存した行数
+        """
+        _check_kind(kind)
+        now = time.time()
+        records = [
+            (row[0], row[1], row[2], kind, row[3], row[4] if len(row) > 4 else 0, now)
+            for row in rows
+        ]
+        with self._transaction() as connection:
+            connection.executemany(
+                "INSERT INTO monthly_inputs (user_id, tax_year, month, kind, income, expense, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (user_id, tax_year, month, kind) DO UPDATE SET "
+                "income = excluded.income, expense = excluded.expense, updated_at = excluded.updated_at",
+                records
+            )
+            self._refresh_ytd(connection, dict.fromkeys((record[0], record[1]) for record in records), kind)
+        return len(records)
+
+    def save_monthly_input(
+        self,
+        user_id: str,
+        tax_year: int,
+        month: int,
+        income: int,
+        expense: int = 0,
+        kind: str = "parttime"
+    ) -> None:
+        """1か月分の入力を保存する"""
+        self.save_monthly_inputs([(user_id, tax_year, month, income, expense)], kind)
+
+    def delete_monthly_input(self, user_id: str, tax_year: int, month: int, kind: str = "parttime") -> None:
+        """1か月分の入力を削除する（未入力に戻す）"""
+        with self._transaction() as connection:
+            connection.execute(
+                "DELETE FROM monthly_inputs WHERE user_id = ? AND tax_year = ? AND month = ? AND kind = ?",
+                (user_id, tax_year, month, _check_kind(kind))
+            )
+            self._refresh_ytd(connection, [(user_id, tax_year)], kind)
+
+    def monthly_inputs(
+        self,
+        user_id: str,
+        tax_year: int,
+        kind: str = "parttime"
+    ) -> List[Optional[Tuple[int, int]]]:
+        """
+        1年分の月別の入力
+
+        Returns:
+            1〜12月の (収入, 経費)。未入力の月は None
+        """
+        months: List[Optional[Tuple[int, int]]] = [None] * 12
+        for month, income, expense in self._query(
+            "SELECT month, income, expense FROM monthly_inputs WHERE user_id = ? AND tax_year = ? AND kind = ?",
+            (user_id, tax_year, _check_kind(kind))
+        ):
+            months[month - 1] = (income, expense)
+        return months
+
+    def load_tracker(self, user_id: str, tax_year: int, kind: str = "parttime") -> IncomeTracker:
+        """
+        保存した入力から月別収入の累計トラッカーを作る
+
+        業務委託版は売上－経費を月の収入とする。
+        """
+        incomes = [
+            None if month is None else month[0] - month[1]
+            for month in self.monthly_inputs(user_id, tax_year, kind)
+        ]
+        return IncomeTracker(incomes, wall_type=kind, year=tax_year)
+
+    # ---- 計算結果 ----
+
+    def save_results(self, rows: Iterable[Sequence], kind: str = "parttime", payload: bool = True) -> int:
+        """
+        計算結果をまとめて保存する
+
+        Args:
+            rows: (user_id, tax_year, month, 計算結果)。計算結果は calculate_parttime_tax /
+                calculate_freelance_tax の結果
+            kind: "parttime" | "freelance"
+            payload: 結果全体を JSON で保存するか（False は集計用の列だけ）
+
+        Returns:
+            保存した行数
+        """
+        _check_kind(kind)
+        now = time.time()
+        records = [
+            (user_id, tax_year, month, kind, now, *_result_columns(kind, result),
+             _payload(result) if payload else None)
+            for user_id, tax_year, month, result in rows
+        ]
+        with self._transaction() as connection:
+            connection.executemany(
+                "INSERT INTO results (user_id, tax_year, month, kind, calculated_at, income, net_income, "
+                "total_tax, total_insurance, wall_level, payload) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                records
+            )
+        return len(records)
+
+    def save_result(self, user_id: str, tax_year: int, month: int, result: Mapping, kind: str = "parttime") -> None:
+        """計算結果を1件保存する"""
+        self.save_results([(user_id, tax_year, month, result)], kind)
+
+    def latest_result(self, user_id: str, tax_year: int, kind: str = "parttime") -> Optional[Dict]:
+        """
+        その年分の最新の計算結果
+
+        Returns:
+            保存した結果（dict）。結果全体を保存していない場合は集計用の列
+        """
+        rows = self._query(
+            "SELECT month, calculated_at, income, net_income, total_tax, total_insurance, wall_level, payload "
+            "FROM results WHERE user_id = ? AND tax_year = ? AND kind = ? "
+            "ORDER BY month DESC, id DESC LIMIT 1",
+            (user_id, tax_year, _check_kind(kind))
+        )
+        if not rows:
+            return None
+        month, calculated_at, income, net_income, total_tax, total_insurance, wall_level, payload = rows[0]
+        if payload is not None:
+            return json.loads(payload)
+        return {
+            "month": month,
+            "calculatedAt": calculated_at,
+            "income": income,
+            "netIncome": net_income,
+            "totalTax": total_tax,
+            "totalInsurance": total_insurance,
+            "wallLevel": wall_level
+        }
+
+    # ---- 集計 ----
+
+    def ytd_totals(
+        self,
+        tax_year: int,
+        through_month: int = 12,
+        kind: str = "parttime",
+        min_total: Optional[int] = None
+    ) -> List[Tuple[str, int]]:
+        """
+        利用者ごとの年初からの累計収入
+
+        Args:
+            tax_year: 年分
+            through_month: 集計する最後の月（この月を含む）
+            kind: "parttime" | "freelance"（業務委託版は売上の累計）
+            min_total: 指定した場合は累計がこの金額を超える利用者だけ
+
+        Returns:
+            (user_id, 累計) の一覧（user_id の順）
+        """
+        if not 1 <= through_month <= 12:
+            raise ValueError(f"月は1〜12で指定してください: {through_month}")
+        sql = "SELECT user_id, total FROM ytd_totals WHERE tax_year = ? AND kind = ? AND month = ?"
+        parameters: List = [tax_year, _check_kind(kind), through_month]
+        if min_total is not None:
+            sql += " AND total > ?"
+            parameters.append(min_total)
+        return self._query(sql + " ORDER BY user_id", parameters)
+
+    def users_over(self, tax_year: int, through_month: int, amount: int, kind: str = "parttime") -> List[str]:
+        """累計収入が amount を超えた利用者（例: 10月までに100万円を超えた利用者）"""
+        return [user_id for user_id, _ in self.ytd_totals(tax_year, through_month, kind, min_total=amount)]
+
+    def yearly_totals(self, user_id: str, kind: str = "parttime") -> Dict[int, int]:
+        """利用者の年分ごとの収入の合計（複数年の履歴）"""
+        return dict(self._query(
+            "SELECT tax_year, SUM(income) FROM monthly_inputs WHERE user_id = ? AND kind = ? "
+            "GROUP BY tax_year ORDER BY tax_year",
+            (user_id, _check_kind(kind))
+        ))
+
+    def monthly_statistics(self, tax_year: int, kind: str = "parttime") -> List[Dict]:
+        """
+        月ごとの入力の集計（利用者数・合計・平均）
+
+        Returns:
+            入力がある月の集計（月の順）
+        """
+        return [
+            {"month": month, "users": users, "total": total, "average": total // users}
+            for month, users, total in self._query(
+                "SELECT month, COUNT(*), SUM(income) FROM monthly_inputs WHERE tax_year = ? AND kind = ? "
+                "GROUP BY month ORDER BY month",
+                (tax_year, _check_kind(kind))
+            )
+        ]
+
+
+if __name__ == "__main__":
+    # テスト実行
+    from .calculator_parttime import calculate_parttime_tax
+
+    with HistoryStore(":memory:") as store:
+        store.save_monthly_inputs(
+            (f"user{i}", 2024, month, 80000 + i * 10000)
+            for i in range(5)
+            for month in range(1, 13)
+        )
+        store.save_results(
+            (f"user{i}", 2024, 12, calculate_parttime_tax(age=20, annual_income=(80000 + i * 10000) * 12))
+            for i in range(5)
+        )
+
+        print("=== 計算履歴のストア ===")
+        print(f"10月までの累計が100万円を超えた利用者: {store.users_over(2024, 10, 1000000)}")
+        for user_id, total in store.ytd_totals(2024, 10):
+            print(f"  {user_id}: {total:,}円")
+        latest = store.latest_result("user4", 2024)
+        print(f"user4 の最新の手取り: {latest['netIncome']:,}円")
+        print(f"user4 のトラッカー: {store.load_tracker('user4', 2024).summary()['total']:,}円")
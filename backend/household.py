@@ -0,0 +1,242 @@
+"""
+世帯（親＋子）の手取りシミュレーション
+
+子（アルバイト・パートまたは業務委託）の収入の格子について、子の手取りと、親が受ける
+扶養控除・特定扶養控除（配偶者の扶養の場合は配偶者控除・配偶者特別控除）が減ることによる
+親の税負担の増加をまとめて計算し、世帯の手取りが最も多くなる子の収入を求める。
+
+子の計算は一括計算エンジン（calculator_batch）、親の控除は年分のルール（tax_rules）の
+控除の階段を子の合計所得の配列で引く。格子全体を1回の配列計算で求めるため、
+格子を細かくしても画面の操作に合わせて計算し直せる。
+"""
+
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .calculator_batch import calculate_parttime_tax_batch, calculate_freelance_tax_batch, truncate_to_int
+from .calculator_parttime import calculate_social_insurance
+from .fixed_point import resident_tax_from_taxable
+from .tax_rules import get_rules
+
+
+# 既定の子の収入の格子（1万円刻みで300万円まで）
+DEFAULT_CHILD_INCOMES = np.arange(0, 3000001, 10000, dtype=np.int64)
+
+# 特定扶養親族の年齢（その年の12月31日時点）
+SPECIFIC_DEPENDENT_AGES = (19, 22)
+
+# 扶養控除の対象になる年齢の下限（15歳以下は年少扶養親族で控除なし）
+MIN_DEPENDENT_AGE = 16
+
+
+def _deduction_schedules(rules, dependent_type: str, child_age: int):
+    """
+    親が受ける控除の表
+
+    Returns:
+        (所得税の控除の表, 住民税の控除の表)。控除がない場合は None
+    """
+    if dependent_type == "spouse":
+        return rules.spouse_deduction, rules.resident_spouse_deduction
+    if child_age < MIN_DEPENDENT_AGE:
+        return None
+    if SPECIFIC_DEPENDENT_AGES[0] <= child_age <= SPECIFIC_DEPENDENT_AGES[1]:
+        return rules.specific_dependent_deduction, rules.resident_specific_dependent_deduction
+    return rules.dependent_deduction, rules.resident_dependent_deduction
+
+
+def _scale_spouse_deduction(amount: np.ndarray, parent_total_income: int, income_limits: Tuple[int, ...]) -> np.ndarray:
+    """
+    納税者（親）の合計所得に応じて配偶者控除を減らす
+
+    900万円以下は満額、950万円以下は2/3、1,000万円以下は1/3（いずれも1万円未満を切り上げ）、
+    1,000万円を超えると0円。
+    """
+    tier = bisect_left(income_limits, parent_total_income)
+    if tier == 0:
+        return amount
+    if tier == len(income_limits):
+        return np.zeros_like(amount)
+    steps = len(income_limits)
+    share = steps - tier
+    return -(-amount * share // (steps * 10000)) * 10000
+
+
+def _parent_taxes(
+    rules,
+    parent_total_income: int,
+    parent_social_insurance: int,
+    deduction: np.ndarray,
+    resident_deduction: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """親の所得税・住民税（所得割10% + 均等割5,000円の簡易計算）"""
+    taxable_income = np.maximum(
+        parent_total_income - rules.basic_deduction(parent_total_income) - parent_social_insurance - deduction, 0
+    )
+    income_tax = rules.income_tax.evaluate_array(taxable_income)
+
+    resident_taxable_income = np.maximum(
+        parent_total_income - rules.resident_basic_deduction - parent_social_insurance - resident_deduction, 0
+    )
+    resident_tax = resident_tax_from_taxable(resident_taxable_income, "reference")
+    return income_tax, resident_tax
+
+
+def _child_columns(
+    child_type: str,
+    child_incomes: np.ndarray,
+    child_profile: Dict,
+    rules
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    子の手取りと合計所得
+
+    Returns:
+        (手取り, 合計所得)
+    """
+    profile = dict(child_profile)
+    if child_type == "parttime":
+        columns = calculate_parttime_tax_batch(annual_income=child_incomes, tax_year=rules.year, **profile)
+        total_income = child_incomes - rules.employment_income_deduction.evaluate_array(child_incomes)
+    elif child_type == "freelance":
+        expense_rate = profile.pop("expense_rate", 0)
+        columns = calculate_freelance_tax_batch(
+            annual_revenue=child_incomes,
+            annual_expense=truncate_to_int(child_incomes * expense_rate / 100),
+            tax_year=rules.year,
+            **profile
+        )
+        total_income = columns["businessIncome"]
+    else:
+        raise ValueError(f"child_type は 'parttime' か 'freelance' を指定してください: {child_type!r}")
+    return columns["netIncome"], np.maximum(total_income, 0)
+
+
+def _find_drops(child_incomes: np.ndarray, household_net_income: np.ndarray) -> List[Dict]:
+    """格子の次の点で世帯の手取りが減る箇所（壁や控除の階段）"""
+    drops = np.flatnonzero(np.diff(household_net_income) < 0)
+    return [
+        {
+            "childIncome": int(child_incomes[i]),
+            "householdNetIncome": int(household_net_income[i]),
+            "nextChildIncome": int(child_incomes[i + 1]),
+            "loss": int(household_net_income[i] - household_net_income[i + 1])
+        }
+        for i in drops
+    ]
+
+
+def simulate_household(
+    parent_income: int,
+    child_incomes=None,
+    child_type: str = "parttime",
+    dependent_type: str = "parent",
+    child_age: int = 20,
+    child_profile: Optional[Dict] = None,
+    parent_social_insurance: Optional[int] = None,
+    tax_year: Optional[int] = None
+) -> Dict:
+    """
+    子の収入の格子について世帯の手取りを一括計算
+
+    Args:
+        parent_income: 親の給与収入（円）。dependent_type="spouse" の場合は扶養する配偶者の給与収入
+        child_incomes: 子の収入の格子（アルバイト・パートは年収、業務委託は売上。省略時は DEFAULT_CHILD_INCOMES）
+        child_type: 子の働き方（"parttime" | "freelance"）
+        dependent_type: 扶養区分（"parent" | "spouse"）
+        child_age: 子の年齢（扶養控除・特定扶養控除の判定用）
+        child_profile: 子の条件。parttime は calculate_parttime_tax_batch の引数（is_student,
+            company_size, weekly_hours など）、freelance は calculate_freelance_tax_batch の引数
+            （tax_filing_type, business_type, is_student など）と expense_rate（経費率%）
+        parent_social_insurance: 親の社会保険料（年額。省略時は給与の約14%で概算）
+        tax_year: 年分（省略時は tax_rules.DEFAULT_TAX_YEAR）
+
+    Returns:
+        子の収入ごとの列（childIncome, childTotalIncome, childNetIncome, parentDeduction,
+        parentResidentDeduction, parentIncomeTax, parentResidentTax, parentTaxIncrease,
+        parentNetIncome, householdNetIncome）と、世帯の手取りが最も多い点（optimum）、
+        収入を増やすと世帯の手取りが減る箇所（drops）
+    """
+    if dependent_type not in ("parent", "spouse"):
+        raise ValueError(f"dependent_type は 'parent' か 'spouse' を指定してください: {dependent_type!r}")
+
+    rules = get_rules(tax_year)
+    child_incomes = np.asarray(DEFAULT_CHILD_INCOMES if child_incomes is None else child_incomes, dtype=np.int64)
+    child_net_income, child_total_income = _child_columns(child_type, child_incomes, child_profile or {}, rules)
+
+    # 親の所得と社会保険料
+    parent_total_income = max(parent_income - rules.employment_income_deduction(parent_income), 0)
+    if parent_social_insurance is None:
+        parent_social_insurance = calculate_social_insurance(parent_income // 12)["total"] * 12
+
+    # 親が受ける控除（子の合計所得に応じて減る）
+    schedules = _deduction_schedules(rules, dependent_type, child_age)
+    if schedules is None:
+        deduction = resident_deduction = np.zeros_like(child_incomes)
+        full_deduction = full_resident_deduction = np.zeros(1, dtype=np.int64)
+    else:
+        schedule, resident_schedule = schedules
+        # 子の収入が0円の場合の控除（満額）と比べて、親の税負担がいくら増えるかを求める
+        points = np.concatenate(([0], child_total_income))
+        deduction = schedule.evaluate_array(points)
+        resident_deduction = resident_schedule.evaluate_array(points)
+        if dependent_type == "spouse":
+            deduction = _scale_spouse_deduction(deduction, parent_total_income, rules.spouse_deduction_income_limits)
+            resident_deduction = _scale_spouse_deduction(
+                resident_deduction, parent_total_income, rules.spouse_deduction_income_limits
+            )
+        full_deduction, deduction = deduction[:1], deduction[1:]
+        full_resident_deduction, resident_deduction = resident_deduction[:1], resident_deduction[1:]
+
+    parent_income_tax, parent_resident_tax = _parent_taxes(
+        rules, parent_total_income, parent_social_insurance, deduction, resident_deduction
+    )
+    base_income_tax, base_resident_tax = _parent_taxes(
+        rules, parent_total_income, parent_social_insurance, full_deduction, full_resident_deduction
+    )
+    parent_tax = parent_income_tax + parent_resident_tax
+    parent_tax_increase = parent_tax - (base_income_tax + base_resident_tax)
+    parent_net_income = parent_income - parent_social_insurance - parent_tax
+    household_net_income = child_net_income + parent_net_income
+
+    best = int(np.argmax(household_net_income))
+    return {
+        "childIncome": child_incomes,
+        "childTotalIncome": child_total_income,
+        "childNetIncome": child_net_income,
+        "parentDeduction": deduction,
+        "parentResidentDeduction": resident_deduction,
+        "parentIncomeTax": parent_income_tax,
+        "parentResidentTax": parent_resident_tax,
+        "parentTaxIncrease": parent_tax_increase,
+        "parentNetIncome": parent_net_income,
+        "householdNetIncome": household_net_income,
+        "optimum": {
+            "childIncome": int(child_incomes[best]),
+            "childNetIncome": int(child_net_income[best]),
+            "parentTaxIncrease": int(parent_tax_increase[best]),
+            "householdNetIncome": int(household_net_income[best])
+        },
+        "drops": _find_drops(child_incomes, household_net_income)
+    }
+
+
+if __name__ == "__main__":
+    # テスト実行
+    for tax_year in (2024, 2025):
+        result = simulate_household(
+            parent_income=6000000,
+            child_profile={"is_student": True, "company_size": "small", "weekly_hours": 15},
+            tax_year=tax_year
+        )
+        print(f"=== {tax_year}年分: 親の年収600万円・子は20歳の学生アルバイト ===")
+        for income in (1000000, 1030000, 1230000, 1300000, 1500000, 1600000, 2000000):
+            i = int(np.searchsorted(result["childIncome"], income))
+            print(
+                f"子の年収 {income:>9,}円: 子の手取り {result['childNetIncome'][i]:>9,}円 / "
+                f"親の税負担の増加 {result['parentTaxIncrease'][i]:>7,}円 / 世帯 {result['householdNetIncome'][i]:>10,}円"
+            )
+        for drop in result["drops"]:
+            print(f"  {drop['childIncome']:,}円 → {drop['nextChildIncome']:,}円で世帯の手取りが{drop['loss']:,}円減少")
@@ -0,0 +1,177 @@
+"""
+月別収入の累計トラッカー
+
+1年分の月別収入について、累計・入力済み月数・社会保険の月額要件（88,000円以上）を
+満たす月数を差分更新で保持する。月の入力を変えても全月を合計し直さない。
+年ごとに1つ作るため、過去の年の履歴が増えても更新コストは変わらない。
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+from .tax_rules import get_rules
+
+
+class IncomeTracker:
+    """
+    1年分の月別収入の累計
+
+    update() は O(1) で累計を更新する。見込み（未入力の月は入力済みの月の平均で埋める）と
+    壁を超える月の予測は、12か月・壁5本の固定長の計算で求める。
+    """
+
+    def __init__(
+        self,
+        monthly_incomes: Optional[Sequence[Optional[int]]] = None,
+        wall_type: str = "parttime",
+        year: Optional[int] = None
+    ):
+        """
+        Args:
+            monthly_incomes: 1〜12月の収入（None は未入力）
+            wall_type: "parttime" または "freelance"
+            year: 対象年（壁と社会保険の月額要件はこの年分のルールを使う。省略時は既定の年分）
+        """
+        rules = get_rules(year)
+        self.year = year
+        self.wall_type = "parttime" if wall_type == "parttime" else "freelance"
+        self.wall_index = rules.walls[self.wall_type]
+        # 社会保険加入要件の月収（check_social_insurance_requirement と同じ基準）
+        self.monthly_threshold = rules.social_insurance_monthly_threshold
+        self._incomes: List[Optional[int]] = [None] * 12
+        self.total = 0
+        self.entered_months = 0
+        self.eligible_months = 0
+
+        if monthly_incomes is not None:
+            for month, amount in enumerate(monthly_incomes, start=1):
+                if amount is not None:
+                    self.update(month, amount)
+
+    @property
+    def monthly_incomes(self) -> List[int]:
+        """1〜12月の収入（未入力は0）"""
+        return [amount or 0 for amount in self._incomes]
+
+    @property
+    def entered_incomes(self) -> List[Optional[int]]:
+        """1〜12月の収入（未入力は None。IncomeTracker に渡すと入力済みの月だけ引き継ぐ）"""
+        return list(self._incomes)
+
+    def update(self, month: int, amount: Optional[int]) -> Dict:
+        """
+        1か月分の収入を更新する
+
+        Args:
+            month: 月（1〜12）
+            amount: 収入（円）。None で未入力に戻す
+
+        Returns:
+            更新後のサマリー（summary() と同じ）
+        """
+        if not 1 <= month <= 12:
+            raise ValueError(f"月は1〜12で指定してください: {month}")
+
+        i = month - 1
+        previous = self._incomes[i]
+        if previous is not None:
+            self.total -= previous
+            self.entered_months -= 1
+            self.eligible_months -= previous >= self.monthly_threshold
+
+        self._incomes[i] = amount
+        if amount is not None:
+            self.total += amount
+            self.entered_months += 1
+            self.eligible_months += amount >= self.monthly_threshold
+
+        return self.summary()
+
+    def is_eligible(self, month: int) -> bool:
+        """その月が社会保険の月額要件（88,000円以上）を満たすか"""
+        amount = self._incomes[month - 1]
+        return amount is not None and amount >= self.monthly_threshold
+
+    @property
+    def monthly_average(self) -> int:
+        """入力済みの月の平均収入"""
+        return self.total // self.entered_months if self.entered_months else 0
+
+    @property
+    def projected_annual(self) -> int:
+        """年間の見込み収入（未入力の月は入力済みの月の平均で埋める）"""
+        return self.total + self.monthly_average * (12 - self.entered_months)
+
+    def projected_crossings(self) -> List[Dict]:
+        """
+        見込みの収入で壁を超える月を予測する
+
+        Returns:
+            まだ超えていない壁のうち年内に超える見込みの壁（壁の金額・名前・超える月）
+        """
+        average = self.monthly_average
+        crossings = []
+        cumulative = 0
+        level = self.wall_index.level(0)
+        amounts = self.wall_index.amounts
+
+        for month, amount in enumerate(self._incomes, start=1):
+            cumulative += average if amount is None else amount
+            while level < len(amounts) and cumulative >= amounts[level]:
+                wall = self.wall_index.walls[level]
+                crossings.append({
+                    "amount": wall["amount"],
+                    "name": wall["name"],
+                    "month": month,
+                    "alreadyExceeded": wall["amount"] <= self.total
+                })
+                level += 1
+
+        return crossings
+
+    def simulate_crossings(self, **options) -> Dict:
+        """
+        収入のぶれを含めて年末までに壁を超える確率を求める（未入力の月を乱数で引く）
+
+        Args:
+            **options: wall_forecast.simulate_wall_crossings の引数（volatility, model, paths, seed など）
+
+        Returns:
+            simulate_wall_crossings の結果
+        """
+        # NumPy はシミュレーションを使うときだけ読み込む
+        from .wall_forecast import simulate_wall_crossings
+
+        return simulate_wall_crossings(self._incomes, self.wall_type, self.year, **options)
+
+    def summary(self) -> Dict:
+        """
+        累計と見込みのサマリー
+
+        Returns:
+            累計・入力済み月数・社会保険の月額要件を満たす月数・年間見込み・次に超える壁
+        """
+        upcoming = [crossing for crossing in self.projected_crossings() if not crossing["alreadyExceeded"]]
+        return {
+            "year": self.year,
+            "total": self.total,
+            "enteredMonths": self.entered_months,
+            "eligibleMonths": self.eligible_months,
+            "monthlyAverage": self.monthly_average,
+            "projectedAnnual": self.projected_annual,
+            "nextCrossing": upcoming[0] if upcoming else None
+        }
+
+
+if __name__ == "__main__":
+    # テスト実行
+    tracker = IncomeTracker(year=2024)
+    for month, amount in enumerate([80000, 90000, 95000, 100000], start=1):
+        summary = tracker.update(month, amount)
+
+    print("=== 月別収入の累計 ===")
+    print(f"累計: {summary['total']:,}円（{summary['enteredMonths']}か月分）")
+    print(f"月88,000円以上の月: {summary['eligibleMonths']}か月")
+    print(f"年間見込み: {summary['projectedAnnual']:,}円")
+    if summary["nextCrossing"]:
+        crossing = summary["nextCrossing"]
+        print(f"次に超える壁: {crossing['name']}（{crossing['month']}月の見込み）")
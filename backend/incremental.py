@@ -0,0 +1,441 @@
+"""
+入力の変更に合わせた差分の再計算（業務委託版）
+
+業務委託版の計算を、名前つきのノード（入力の名前と計算関数）のグラフとして定義する。
+入力を変えたときは、その入力に依存するノードだけを順に計算し直し、値が変わらなかった
+ノードの先は計算しない。例えば事業種類（business_type）だけを変えた場合は、個人事業税・
+業種平均経費率とそれに依存する合計税額・手取り・アドバイスだけを計算し、青色vs白色の比較や
+国民健康保険料は計算し直さない。
+
+ノードの計算は calculator_freelance の関数を使い、結果は calculate_freelance_tax と
+同じ FreelanceResult になる。各ノードの式は calculate_freelance_tax の手順を書き直したものなので、
+片方を変えたら check_parity（python -m backend.incremental --check）で一致を確認する。
+"""
+
+from operator import itemgetter
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+from .advice import advice_table, freelance_advice_flags
+from .calculator_freelance import (
+    calculate_business_tax,
+    calculate_national_health_insurance,
+    calculate_resident_tax_freelance,
+    compare_blue_vs_white
+)
+from .results import FreelanceResult
+from .tax_rules import available_tax_years, get_rules
+
+
+class CalculationGraph:
+    """
+    名前つきのノードを依存の順に並べた計算グラフ
+
+    ノードは (名前, 入力の名前, 計算関数) で定義し、計算関数は入力の値を順に引数で受け取る。
+    入力の名前は、グラフの入力かそれより前に定義したノードの名前でなければならない。
+    """
+
+    def __init__(self, inputs: Sequence[str], nodes: Sequence[Tuple[str, Tuple[str, ...], Callable]]):
+        """
+        Args:
+            inputs: グラフの入力の名前
+            nodes: (名前, 入力の名前, 計算関数) の並び（依存する順）
+        """
+        self.inputs = tuple(inputs)
+        self.nodes = tuple(nodes)
+
+        known = set(self.inputs)
+        dependents: Dict[str, List[int]] = {name: [] for name in self.inputs}
+        for i, (name, node_inputs, _) in enumerate(self.nodes):
+            if name in known:
+                raise ValueError(f"ノード名が重複しています: {name}")
+            if not node_inputs:
+                raise ValueError(f"{name} の入力がありません")
+            for input_name in node_inputs:
+                if input_name not in known:
+                    raise ValueError(f"{name} の入力 {input_name} はそれより前に定義されていません")
+                dependents[input_name].append(i)
+            known.add(name)
+            dependents[name] = []
+
+        # 名前 → それを入力にするノードの番号
+        self.dependents = {name: tuple(indices) for name, indices in dependents.items()}
+        # ノードごとの (名前, 入力の名前, 計算関数, 入力の取り出し, 入力が1つか)
+        # （itemgetter は入力が1つのときは値、複数のときはタプルを返す）
+        self._steps = tuple(
+            (name, node_inputs, func, itemgetter(*node_inputs), len(node_inputs) == 1)
+            for name, node_inputs, func in self.nodes
+        )
+        # 変わった入力の組 → 計算し直す候補のノード（依存の順）
+        self._affected: Dict[FrozenSet[str], Tuple[Tuple, ...]] = {}
+
+    def evaluate(self, values: Dict) -> None:
+        """入力の値（values）からすべてのノードを計算して values に書き込む"""
+        for name, _, func, fetch, single in self._steps:
+            values[name] = func(fetch(values)) if single else func(*fetch(values))
+
+    def affected(self, changed: Iterable[str]) -> Tuple[int, ...]:
+        """変わった入力・ノードから直接・間接に依存するノードの番号（依存の順）"""
+        found = set()
+        stack = list(changed)
+        while stack:
+            for i in self.dependents[stack.pop()]:
+                if i not in found:
+                    found.add(i)
+                    stack.append(self.nodes[i][0])
+        return tuple(sorted(found))
+
+    def propagate(self, values: Dict, changed: Sequence[str]) -> Tuple[List[str], List[str]]:
+        """
+        変わった入力に依存するノードだけを計算し直す
+
+        ノードは定義の順（依存の順）に計算し、値が前と同じだったノードの先には進まない。
+
+        Args:
+            values: 入力とノードの値（計算し直した値で上書きする）
+            changed: 値を変えた入力の名前
+
+        Returns:
+            (計算し直したノードの名前, 値が変わったノードの名前)
+        """
+        key = frozenset(changed)
+        steps = self._affected.get(key)
+        if steps is None:
+            steps = self._affected[key] = tuple(self._steps[i] for i in self.affected(key))
+
+        dirty = set(changed)
+        evaluated: List[str] = []
+        updated: List[str] = []
+        for name, node_inputs, func, fetch, single in steps:
+            if dirty.isdisjoint(node_inputs):
+                continue
+            value = func(fetch(values)) if single else func(*fetch(values))
+            evaluated.append(name)
+            previous = values[name]
+            if value is previous or value == previous:
+                continue
+            values[name] = value
+            dirty.add(name)
+            updated.append(name)
+        return evaluated, updated
+
+
+def _filing_comparison(revenue, expense, business_income, income_tax, resident_tax, tax_filing_type, rules):
+    # 比較に使うのは所得・所得税・住民税だけ（個人事業税・社会保険料が変わっても計算し直さない）
+    tax = income_tax + resident_tax
+    return compare_blue_vs_white(
+        revenue, expense, business_income, income_tax, tax, revenue - expense - tax, tax_filing_type,
+        current_resident_tax=resident_tax, tax_year=rules.year
+    )
+
+
+def _advice_code(
+    rules, wall_level, dependent_type, tax_filing_type, confirmation_required, expense_ratio,
+    industry_average_expense_rate, remaining_expense_capacity, student_pension_exemption
+):
+    return advice_table("freelance", rules)[wall_level][dependent_type == "parent"] | freelance_advice_flags(
+        tax_filing_type == "white" and confirmation_required,
+        expense_ratio < industry_average_expense_rate and remaining_expense_capacity > 0,
+        student_pension_exemption
+    )
+
+
+# 業務委託版の入力（calculate_freelance_tax の引数）
+FREELANCE_INPUTS = (
+    "age",
+    "annual_revenue",
+    "annual_expense",
+    "is_student",
+    "dependent_type",
+    "tax_filing_type",
+    "business_type",
+    "tax_year"
+)
+
+# 業務委託版のノード（FreelanceResult の引数と同じ名前のノードが結果になる）
+FREELANCE_NODES = (
+    ("rules", ("tax_year",), get_rules),
+    ("blue_filing_deduction", ("rules", "tax_filing_type"),
+     lambda rules, tax_filing_type: rules.blue_filing_deductions.get(tax_filing_type, 0)),
+    ("business_income", ("annual_revenue", "annual_expense", "blue_filing_deduction"),
+     lambda revenue, expense, deduction: revenue - expense - deduction),
+    ("basic_deduction", ("rules", "business_income"), lambda rules, income: rules.basic_deduction(income)),
+    ("taxable_income", ("business_income", "basic_deduction"), lambda income, deduction: max(income - deduction, 0)),
+    ("income_tax", ("rules", "taxable_income"), lambda rules, taxable_income: rules.income_tax(taxable_income)),
+    ("resident_tax", ("business_income", "rules"),
+     lambda income, rules: calculate_resident_tax_freelance(income, rules.year)),
+    ("business_tax", ("business_income", "business_type"), calculate_business_tax),
+    ("health_insurance", ("business_income", "rules"),
+     lambda income, rules: calculate_national_health_insurance(income, rules.year)),
+    ("pension_insurance", ("rules",), lambda rules: rules.national_pension_annual),
+    ("student_pension_exemption", ("rules", "is_student", "business_income"),
+     lambda rules, is_student, income: is_student and income <= rules.student_pension_exemption_limit),
+    ("total_tax", ("income_tax", "resident_tax", "business_tax"),
+     lambda income_tax, resident_tax, business_tax: income_tax + resident_tax + business_tax),
+    ("total_insurance", ("health_insurance", "pension_insurance", "student_pension_exemption"),
+     lambda health, pension, exemption: health + (0 if exemption else pension)),
+    ("net_income", ("annual_revenue", "annual_expense", "total_tax", "total_insurance"),
+     lambda revenue, expense, tax, insurance: revenue - expense - tax - insurance),
+    ("expense_ratio", ("annual_revenue", "annual_expense"),
+     lambda revenue, expense: (expense / revenue * 100) if revenue > 0 else 0),
+    ("expense_rate", ("expense_ratio",), lambda ratio: round(ratio, 1)),
+    ("industry_average_expense_rate", ("rules", "business_type"),
+     lambda rules, business_type: rules.expense_rates.get(business_type, rules.expense_rates["other"])["averageRate"]),
+    ("remaining_expense_capacity", ("annual_revenue", "annual_expense", "industry_average_expense_rate"),
+     lambda revenue, expense, average: max(int(revenue * average / 100) - expense, 0)),
+    ("wall_index", ("rules",), lambda rules: rules.walls["freelance"]),
+    ("wall_level", ("wall_index", "business_income"), lambda wall_index, income: wall_index.level(income)),
+    ("blue_vs_white_comparison",
+     ("annual_revenue", "annual_expense", "business_income", "income_tax", "resident_tax", "tax_filing_type", "rules"),
+     _filing_comparison),
+    ("confirmation_required", ("business_income", "basic_deduction"), lambda income, deduction: income > deduction),
+    ("advice_code",
+     ("rules", "wall_level", "dependent_type", "tax_filing_type", "confirmation_required", "expense_ratio",
+      "industry_average_expense_rate", "remaining_expense_capacity", "student_pension_exemption"),
+     _advice_code)
+)
+
+FREELANCE_GRAPH = CalculationGraph(FREELANCE_INPUTS, FREELANCE_NODES)
+
+# FreelanceResult の引数の順に、値を取り出す入力・ノードの名前（売上・経費は入力そのまま）
+_RESULT_SOURCES = tuple(
+    {"total_revenue": "annual_revenue", "total_expense": "annual_expense"}.get(field, field)
+    for field in FreelanceResult._FIELDS
+)
+
+# 結果のキー → 値が依存する入力・ノード（参照したときに作る項目は複数のノードに依存する）
+_KEY_DEPENDENCIES = {
+    key: (_RESULT_SOURCES[FreelanceResult._FIELDS.index(attribute)],)
+    for key, attribute in FreelanceResult._KEYS.items() if attribute in FreelanceResult._FIELDS
+}
+_KEY_DEPENDENCIES.update({
+    "wallsExceeded": ("wall_index", "wall_level"),
+    "nextWall": ("wall_index", "wall_level", "business_income"),
+    "advice": (
+        "advice_code", "business_income", "wall_index", "wall_level",
+        "industry_average_expense_rate", "remaining_expense_capacity"
+    )
+})
+
+# 結果のキー → そのまま値になる入力・ノード
+_DIRECT_SOURCES = {key: dependencies[0] for key, dependencies in _KEY_DEPENDENCIES.items() if len(dependencies) == 1}
+
+# 参照したときに作る項目（前の値と比べて、変わったときだけ差分に含める）
+_DERIVED_KEYS = frozenset(key for key, dependencies in _KEY_DEPENDENCIES.items() if len(dependencies) > 1)
+
+# 入力・ノード → それに依存する結果のキー
+_AFFECTED_KEYS: Dict[str, List[str]] = {}
+for _key, _dependencies in _KEY_DEPENDENCIES.items():
+    for _name in _dependencies:
+        _AFFECTED_KEYS.setdefault(_name, []).append(_key)
+
+# 差分を返すときの並び（FreelanceResult のキー → 順番）
+_KEY_ORDER = {key: i for i, key in enumerate(FreelanceResult._KEYS)}
+
+# 入力・ノード → FreelanceResult の値のタプルでの位置
+_RESULT_POSITIONS: Dict[str, List[int]] = {}
+for _i, _name in enumerate(_RESULT_SOURCES):
+    _RESULT_POSITIONS.setdefault(_name, []).append(_i)
+
+_MISSING = object()
+
+
+class FreelanceCalculation:
+    """
+    入力を変えながら使う業務委託版の計算（画面のスライダーなど）
+
+    update() で変えた入力に依存するノードだけを計算し直し、値が変わった結果のキーだけを返す。
+    最新の結果は result（calculate_freelance_tax と同じ FreelanceResult）で参照する。
+    """
+
+    def __init__(
+        self,
+        age: int,
+        annual_revenue: int,
+        annual_expense: int,
+        is_student: bool = False,
+        dependent_type: str = "none",
+        tax_filing_type: str = "white",
+        business_type: str = "other",
+        tax_year: Optional[int] = None
+    ):
+        """
+        Args:
+            calculate_freelance_tax と同じ
+        """
+        self._values = {
+            "age": age,
+            "annual_revenue": annual_revenue,
+            "annual_expense": annual_expense,
+            "is_student": is_student,
+            "dependent_type": dependent_type,
+            "tax_filing_type": tax_filing_type,
+            "business_type": business_type,
+            "tax_year": tax_year
+        }
+        FREELANCE_GRAPH.evaluate(self._values)
+        self.result = self._build_result()
+        # 参照したときに作る項目の最新の値（依存するノードが変わるまで使える）
+        self._derived: Dict = {}
+        # 直前の update() で計算し直したノード
+        self.recomputed: Tuple[str, ...] = ()
+
+    def _build_result(self) -> FreelanceResult:
+        values = self._values
+        return FreelanceResult(*[values[name] for name in _RESULT_SOURCES])
+
+    @property
+    def inputs(self) -> Dict:
+        """現在の入力"""
+        return {name: self._values[name] for name in FREELANCE_INPUTS}
+
+    def update(self, **changes) -> Dict:
+        """
+        入力を変えて計算し直す
+
+        Args:
+            **changes: 変える入力（calculate_freelance_tax の引数名）
+
+        Returns:
+            値が変わった結果のキー → 新しい値（何も変わらなければ空の dict）
+        """
+        values = self._values
+        changed = []
+        for name, value in changes.items():
+            if name not in FREELANCE_INPUTS:
+                raise TypeError(f"不明な入力です: {name}")
+            if values[name] != value:
+                values[name] = value
+                changed.append(name)
+
+        evaluated, updated = FREELANCE_GRAPH.propagate(values, changed)
+        self.recomputed = tuple(evaluated)
+        if not updated and not changed:
+            return {}
+
+        # 変わった入力・ノードの値だけを前の結果に差し替える
+        previous = self.result
+        fields = list(previous._values)
+        touched = set()
+        for name in changed + updated:
+            for i in _RESULT_POSITIONS.get(name, ()):
+                fields[i] = values[name]
+            touched.update(_AFFECTED_KEYS.get(name, ()))
+        self.result = result = FreelanceResult.from_values(tuple(fields))
+
+        diff = {}
+        for key in sorted(touched, key=_KEY_ORDER.__getitem__):
+            source = _DIRECT_SOURCES.get(key)
+            value = result[key] if source is None else values[source]
+            if key in _DERIVED_KEYS:
+                before = self._derived.get(key, _MISSING)
+                if before is _MISSING:
+                    before = previous[key]
+                self._derived[key] = value
+                if value == before:
+                    continue
+            diff[key] = value
+        return diff
+
+
+def check_parity(tax_years: Optional[Sequence[int]] = None) -> List[Dict]:
+    """
+    ノードのグラフと calculate_freelance_tax の結果が一致するか確認
+
+    壁の前後の所得になる売上を、申告種類・事業種類・扶養区分・学生の組み合わせごとに両方で計算し、
+    to_dict() を比べる。グラフは入力から計算し直した結果と、前の入力からの update() の結果の両方を比べる。
+    calculate_freelance_tax か FREELANCE_NODES の片方だけを変えると一致しなくなる。
+
+    Args:
+        tax_years: 確認する年分（省略時は対応しているすべての年分）
+
+    Returns:
+        結果が一致しなかった入力
+    """
+    from .calculator_freelance import calculate_freelance_tax
+
+    mismatches = []
+    for tax_year in tax_years or available_tax_years():
+        rules = get_rules(tax_year)
+        incomes = sorted({
+            max(amount + delta, 0) for amount in rules.walls["freelance"].amounts for delta in (-1, 0, 1)
+        } | {0, rules.student_pension_exemption_limit, 5000000})
+        calculation = None
+        for tax_filing_type, deduction in rules.blue_filing_deductions.items():
+            for business_type in rules.expense_rates:
+                for expense in (0, 300000):
+                    for income in incomes:
+                        for dependent_type in ("parent", "spouse", "none"):
+                            for is_student in (False, True):
+                                inputs = {
+                                    "age": 20 if is_student else 30,
+                                    "annual_revenue": income + expense + deduction,
+                                    "annual_expense": expense,
+                                    "is_student": is_student,
+                                    "dependent_type": dependent_type,
+                                    "tax_filing_type": tax_filing_type,
+                                    "business_type": business_type,
+                                    "tax_year": tax_year
+                                }
+                                expected = calculate_freelance_tax(**inputs).to_dict()
+                                if calculation is None:
+                                    calculation = FreelanceCalculation(**inputs)
+                                else:
+                                    calculation.update(**inputs)
+                                if (
+                                    calculation.result.to_dict() != expected
+                                    or FreelanceCalculation(**inputs).result.to_dict() != expected
+                                ):
+                                    mismatches.append(inputs)
+    return mismatches
+
+
+if __name__ == "__main__":
+    # テスト実行
+    import sys
+    import timeit
+    from itertools import cycle
+
+    from .calculator_freelance import calculate_freelance_tax
+
+    if "--check" in sys.argv[1:]:
+        mismatches = check_parity()
+        if mismatches:
+            print(f"ノードのグラフと calculate_freelance_tax の結果が一致しません（{len(mismatches)}件）:")
+            for inputs in mismatches[:10]:
+                print(f"  {inputs}")
+            sys.exit(1)
+        print("ノードのグラフと calculate_freelance_tax の結果は一致しています")
+        sys.exit(0)
+
+    calculation = FreelanceCalculation(
+        age=20,
+        annual_revenue=1500000,
+        annual_expense=300000,
+        is_student=True,
+        dependent_type="parent",
+        tax_filing_type="blue65",
+        business_type="writer"
+    )
+    print("=== 差分の再計算（業務委託版） ===")
+    for changes in ({"business_type": "designer"}, {"annual_expense": 400000}, {"tax_filing_type": "white"}):
+        diff = calculation.update(**changes)
+        print(f"{changes}: 計算し直したノード {len(calculation.recomputed)}/{len(FREELANCE_NODES)}")
+        for key, value in diff.items():
+            print(f"  {key}: {value if key != 'blueVsWhiteComparison' else value.to_dict()}")
+        assert calculation.result.to_dict() == calculate_freelance_tax(**calculation.inputs).to_dict()
+
+    def full_diff(previous, **changes):
+        # 比較用: すべて計算し直して前の結果とキーごとに比べる
+        result = calculate_freelance_tax(**{**calculation.inputs, **changes})
+        return result, {key: result[key] for key in result if result[key] != previous[key]}
+
+    print()
+    for label, name, values in (
+        ("事業種類の変更", "business_type", ["writer", "designer"]),
+        ("売上の変更", "annual_revenue", [1500000, 1510000])
+    ):
+        values = cycle(values)
+        seconds = timeit.timeit(lambda: calculation.update(**{name: next(values)}), number=20000) / 20000
+        previous = calculation.result
+        full_seconds = timeit.timeit(lambda: full_diff(previous, **{name: next(values)}), number=20000) / 20000
+        print(f"{label}: {seconds * 1e6:.1f}µs（すべて計算し直して比べる場合 {full_seconds * 1e6:.1f}µs）")
@@ -0,0 +1,152 @@
+"""
+計算の段階ごとの処理時間の計測
+
+計算関数の中で start() が返すタイマーの mark() を段階ごとに呼ぶと、前回の mark() からの
+経過時間をその段階の処理時間として記録する。無効時（既定）は何もしないタイマーを返すため、
+計算関数への影響は mark() の空呼び出しだけ。
+
+有効化は enable() または環境変数 TAXCHECK_INSTRUMENTATION=1。記録は snapshot() で
+参照でき、to_openmetrics() で OpenMetrics 形式のテキストとして出力できる。
+"""
+
+import os
+from threading import Lock
+from time import perf_counter
+from typing import Dict, List, Tuple
+
+
+_enabled = os.environ.get("TAXCHECK_INSTRUMENTATION", "") not in ("", "0")
+_lock = Lock()
+
+# (計算タイプ, 段階) → [呼び出し回数, 合計秒数]
+_stats: Dict[Tuple[str, str], List] = {}
+
+
+class _StageTimer:
+    """段階ごとの経過時間を記録するタイマー"""
+
+    __slots__ = ("pipeline", "last")
+
+    def __init__(self, pipeline: str):
+        self.pipeline = pipeline
+        self.last = perf_counter()
+
+    def mark(self, stage: str) -> None:
+        """前回の mark() からの経過時間を stage の処理時間として記録"""
+        now = perf_counter()
+        key = (self.pipeline, stage)
+        with _lock:
+            entry = _stats.get(key)
+            if entry is None:
+                _stats[key] = [1, now - self.last]
+            else:
+                entry[0] += 1
+                entry[1] += now - self.last
+        self.last = perf_counter()
+
+
+class _NullTimer:
+    """無効時のタイマー（何も記録しない）"""
+
+    __slots__ = ()
+
+    def mark(self, stage: str) -> None:
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def start(pipeline: str):
+    """
+    計算1回分のタイマーを開始
+
+    Args:
+        pipeline: 計算タイプ（"parttime" | "freelance" など）
+
+    Returns:
+        mark(stage) を持つタイマー（無効時は何もしない）
+    """
+    return _StageTimer(pipeline) if _enabled else _NULL_TIMER
+
+
+def enable() -> None:
+    """計測を有効にする"""
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    """計測を無効にする（記録は残す）"""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    """計測が有効かどうか"""
+    return _enabled
+
+
+def reset() -> None:
+    """記録を消去する"""
+    with _lock:
+        _stats.clear()
+
+
+def snapshot() -> Dict[str, Dict[str, Dict]]:
+    """
+    記録の写しを取得
+
+    Returns:
+        計算タイプ → 段階 → 呼び出し回数・合計秒数・平均秒数
+    """
+    with _lock:
+        items = [(key, tuple(entry)) for key, entry in _stats.items()]
+
+    result: Dict[str, Dict[str, Dict]] = {}
+    for (pipeline, stage), (calls, total) in items:
+        result.setdefault(pipeline, {})[stage] = {
+            "calls": calls,
+            "totalSeconds": total,
+            "meanSeconds": total / calls
+        }
+    return result
+
+
+def _escape_label(value: str) -> str:
+    """OpenMetrics のラベル値をエスケープ"""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def to_openmetrics(prefix: str = "taxcheck") -> str:
+    """
+    記録を OpenMetrics 形式で出力
+
+    Args:
+        prefix: メトリクス名の接頭辞
+
+    Returns:
+        OpenMetrics 形式のテキスト（# EOF で終わる）
+    """
+    with _lock:
+        items = sorted((key, tuple(entry)) for key, entry in _stats.items())
+
+    lines = [
+        f"# TYPE {prefix}_stage_duration_seconds counter",
+        f"# UNIT {prefix}_stage_duration_seconds seconds",
+        f"# HELP {prefix}_stage_duration_seconds Cumulative time spent in each calculation stage.",
+    ]
+    for (pipeline, stage), (_, total) in items:
+        labels = f'pipeline="{_escape_label(pipeline)}",stage="{_escape_label(stage)}"'
+        lines.append(f"{prefix}_stage_duration_seconds_total{{{labels}}} {total!r}")
+
+    lines += [
+        f"# TYPE {prefix}_stage_calls counter",
+        f"# HELP {prefix}_stage_calls Number of times each calculation stage ran.",
+    ]
+    for (pipeline, stage), (calls, _) in items:
+        labels = f'pipeline="{_escape_label(pipeline)}",stage="{_escape_label(stage)}"'
+        lines.append(f"{prefix}_stage_calls_total{{{labels}}} {calls}")
+
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,113 @@
+"""
+一括計算の並列実行（プロセスプール）
+
+入力をチャンクに分けて ProcessPoolExecutor のワーカーで計算する。
+出力は入力と同じ順序で返し、チャンクごとの統計をまとめる。
+同時に処理中のチャンク数を制限するため、入力が大きくてもメモリ使用量は一定。
+"""
+
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from .bulk_cli import process_records
+
+
+def _process_chunk(kind: str, chunk: List[Tuple[int, object]]) -> Tuple[List[Dict], List[Dict], Dict]:
+    """
+    ワーカーで1チャンクを計算する
+
+    Returns:
+        (出力行, 計算できなかった行, チャンクの統計)
+    """
+    rows: List[Dict] = []
+    errors: List[Dict] = []
+    stats = process_records(kind, chunk, rows.append, errors.append)
+    return rows, errors, stats
+
+
+def _chunks(records: Iterable, chunk_size: int) -> Iterable[List]:
+    """chunk_size 件ずつに分ける"""
+    iterator = iter(records)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def merge_stats(total: Dict, chunk_stats: Dict) -> Dict:
+    """
+    チャンクの統計を合算する
+
+    Args:
+        total: 合算先
+        chunk_stats: チャンクの統計（process_records の戻り値）
+
+    Returns:
+        合算後の統計
+    """
+    total["rows"] += chunk_stats["rows"]
+    total["errors"] += chunk_stats["errors"]
+    total["chunks"] += 1
+    total["workerSeconds"] += chunk_stats["elapsedSeconds"]
+    return total
+
+
+def run_parallel(
+    kind: str,
+    records: Iterable[Tuple[int, object]],
+    write_row: Callable[[Dict], None],
+    quarantine_row: Optional[Callable[[Dict], None]] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = 2000,
+    progress: Optional[Callable[[Dict], None]] = None
+) -> Dict:
+    """
+    行をチャンクに分けて並列に計算する
+
+    Args:
+        kind: "parttime" または "freelance"
+        records: (行番号, 行データ) の反復
+        write_row: 計算結果の出力先（入力と同じ順序で呼ばれる）
+        quarantine_row: 計算できなかった行の出力先
+        workers: ワーカープロセス数（省略時はCPU数）
+        chunk_size: 1チャンクの行数
+        progress: 進捗の通知先（チャンクごと）
+
+    Returns:
+        処理件数・エラー件数・チャンク数・経過時間・ワーカーの合計処理時間
+    """
+    workers = workers or os.cpu_count() or 1
+    stats = {"rows": 0, "errors": 0, "chunks": 0, "elapsedSeconds": 0.0, "workerSeconds": 0.0}
+    started = time.perf_counter()
+
+    # 先読みするチャンク数（ワーカー数の2倍）を超えて投入しない
+    max_pending = workers * 2
+    pending: Deque[Future] = deque()
+
+    def drain_one() -> None:
+        rows, errors, chunk_stats = pending.popleft().result()
+        for row in rows:
+            write_row(row)
+        if quarantine_row is not None:
+            for error in errors:
+                quarantine_row(error)
+        merge_stats(stats, chunk_stats)
+        stats["elapsedSeconds"] = time.perf_counter() - started
+        if progress is not None:
+            progress(stats)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk in _chunks(records, chunk_size):
+            pending.append(executor.submit(_process_chunk, kind, chunk))
+            if len(pending) >= max_pending:
+                drain_one()
+        while pending:
+            drain_one()
+
+    stats["elapsedSeconds"] = time.perf_counter() - started
+    return stats
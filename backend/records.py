@@ -0,0 +1,93 @@
+"""
+入力行（CSV / JSONL / HTTP の JSON）の読み取り
+
+列名は calculate_parttime_tax / calculate_freelance_tax の引数名に合わせる。空欄は未指定として
+既定値を使い、数値・真偽値は CSV の文字列（"1,000,000"・"はい" など）も受け付ける。
+一括計算（bulk_cli）と HTTP API（api）はどちらもここで行を読む。
+"""
+
+import math
+from typing import Dict, Optional
+
+
+def to_bool(value) -> bool:
+    """CSVの文字列などを真偽値に変換"""
+    if isinstance(value, bool):
+        return value
+    if value is None:
+        return False
+    text = str(value).strip().lower()
+    if text in ("1", "true", "yes", "y", "はい"):
+        return True
+    if text in ("", "0", "false", "no", "n", "いいえ"):
+        return False
+    raise ValueError(f"真偽値として解釈できません: {value!r}")
+
+
+def to_int(value) -> int:
+    """CSVの文字列などを整数に変換（"1,000,000" も可）"""
+    if isinstance(value, str):
+        value = value.replace(",", "").strip()
+        if "." not in value:
+            return int(value)
+        value = float(value)
+    if isinstance(value, float) and not math.isfinite(value):
+        raise ValueError(f"有限の数値ではありません: {value!r}")
+    return int(value)
+
+
+def optional_field(record: Dict, key: str, default=None):
+    """空欄を未指定として扱って値を取得"""
+    value = record.get(key)
+    return default if value is None or value == "" else value
+
+
+def parse_tax_year(record: Dict) -> Optional[int]:
+    """年分の列（空欄は既定の年分）"""
+    tax_year = optional_field(record, "tax_year")
+    return to_int(tax_year) if tax_year is not None else None
+
+
+def parse_parttime_record(record: Dict) -> Dict:
+    """
+    アルバイト・パートの入力行を calculate_parttime_tax の引数にする
+
+    Args:
+        record: 入力行（annual_income は必須）
+
+    Returns:
+        calculate_parttime_tax のキーワード引数（monthly_income は空欄なら None）
+    """
+    monthly_income = optional_field(record, "monthly_income")
+    return {
+        "age": to_int(optional_field(record, "age", 20)),
+        "annual_income": to_int(record["annual_income"]),
+        "monthly_income": to_int(monthly_income) if monthly_income is not None else None,
+        "is_student": to_bool(optional_field(record, "is_student", False)),
+        "dependent_type": optional_field(record, "dependent_type", "none"),
+        "company_size": optional_field(record, "company_size", "small"),
+        "weekly_hours": float(optional_field(record, "weekly_hours", 0)),
+        "tax_year": parse_tax_year(record)
+    }
+
+
+def parse_freelance_record(record: Dict) -> Dict:
+    """
+    業務委託の入力行を calculate_freelance_tax の引数にする
+
+    Args:
+        record: 入力行（annual_revenue は必須）
+
+    Returns:
+        calculate_freelance_tax のキーワード引数
+    """
+    return {
+        "age": to_int(optional_field(record, "age", 20)),
+        "annual_revenue": to_int(record["annual_revenue"]),
+        "annual_expense": to_int(optional_field(record, "annual_expense", 0)),
+        "is_student": to_bool(optional_field(record, "is_student", False)),
+        "dependent_type": optional_field(record, "dependent_type", "none"),
+        "tax_filing_type": optional_field(record, "tax_filing_type", "white"),
+        "business_type": optional_field(record, "business_type", "other"),
+        "tax_year": parse_tax_year(record)
+    }
@@ -0,0 +1,179 @@
+"""
+計算結果のキャッシュ（LRU方式・上限付き）
+
+同じ入力（年収100万円・103万円など丸い金額が多い）の再計算を省く。
+キャッシュした結果は読み取り専用にして共有する。
+"""
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Dict, Hashable, Mapping, Optional
+
+from .calculator_parttime import calculate_parttime_tax
+from .calculator_freelance import calculate_freelance_tax
+from .tax_rules import get_rules
+from .wall_index import freeze_record
+
+
+class ResultCache:
+    """
+    上限付きLRUキャッシュ
+
+    上限を超えると最も長く使われていない結果から削除する。
+    ヒット・ミス・削除の回数を記録し、stats() で参照できる。
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        """
+        Args:
+            maxsize: 保持する結果の上限件数
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize は1以上で指定してください")
+
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Mapping]" = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Dict]) -> Mapping:
+        """
+        キャッシュから結果を取得（なければ計算して登録）
+
+        Args:
+            key: 正規化済みの入力
+            compute: 結果を計算する関数
+
+        Returns:
+            読み取り専用の計算結果
+        """
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+            self.misses += 1
+
+        # 計算中はロックを持たない（同じキーを同時に計算した場合は後勝ち）
+        # 計算結果オブジェクト（results）は作った時点で読み取り専用のため、dict の結果だけ変換される
+        result = freeze_record(compute())
+
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+        return result
+
+    def clear(self) -> None:
+        """キャッシュと統計をリセット"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> Dict:
+        """
+        キャッシュの統計を取得
+
+        Returns:
+            ヒット数・ミス数・ヒット率・件数・削除数
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "evictions": self.evictions
+            }
+
+
+PARTTIME_CACHE = ResultCache()
+FREELANCE_CACHE = ResultCache()
+
+
+def cached_calculate_parttime_tax(
+    age: int,
+    annual_income: int,
+    monthly_income: Optional[int] = None,
+    is_student: bool = False,
+    dependent_type: str = "none",
+    company_size: str = "small",
+    weekly_hours: float = 0,
+    tax_year: Optional[int] = None
+) -> Mapping:
+    """
+    calculate_parttime_tax のキャッシュ付き版
+
+    引数は calculate_parttime_tax と同じ。結果は読み取り専用。
+    """
+    annual_income = int(annual_income)
+    # 月収未指定は年収から計算した値と同じキーにまとめる
+    monthly_income = annual_income // 12 if monthly_income is None else int(monthly_income)
+    key = (
+        int(age),
+        annual_income,
+        monthly_income,
+        bool(is_student),
+        str(dependent_type),
+        str(company_size),
+        float(weekly_hours),
+        get_rules(tax_year).year
+    )
+
+    return PARTTIME_CACHE.get_or_compute(
+        key, lambda: calculate_parttime_tax(*key)
+    )
+
+
+def cached_calculate_freelance_tax(
+    age: int,
+    annual_revenue: int,
+    annual_expense: int,
+    is_student: bool = False,
+    dependent_type: str = "none",
+    tax_filing_type: str = "white",
+    business_type: str = "other",
+    tax_year: Optional[int] = None
+) -> Mapping:
+    """
+    calculate_freelance_tax のキャッシュ付き版
+
+    引数は calculate_freelance_tax と同じ。結果は読み取り専用。
+    """
+    key = (
+        int(age),
+        int(annual_revenue),
+        int(annual_expense),
+        bool(is_student),
+        str(dependent_type),
+        str(tax_filing_type),
+        str(business_type),
+        get_rules(tax_year).year
+    )
+
+    return FREELANCE_CACHE.get_or_compute(
+        key, lambda: calculate_freelance_tax(*key)
+    )
+
+
+def get_cache_stats() -> Dict:
+    """
+    キャッシュの統計を取得
+
+    Returns:
+        計算タイプごとの統計
+    """
+    return {
+        "parttime": PARTTIME_CACHE.stats(),
+        "freelance": FREELANCE_CACHE.stats()
+    }
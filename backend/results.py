@@ -0,0 +1,460 @@
+"""
+計算結果の読み取り専用オブジェクト
+
+calculate_parttime_tax / calculate_freelance_tax / compare_blue_vs_white の結果を、
+入れ子の dict ではなく値のタプルと属性で保持する。これまでと同じ camelCase のキーで
+参照できる（result["netIncome"]、result["socialInsurance"]["total"] など）。
+作った後は属性を変更・削除できないため、キャッシュで共有しても呼び出し元どうしで影響しない。
+
+壁は索引（WallIndex）と超えた壁の数だけを持ち、超えた壁・次の壁・社会保険の内訳などの
+入れ子の値はキーを参照したときに作る。JSON にするときは to_dict() でこれまでと同じ形の
+dict に変換する。アドバイス文も決定表のコードだけを持ち、advice を参照したときに
+コードごとの関数で作る（backend.advice）。
+"""
+
+from collections.abc import Mapping
+from typing import Dict, Optional, Sequence, Tuple
+
+from .advice import render_freelance_advice, render_parttime_advice
+from .wall_index import WallIndex
+
+
+# 社会保険の加入要件（socialInsurance.conditions のキー。condition_values と同じ順）
+SOCIAL_INSURANCE_CONDITIONS = ("weeklyHours", "monthlyIncome", "employmentPeriod", "notStudent", "companySize")
+
+
+def _plain(value):
+    """to_dict() 用に組み込みの dict / list へ変換"""
+    if isinstance(value, _Result):
+        return value.to_dict()
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    return value
+
+
+def _field(i: int) -> property:
+    """値のタプルの i 番目を読むプロパティ"""
+    return property(lambda self: self._values[i])
+
+
+class _Result(Mapping):
+    """
+    camelCase のキーで参照できる計算結果
+
+    値は _FIELDS の順のタプル1つに持ち、同じ名前の属性（読み取り専用のプロパティ）で読む。
+    _KEYS にキー → 属性名を定義する。
+    """
+
+    __slots__ = ("_values",)
+
+    _FIELDS: Tuple[str, ...] = ()
+    _KEYS: Dict[str, str] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for i, name in enumerate(cls.__dict__.get("_FIELDS", ())):
+            setattr(cls, name, _field(i))
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError(f"{type(self).__name__} は読み取り専用のため変更できません")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} は読み取り専用のため変更できません")
+
+    @classmethod
+    def from_values(cls, values: tuple) -> "_Result":
+        """
+        値のタプル（_FIELDS の順）から作る（一部の値だけ差し替えた結果を作るときなど）
+
+        Args:
+            values: _FIELDS の順の値
+        """
+        result = object.__new__(cls)
+        object.__setattr__(result, "_values", values)
+        return result
+
+    def __reduce__(self):
+        # 既定の復元は属性を設定し直すため、値のタプルから作り直す
+        return type(self).from_values, (self._values,)
+
+    def __getitem__(self, key: str):
+        attribute = self._KEYS.get(key)
+        if attribute is None:
+            raise KeyError(key)
+        return getattr(self, attribute)
+
+    def __iter__(self):
+        return iter(self._KEYS)
+
+    def __len__(self) -> int:
+        return len(self._KEYS)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def to_dict(self) -> Dict:
+        """これまでの dict と同じ形に変換"""
+        return {key: _plain(self[key]) for key in self._KEYS}
+
+
+def _next_wall(wall_index: WallIndex, wall_level: int, income: int) -> Optional[Dict]:
+    """超えた壁の数から次の壁（残り金額つき）を作る"""
+    if wall_level == len(wall_index.amounts):
+        return None
+    return {
+        **wall_index.walls[wall_level],
+        "remaining": wall_index.amounts[wall_level] - income
+    }
+
+
+def _plain_next_wall(wall_index: WallIndex, wall_level: int, income: int) -> Optional[Dict]:
+    """to_dict() 用の次の壁（壁のレコードの impacts / conditions も組み込みの dict / list にする）"""
+    if wall_level == len(wall_index.amounts):
+        return None
+    record = wall_index.walls[wall_level]
+    # 壁のレコードの入れ子は impacts の dict と conditions のタプル（アルバイト・パート版のみ）だけ
+    wall = {**record, "impacts": dict(record["impacts"]), "remaining": wall_index.amounts[wall_level] - income}
+    if "conditions" in record:
+        wall["conditions"] = list(record["conditions"])
+    return wall
+
+
+class ParttimeResult(_Result):
+    """アルバイト・パート版の計算結果"""
+
+    __slots__ = ()
+
+    _FIELDS = (
+        "total_income",
+        "monthly_average",
+        "income_tax",
+        "resident_tax",
+        "social_insurance_required",
+        "social_insurance_type",
+        "health_insurance",
+        "pension_insurance",
+        "condition_values",
+        "net_income",
+        "wall_index",
+        "wall_level",
+        "advice_code"
+    )
+
+    _KEYS = {
+        "totalIncome": "total_income",
+        "monthlyAverage": "monthly_average",
+        "incomeTax": "income_tax",
+        "residentTax": "resident_tax",
+        "socialInsurance": "social_insurance",
+        "netIncome": "net_income",
+        "wallsExceeded": "walls_exceeded",
+        "nextWall": "next_wall",
+        "advice": "advice"
+    }
+
+    def __init__(
+        self,
+        total_income: int,
+        monthly_average: int,
+        income_tax: int,
+        resident_tax: int,
+        social_insurance_required: bool,
+        social_insurance_type: Optional[str],
+        health_insurance: int,
+        pension_insurance: int,
+        condition_values: Tuple[bool, ...],
+        net_income: int,
+        wall_index: WallIndex,
+        wall_level: int,
+        advice_code: int
+    ):
+        """
+        Args:
+            condition_values: 社会保険の加入要件の判定（SOCIAL_INSURANCE_CONDITIONS の順）
+            wall_index: 壁の索引
+            wall_level: 超えた壁の数
+            advice_code: アドバイスコード（advice.PT_*）
+            その他: calculate_parttime_tax の結果の各項目
+        """
+        object.__setattr__(self, "_values", (
+            total_income,
+            monthly_average,
+            income_tax,
+            resident_tax,
+            social_insurance_required,
+            social_insurance_type,
+            health_insurance,
+            pension_insurance,
+            condition_values,
+            net_income,
+            wall_index,
+            wall_level,
+            advice_code
+        ))
+
+    @property
+    def social_insurance(self) -> Dict:
+        """社会保険の加入判定と保険料の内訳"""
+        _, _, _, _, required, insurance_type, health, pension, condition_values = self._values[:9]
+        return {
+            "isRequired": required,
+            "type": insurance_type,
+            "healthInsurance": health,
+            "pensionInsurance": pension,
+            "total": health + pension,
+            "conditions": dict(zip(SOCIAL_INSURANCE_CONDITIONS, condition_values))
+        }
+
+    @property
+    def walls_exceeded(self) -> Tuple[Mapping, ...]:
+        """超えた壁の概要（金額・名前・影響）"""
+        return self.wall_index.summaries[:self.wall_level]
+
+    @property
+    def next_wall(self) -> Optional[Dict]:
+        """次の壁（残り金額つき）"""
+        return _next_wall(self.wall_index, self.wall_level, self.total_income)
+
+    @property
+    def advice(self) -> str:
+        """アドバイス文"""
+        return render_parttime_advice(
+            self.advice_code, self.total_income, self.wall_index.walls[:self.wall_level], self.next_wall
+        )
+
+    def to_dict(self) -> Dict:
+        """これまでの dict と同じ形に変換（属性から直接組み立てる）"""
+        values = self._values
+        total_income, wall_index, wall_level = values[0], values[10], values[11]
+        return {
+            "totalIncome": total_income,
+            "monthlyAverage": values[1],
+            "incomeTax": values[2],
+            "residentTax": values[3],
+            "socialInsurance": self.social_insurance,
+            "netIncome": values[9],
+            "wallsExceeded": [dict(summary) for summary in wall_index.summaries[:wall_level]],
+            "nextWall": _plain_next_wall(wall_index, wall_level, total_income),
+            "advice": self.advice
+        }
+
+
+class FilingComparison(_Result):
+    """申告種類ごとの所得・税額（青色vs白色の比較）"""
+
+    __slots__ = ()
+
+    _FIELDS = ("filing_types", "profit", "incomes", "taxes")
+
+    def __init__(self, filing_types: Sequence[str], profit: int, incomes: Tuple[int, ...], taxes: Tuple[int, ...]):
+        """
+        Args:
+            filing_types: 申告種類（"white" / "blue10" / "blue65" を含む）
+            profit: 売上−経費
+            incomes: 申告種類ごとの所得（filing_types の順）
+            taxes: 申告種類ごとの税額（所得税＋住民税）
+        """
+        object.__setattr__(self, "_values", (filing_types, profit, incomes, taxes))
+
+    def _tax(self, filing_type: str) -> int:
+        return self.taxes[self.filing_types.index(filing_type)]
+
+    def __getitem__(self, key: str):
+        if key == "savingsBlue10":
+            return self._tax("white") - self._tax("blue10")
+        if key == "savingsBlue65":
+            return self._tax("white") - self._tax("blue65")
+        try:
+            i = self.filing_types.index(key)
+        except ValueError:
+            raise KeyError(key) from None
+        return {"income": self.incomes[i], "tax": self.taxes[i], "netIncome": self.profit - self.taxes[i]}
+
+    def __iter__(self):
+        yield from self.filing_types
+        yield "savingsBlue10"
+        yield "savingsBlue65"
+
+    def __len__(self) -> int:
+        return len(self.filing_types) + 2
+
+    def __eq__(self, other) -> bool:
+        # 同じ型どうしは保持している値で比べる（入れ子の dict を作らない）
+        if isinstance(other, FilingComparison):
+            return self._values == other._values
+        return super().__eq__(other)
+
+    __hash__ = None
+
+    def to_dict(self) -> Dict:
+        filing_types, profit, incomes, taxes = self._values
+        result = {}
+        for filing_type, income, tax in zip(filing_types, incomes, taxes):
+            result[filing_type] = {"income": income, "tax": tax, "netIncome": profit - tax}
+        white = result["white"]["tax"]
+        result["savingsBlue10"] = white - result["blue10"]["tax"]
+        result["savingsBlue65"] = white - result["blue65"]["tax"]
+        return result
+
+
+class FreelanceResult(_Result):
+    """業務委託版の計算結果"""
+
+    __slots__ = ()
+
+    _FIELDS = (
+        "total_revenue",
+        "total_expense",
+        "expense_rate",
+        "industry_average_expense_rate",
+        "blue_filing_deduction",
+        "business_income",
+        "income_tax",
+        "resident_tax",
+        "business_tax",
+        "health_insurance",
+        "pension_insurance",
+        "student_pension_exemption",
+        "total_tax",
+        "total_insurance",
+        "net_income",
+        "wall_index",
+        "wall_level",
+        "blue_vs_white_comparison",
+        "remaining_expense_capacity",
+        "confirmation_required",
+        "advice_code"
+    )
+
+    _KEYS = {
+        "totalRevenue": "total_revenue",
+        "totalExpense": "total_expense",
+        "expenseRate": "expense_rate",
+        "industryAverageExpenseRate": "industry_average_expense_rate",
+        "blueFilingDeduction": "blue_filing_deduction",
+        "businessIncome": "business_income",
+        "incomeTax": "income_tax",
+        "residentTax": "resident_tax",
+        "businessTax": "business_tax",
+        "healthInsurance": "health_insurance",
+        "pensionInsurance": "pension_insurance",
+        "studentPensionExemption": "student_pension_exemption",
+        "totalTax": "total_tax",
+        "totalInsurance": "total_insurance",
+        "netIncome": "net_income",
+        "wallsExceeded": "walls_exceeded",
+        "nextWall": "next_wall",
+        "blueVsWhiteComparison": "blue_vs_white_comparison",
+        "remainingExpenseCapacity": "remaining_expense_capacity",
+        "confirmationRequired": "confirmation_required",
+        "advice": "advice"
+    }
+
+    def __init__(
+        self,
+        total_revenue: int,
+        total_expense: int,
+        expense_rate: float,
+        industry_average_expense_rate: float,
+        blue_filing_deduction: int,
+        business_income: int,
+        income_tax: int,
+        resident_tax: int,
+        business_tax: int,
+        health_insurance: int,
+        pension_insurance: int,
+        student_pension_exemption: bool,
+        total_tax: int,
+        total_insurance: int,
+        net_income: int,
+        wall_index: WallIndex,
+        wall_level: int,
+        blue_vs_white_comparison: FilingComparison,
+        remaining_expense_capacity: int,
+        confirmation_required: bool,
+        advice_code: int
+    ):
+        """
+        Args:
+            wall_index: 壁の索引（所得ベース）
+            wall_level: 超えた壁の数
+            advice_code: アドバイスコード（advice.FL_* の組み合わせ）
+            その他: calculate_freelance_tax の結果の各項目
+        """
+        object.__setattr__(self, "_values", (
+            total_revenue,
+            total_expense,
+            expense_rate,
+            industry_average_expense_rate,
+            blue_filing_deduction,
+            business_income,
+            income_tax,
+            resident_tax,
+            business_tax,
+            health_insurance,
+            pension_insurance,
+            student_pension_exemption,
+            total_tax,
+            total_insurance,
+            net_income,
+            wall_index,
+            wall_level,
+            blue_vs_white_comparison,
+            remaining_expense_capacity,
+            confirmation_required,
+            advice_code
+        ))
+
+    @property
+    def walls_exceeded(self) -> Tuple[Mapping, ...]:
+        """超えた壁の概要（金額・名前・影響）"""
+        return self.wall_index.summaries[:self.wall_level]
+
+    @property
+    def next_wall(self) -> Optional[Dict]:
+        """次の壁（残り金額つき）"""
+        return _next_wall(self.wall_index, self.wall_level, self.business_income)
+
+    @property
+    def advice(self) -> str:
+        """アドバイス文"""
+        return render_freelance_advice(
+            self.advice_code,
+            self.business_income,
+            self.wall_index.walls[:self.wall_level],
+            self.next_wall,
+            self.industry_average_expense_rate,
+            self.remaining_expense_capacity
+        )
+
+    def to_dict(self) -> Dict:
+        """これまでの dict と同じ形に変換（属性から直接組み立てる）"""
+        (total_revenue, total_expense, expense_rate, industry_average, blue_filing_deduction, business_income,
+         income_tax, resident_tax, business_tax, health_insurance, pension_insurance, student_pension_exemption,
+         total_tax, total_insurance, net_income, wall_index, wall_level, comparison, remaining_capacity,
+         confirmation_required, _) = self._values
+        return {
+            "totalRevenue": total_revenue,
+            "totalExpense": total_expense,
+            "expenseRate": expense_rate,
+            "industryAverageExpenseRate": industry_average,
+            "blueFilingDeduction": blue_filing_deduction,
+            "businessIncome": business_income,
+            "incomeTax": income_tax,
+            "residentTax": resident_tax,
+            "businessTax": business_tax,
+            "healthInsurance": health_insurance,
+            "pensionInsurance": pension_insurance,
+            "studentPensionExemption": student_pension_exemption,
+            "totalTax": total_tax,
+            "totalInsurance": total_insurance,
+            "netIncome": net_income,
+            "wallsExceeded": [dict(summary) for summary in wall_index.summaries[:wall_level]],
+            "nextWall": _plain_next_wall(wall_index, wall_level, business_income),
+            "blueVsWhiteComparison": comparison.to_dict(),
+            "remainingExpenseCapacity": remaining_capacity,
+            "confirmationRequired": confirmation_required,
+            "advice": self.advice
+        }
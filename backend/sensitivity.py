@@ -0,0 +1,246 @@
+"""
+業務委託版の感度分析（売上 × 経費率 × 申告種類 × 業種）
+
+売上・経費率・申告種類・業種の4軸の格子について、業務委託版の計算を一括計算エンジンで
+1回だけ実行し、軸ラベル付きの4次元配列として返す。取り出し（sel / isel）は
+配列のビューを返すだけで計算し直さない。
+"""
+
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .calculator_freelance import COMPARISON_FILING_TYPES
+from .calculator_batch import calculate_freelance_tax_batch, truncate_to_int
+from .tax_rules import get_rules
+
+
+# 軸の並び
+AXES = ("revenue", "expenseRate", "filingType", "businessType")
+
+# 既定で保持する項目
+DEFAULT_FIELDS = (
+    "netIncome",
+    "totalTax",
+    "totalInsurance",
+    "businessIncome",
+    "remainingExpenseCapacity"
+)
+
+# 既定の売上の格子（5万円刻みで1,000万円まで200点）
+DEFAULT_REVENUES = np.arange(1, 201, dtype=np.int64) * 50000
+
+# 既定の経費率の点数
+DEFAULT_EXPENSE_RATE_POINTS = 50
+
+
+def default_expense_rates(
+    business_types: Sequence[str],
+    points: int = DEFAULT_EXPENSE_RATE_POINTS,
+    tax_year: Optional[int] = None
+) -> np.ndarray:
+    """
+    業種の経費率の目安（rangeMin〜rangeMax）を覆う経費率の格子
+
+    Args:
+        business_types: 対象の業種
+        points: 点数
+        tax_year: 年分（省略時は tax_rules.DEFAULT_TAX_YEAR）
+
+    Returns:
+        経費率（%）の配列
+    """
+    industry_rates = get_rules(tax_year).expense_rates
+    rates = [industry_rates[business_type] for business_type in business_types]
+    low = min(rate["rangeMin"] for rate in rates)
+    high = max(rate["rangeMax"] for rate in rates)
+    return np.linspace(low, high, points)
+
+
+class SensitivityTensor:
+    """
+    軸ラベル付きの計算結果
+
+    data の各項目は dims の順に並んだ配列。sel / isel は配列のビューから
+    新しい SensitivityTensor を作るだけで、計算はし直さない。
+    """
+
+    __slots__ = ("dims", "coords", "data")
+
+    def __init__(self, dims: Tuple[str, ...], coords: Dict[str, np.ndarray], data: Dict[str, np.ndarray]):
+        """
+        Args:
+            dims: 軸の並び
+            coords: 軸 → ラベルの配列
+            data: 項目 → 配列（形は各軸のラベル数）
+        """
+        self.dims = dims
+        self.coords = coords
+        self.data = data
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        """配列の形"""
+        return tuple(len(self.coords[dim]) for dim in self.dims)
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        """保持している項目"""
+        return tuple(self.data)
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        return self.data[field]
+
+    def _label_index(self, dim: str, label):
+        """ラベルを添字に変換（スカラー・リスト・範囲のスライスに対応）"""
+        labels = self.coords[dim]
+        if isinstance(label, slice):
+            if label.step is not None:
+                raise ValueError("ラベルの範囲指定に刻み幅は使えません")
+            # 数値の軸は昇順に並んでいるため二分探索で範囲を求める（両端を含む）
+            if labels.dtype.kind in "iuf":
+                start = None if label.start is None else int(np.searchsorted(labels, label.start, side="left"))
+                stop = None if label.stop is None else int(np.searchsorted(labels, label.stop, side="right"))
+                return slice(start, stop)
+            positions = list(labels)
+            start = None if label.start is None else positions.index(label.start)
+            stop = None if label.stop is None else positions.index(label.stop) + 1
+            return slice(start, stop)
+        if isinstance(label, (list, tuple, np.ndarray)):
+            return [self._label_index(dim, item) for item in label]
+
+        matches = np.flatnonzero(labels == label)
+        if matches.size == 0:
+            raise KeyError(f"{dim} に {label!r} はありません")
+        return int(matches[0])
+
+    def isel(self, **indices) -> "SensitivityTensor":
+        """
+        添字で取り出す
+
+        整数を指定した軸はなくなり、スライス・リストを指定した軸は残る。
+
+        Args:
+            **indices: 軸名 → 整数・スライス・整数のリスト
+
+        Returns:
+            取り出した結果
+        """
+        unknown = set(indices) - set(self.dims)
+        if unknown:
+            raise KeyError(f"存在しない軸です: {', '.join(sorted(unknown))}")
+
+        dims = []
+        coords = {}
+        key = []
+        for dim in self.dims:
+            index = indices.get(dim, slice(None))
+            key.append(index)
+            if not isinstance(index, (int, np.integer)):
+                dims.append(dim)
+                coords[dim] = self.coords[dim][index]
+
+        # リストの添字が複数あると numpy は組で取り出すため、軸ごとに順に取り出す
+        data = {}
+        for field, values in self.data.items():
+            position = 0
+            for index in key:
+                values = values[(slice(None),) * position + (index,)]
+                if not isinstance(index, (int, np.integer)):
+                    position += 1
+            data[field] = values
+
+        return SensitivityTensor(tuple(dims), coords, data)
+
+    def sel(self, **labels) -> "SensitivityTensor":
+        """
+        ラベルで取り出す
+
+        Args:
+            **labels: 軸名 → ラベル・ラベルのリスト・ラベルの範囲（slice、両端を含む）
+
+        Returns:
+            取り出した結果
+        """
+        return self.isel(**{dim: self._label_index(dim, label) for dim, label in labels.items()})
+
+
+def build_sensitivity_tensor(
+    revenues: Optional[Sequence[int]] = None,
+    expense_rates: Optional[Sequence[float]] = None,
+    filing_types: Sequence[str] = COMPARISON_FILING_TYPES,
+    business_types: Optional[Sequence[str]] = None,
+    is_student: bool = False,
+    fields: Sequence[str] = DEFAULT_FIELDS,
+    tax_year: Optional[int] = None
+) -> SensitivityTensor:
+    """
+    売上 × 経費率 × 申告種類 × 業種 の格子で業務委託版の計算を一括実行
+
+    経費は int(売上 × 経費率 / 100) とする。
+
+    Args:
+        revenues: 売上（円）の格子（省略時は5万円刻みで1,000万円まで）
+        expense_rates: 経費率（%）の格子（省略時は業種の rangeMin〜rangeMax を覆う50点）
+        filing_types: 申告種類
+        business_types: 業種（省略時はその年分のルールの全業種）
+        is_student: 学生かどうか
+        fields: 保持する項目（calculate_freelance_tax_batch の列名）
+        tax_year: 年分（省略時は tax_rules.DEFAULT_TAX_YEAR）
+
+    Returns:
+        軸ラベル付きの計算結果。項目 "inIndustryRange" は経費率が業種の目安の範囲内かどうか
+    """
+    industry_rates = get_rules(tax_year).expense_rates
+    business_types = tuple(business_types or industry_rates)
+    revenues = DEFAULT_REVENUES if revenues is None else np.asarray(revenues, dtype=np.int64)
+    if expense_rates is None:
+        expense_rates = default_expense_rates(business_types, tax_year=tax_year)
+    expense_rates = np.asarray(expense_rates, dtype=np.float64)
+    filing_types = tuple(filing_types)
+
+    shape = (len(revenues), len(expense_rates), len(filing_types), len(business_types))
+
+    # 4軸の格子を平らにして一括計算
+    revenue_grid = revenues[:, None, None, None]
+    expense_grid = truncate_to_int(revenue_grid * expense_rates[None, :, None, None] / 100)
+    columns = calculate_freelance_tax_batch(
+        annual_revenue=np.broadcast_to(revenue_grid, shape).ravel(),
+        annual_expense=np.broadcast_to(expense_grid, shape).ravel(),
+        tax_filing_type=np.broadcast_to(np.array(filing_types)[None, None, :, None], shape).ravel(),
+        business_type=np.broadcast_to(np.array(business_types)[None, None, None, :], shape).ravel(),
+        is_student=is_student,
+        tax_year=tax_year
+    )
+    data = {field: columns[field].reshape(shape) for field in fields}
+
+    # 経費率が業種の目安の範囲内かどうか（経費率 × 業種 の表を全軸に広げる）
+    range_min = np.array([industry_rates[business_type]["rangeMin"] for business_type in business_types])
+    range_max = np.array([industry_rates[business_type]["rangeMax"] for business_type in business_types])
+    in_range = (expense_rates[:, None] >= range_min[None, :]) & (expense_rates[:, None] <= range_max[None, :])
+    data["inIndustryRange"] = np.broadcast_to(in_range[None, :, None, :], shape)
+
+    coords = {
+        "revenue": revenues,
+        "expenseRate": expense_rates,
+        "filingType": np.array(filing_types),
+        "businessType": np.array(business_types)
+    }
+    return SensitivityTensor(AXES, coords, data)
+
+
+if __name__ == "__main__":
+    # テスト実行
+    import time
+
+    started = time.perf_counter()
+    tensor = build_sensitivity_tensor()
+    elapsed = time.perf_counter() - started
+
+    print("=== 感度分析 ===")
+    print(f"軸: {', '.join(f'{dim}={size}' for dim, size in zip(tensor.dims, tensor.shape))}（{elapsed * 1000:.0f}ms）")
+
+    heatmap = tensor.sel(filingType="blue65", businessType="designer", revenue=slice(3000000, 3200000))
+    print(f"デザイナー・青色65万円・売上300〜320万円: {heatmap.dims} {heatmap.shape}")
+    for revenue, row in zip(heatmap.coords["revenue"], heatmap["netIncome"]):
+        print(f"売上 {revenue:,}円: 手取り {row[0]:,}〜{row[-1]:,}円")
@@ -0,0 +1,426 @@
+"""
+年分ごとの税制ルール
+
+控除額・保険料・判定基準・収入の壁を年分（tax year）ごとに定義し、初めて使うときに
+1回だけ税率表（PiecewiseLinearSchedule）や壁の索引へ変換して保持する。
+get_rules() は変換済みのルールを辞書から引くだけなので、年分の切り替えは O(1)。
+
+変換済みの全年分は `python -m backend.tax_rules --build-snapshot` で data/rules_snapshot.marshal に
+保存し、リポジトリに含めて配布する。初回の get_rules() はその年分だけをスナップショットから
+復元し、壁のマスターデータ（walls_data）の読み込みと変換を省く。定義を変えたら RULES_VERSION を
+上げて作り直す（版の違うスナップショットは使わない）。環境変数 TAXCHECK_RULE_SNAPSHOT=0 で無効にできる。
+"""
+
+import marshal
+import os
+from typing import TYPE_CHECKING, Dict, Mapping, Optional, Tuple, Union
+
+from .tax_schedule import PiecewiseLinearSchedule, INCOME_TAX_SCHEDULE, EMPLOYMENT_INCOME_DEDUCTION_SCHEDULE
+
+if TYPE_CHECKING:
+    from .wall_index import WallIndex
+
+
+# 年分を省略したときのルール
+DEFAULT_TAX_YEAR = 2024
+
+# 申告種類ごとの青色申告特別控除
+BLUE_FILING_DEDUCTIONS = {
+    "white": 0,
+    "blue10": 100000,
+    "blue55": 550000,  # 65万円控除の要件のうち e-Tax・電子帳簿保存を満たさない場合
+    "blue65": 650000
+}
+
+
+def _steps(*steps: Tuple[int, int]) -> Dict:
+    """
+    (上限, 控除額) の階段を区分線形の表の定義にする（最後の上限を超えると0円）
+
+    扶養親族・配偶者の合計所得に応じて段階的に減る控除に使う。上限はその値を含む。
+    """
+    return {
+        "thresholds": [limit for limit, _ in steps],
+        "slopes": [0] * (len(steps) + 1),
+        "intercepts": [amount for _, amount in steps] + [0]
+    }
+
+
+# 配偶者特別控除の階段（配偶者の合計所得133万円まで。95万円以下は配偶者控除と同じ38万円）
+_SPOUSE_SPECIAL_STEPS = (
+    (950000, 380000),
+    (1000000, 360000),
+    (1050000, 310000),
+    (1100000, 260000),
+    (1150000, 210000),
+    (1200000, 160000),
+    (1250000, 110000),
+    (1300000, 60000),
+    (1330000, 30000)
+)
+_RESIDENT_SPOUSE_SPECIAL_STEPS = ((1000000, 330000),) + _SPOUSE_SPECIAL_STEPS[2:]
+
+# 年分ごとの定義（区分線形の表は PiecewiseLinearSchedule か thresholds / slopes / intercepts の dict）
+RULE_DEFINITIONS: Dict[int, Dict] = {
+    2024: {
+        "incomeTax": INCOME_TAX_SCHEDULE,
+        "employmentIncomeDeduction": EMPLOYMENT_INCOME_DEDUCTION_SCHEDULE,
+        # 基礎控除（合計所得 → 控除額）
+        "basicDeduction": {
+            "thresholds": [],
+            "slopes": [0],
+            "intercepts": [480000]
+        },
+        "residentBasicDeduction": 430000,
+        "studentDeduction": 270000,
+        "studentDeductionIncomeLimit": 750000,
+        "blueFilingDeductions": BLUE_FILING_DEDUCTIONS,
+        "nationalPensionMonthly": 16980,
+        "socialInsuranceMonthlyThreshold": 88000,
+        # 106万円の壁の対象になる企業規模（101人以上）
+        "socialInsuranceCompanySizes": ["large"],
+        "dependentInsuranceThreshold": 1300000,
+        "studentPensionExemptionLimit": 1180000,
+        # アドバイス文（generate_advice / generate_advice_freelance）がこの年分の壁に対応しているか
+        "detailedAdvice": True,
+        # 親が受ける扶養控除（子の合計所得 → 控除額。特定は19〜22歳、住民税は別の額）
+        "dependentDeduction": _steps((480000, 380000)),
+        "specificDependentDeduction": _steps((480000, 630000)),
+        "residentDependentDeduction": _steps((480000, 330000)),
+        "residentSpecificDependentDeduction": _steps((480000, 450000)),
+        # 配偶者控除・配偶者特別控除（配偶者の合計所得 → 控除額。納税者の合計所得900万円以下の額）
+        "spouseDeduction": _steps((480000, 380000), *_SPOUSE_SPECIAL_STEPS),
+        "residentSpouseDeduction": _steps((480000, 330000), *_RESIDENT_SPOUSE_SPECIAL_STEPS),
+        # 配偶者控除の納税者の所得の区分（900万円以下は満額、950万円・1,000万円以下は2/3・1/3）
+        "spouseDeductionIncomeLimits": [9000000, 9500000, 10000000]
+    },
+    2025: {
+        "incomeTax": INCOME_TAX_SCHEDULE,
+        # 最低保障額65万円（年収190万円まで）
+        "employmentIncomeDeduction": {
+            "thresholds": [1900000, 3600000, 6600000, 8500000],
+            "slopes": [0, 0.3, 0.2, 0.1, 0],
+            "intercepts": [650000, 80000, 440000, 1100000, 1950000]
+        },
+        # 合計所得132万円以下は95万円、以降は段階的に58万円まで
+        "basicDeduction": {
+            "thresholds": [1320000, 3360000, 4890000, 6550000],
+            "slopes": [0, 0, 0, 0, 0],
+            "intercepts": [950000, 880000, 680000, 630000, 580000]
+        },
+        "residentBasicDeduction": 430000,
+        "studentDeduction": 270000,
+        "studentDeductionIncomeLimit": 850000,
+        "blueFilingDeductions": BLUE_FILING_DEDUCTIONS,
+        "nationalPensionMonthly": 17510,
+        "socialInsuranceMonthlyThreshold": 88000,
+        # 51人以上
+        "socialInsuranceCompanySizes": ["medium", "large"],
+        "dependentInsuranceThreshold": 1300000,
+        "studentPensionExemptionLimit": 1180000,
+        "detailedAdvice": False,
+        # 扶養親族の所得要件は58万円。19〜22歳は58万円を超えても123万円まで特定親族特別控除で段階的に減る
+        "dependentDeduction": _steps((580000, 380000)),
+        "specificDependentDeduction": _steps(
+            (850000, 630000), (900000, 610000), (950000, 510000), (1000000, 410000), (1050000, 310000),
+            (1100000, 210000), (1150000, 110000), (1200000, 60000), (1230000, 30000)
+        ),
+        "residentDependentDeduction": _steps((580000, 330000)),
+        "residentSpecificDependentDeduction": _steps(
+            (950000, 450000), (1000000, 410000), (1050000, 310000), (1100000, 210000),
+            (1150000, 110000), (1200000, 60000), (1230000, 30000)
+        ),
+        "spouseDeduction": _steps((580000, 380000), *_SPOUSE_SPECIAL_STEPS),
+        "residentSpouseDeduction": _steps((580000, 330000), *_RESIDENT_SPOUSE_SPECIAL_STEPS),
+        "spouseDeductionIncomeLimits": [9000000, 9500000, 10000000]
+    }
+}
+
+
+def _compile_schedule(definition: Union[PiecewiseLinearSchedule, Mapping]) -> PiecewiseLinearSchedule:
+    """区分線形の表の定義を PiecewiseLinearSchedule にする"""
+    if isinstance(definition, PiecewiseLinearSchedule):
+        return definition
+    return PiecewiseLinearSchedule(**definition)
+
+
+class TaxRules:
+    """1年分の税制ルール（変換済み）"""
+
+    __slots__ = (
+        "year",
+        "income_tax",
+        "employment_income_deduction",
+        "basic_deduction",
+        "resident_basic_deduction",
+        "student_deduction",
+        "student_deduction_income_limit",
+        "blue_filing_deductions",
+        "national_pension_annual",
+        "social_insurance_monthly_threshold",
+        "social_insurance_company_sizes",
+        "dependent_insurance_threshold",
+        "student_pension_exemption_limit",
+        "detailed_advice",
+        "dependent_deduction",
+        "specific_dependent_deduction",
+        "resident_dependent_deduction",
+        "resident_specific_dependent_deduction",
+        "spouse_deduction",
+        "resident_spouse_deduction",
+        "spouse_deduction_income_limits",
+        "walls",
+        "expense_rates"
+    )
+
+    def __init__(self, year: int, definition: Mapping):
+        """
+        Args:
+            year: 年分
+            definition: RULE_DEFINITIONS の1年分
+        """
+        self.year = year
+        self.income_tax = _compile_schedule(definition["incomeTax"])
+        self.employment_income_deduction = _compile_schedule(definition["employmentIncomeDeduction"])
+        self.basic_deduction = _compile_schedule(definition["basicDeduction"])
+        self.resident_basic_deduction: int = definition["residentBasicDeduction"]
+        self.student_deduction: int = definition["studentDeduction"]
+        self.student_deduction_income_limit: int = definition["studentDeductionIncomeLimit"]
+        self.blue_filing_deductions: Dict[str, int] = dict(definition["blueFilingDeductions"])
+        self.national_pension_annual: int = definition["nationalPensionMonthly"] * 12
+        self.social_insurance_monthly_threshold: int = definition["socialInsuranceMonthlyThreshold"]
+        self.social_insurance_company_sizes: Tuple[str, ...] = tuple(definition["socialInsuranceCompanySizes"])
+        self.dependent_insurance_threshold: int = definition["dependentInsuranceThreshold"]
+        self.student_pension_exemption_limit: int = definition["studentPensionExemptionLimit"]
+        self.detailed_advice: bool = definition["detailedAdvice"]
+        self.dependent_deduction = _compile_schedule(definition["dependentDeduction"])
+        self.specific_dependent_deduction = _compile_schedule(definition["specificDependentDeduction"])
+        self.resident_dependent_deduction = _compile_schedule(definition["residentDependentDeduction"])
+        self.resident_specific_dependent_deduction = _compile_schedule(definition["residentSpecificDependentDeduction"])
+        self.spouse_deduction = _compile_schedule(definition["spouseDeduction"])
+        self.resident_spouse_deduction = _compile_schedule(definition["residentSpouseDeduction"])
+        self.spouse_deduction_income_limits: Tuple[int, ...] = tuple(definition["spouseDeductionIncomeLimits"])
+
+        # 壁のマスターデータは変換するときだけ読み込む
+        from .walls_data import EXPENSE_RATES_BY_BUSINESS, freeze_record, get_wall_index
+
+        self.walls: Dict[str, "WallIndex"] = {
+            wall_type: get_wall_index(wall_type, year) for wall_type in ("parttime", "freelance")
+        }
+        self.expense_rates: Mapping[str, Mapping] = freeze_record(EXPENSE_RATES_BY_BUSINESS)
+
+    def to_snapshot(self) -> Dict:
+        """スナップショット用の表現（marshal で保存できる組み込み型だけにする）"""
+        state = {}
+        for name in self.__slots__:
+            value = getattr(self, name)
+            if isinstance(value, PiecewiseLinearSchedule):
+                value = value.__getstate__()
+            elif name == "walls":
+                value = {wall_type: _thaw(index.walls) for wall_type, index in value.items()}
+            else:
+                value = _thaw(value)
+            state[name] = value
+        return state
+
+    def fingerprint(self) -> int:
+        """ルールの内容のチェックサム（事前計算したデータがこのルールで作られたかの確認用）"""
+        import zlib
+
+        return zlib.crc32(repr(self.to_snapshot()).encode())
+
+    @classmethod
+    def from_snapshot(cls, state: Mapping) -> "TaxRules":
+        """to_snapshot() の表現から作り直す（定義の検証と並べ替えは済んでいるため省く）"""
+        from .wall_index import WallIndex, freeze_record
+
+        rules = cls.__new__(cls)
+        for name in cls.__slots__:
+            value = state[name]
+            if name in _SCHEDULE_FIELDS:
+                schedule = PiecewiseLinearSchedule.__new__(PiecewiseLinearSchedule)
+                schedule.__setstate__(value)
+                value = schedule
+            elif name == "walls":
+                walls = {}
+                for wall_type, records in value.items():
+                    index = WallIndex.__new__(WallIndex)
+                    records = freeze_record(records)
+                    index.__setstate__((records, tuple(wall["amount"] for wall in records)))
+                    walls[wall_type] = index
+                value = walls
+            elif name == "expense_rates":
+                value = freeze_record(value)
+            elif name in ("spouse_deduction_income_limits", "social_insurance_company_sizes"):
+                value = tuple(value)
+            setattr(rules, name, value)
+        return rules
+
+
+# PiecewiseLinearSchedule を持つ項目
+_SCHEDULE_FIELDS = (
+    "income_tax",
+    "employment_income_deduction",
+    "basic_deduction",
+    "dependent_deduction",
+    "specific_dependent_deduction",
+    "resident_dependent_deduction",
+    "resident_specific_dependent_deduction",
+    "spouse_deduction",
+    "resident_spouse_deduction"
+)
+
+
+def _thaw(value):
+    """読み取り専用のレコードを組み込み型に戻す（FrozenRecord → dict, tuple → list）"""
+    if isinstance(value, dict):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_thaw(item) for item in value]
+    return value
+
+
+# 年分 → 変換済みのルール（初回の利用時に作る）
+_COMPILED: Dict[int, TaxRules] = {}
+
+# 変換済みのルールのスナップショット（リポジトリに含めて配布する）
+SNAPSHOT_PATH = os.path.join(os.path.dirname(__file__), "data", "rules_snapshot.marshal")
+
+# スナップショットの形式（TaxRules の項目を変えたら上げる）
+_SNAPSHOT_FORMAT = 4
+
+# ルールの定義の版（このファイル・tax_schedule・walls_data・wall_index の内容を変えたら上げて、
+# `python -m backend.tax_rules --build-snapshot` で作り直す。--check-snapshot で一致を確認できる）
+RULES_VERSION = 1
+
+# 年分 → スナップショットの marshal 済みのルール（使う年分だけ読み込む。None は未読み込み）
+_snapshot_years: Optional[Dict[int, bytes]] = None
+
+# スナップショットを読み込もうとしたかどうか（読み込みはプロセスごとに1回）
+_snapshot_checked = False
+
+
+def build_snapshot(path: str = SNAPSHOT_PATH) -> str:
+    """
+    全年分のルールを変換してスナップショットに保存
+
+    年分ごとに marshal し、読み込むときは使う年分だけを復元する。
+
+    Args:
+        path: 保存先
+
+    Returns:
+        保存先
+    """
+    snapshot = {
+        "format": _SNAPSHOT_FORMAT,
+        "version": RULES_VERSION,
+        "rules": {
+            year: marshal.dumps(TaxRules(year, definition).to_snapshot())
+            for year, definition in RULE_DEFINITIONS.items()
+        }
+    }
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # 読み込み中のプロセスが途中までのファイルを読まないよう、書き終えてから置き換える
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as f:
+        marshal.dump(snapshot, f)
+    os.replace(temporary, path)
+    return path
+
+
+def check_snapshot(path: str = SNAPSHOT_PATH) -> Tuple[int, ...]:
+    """
+    スナップショットが今の定義から変換したルールと一致するか確認
+
+    Args:
+        path: スナップショット
+
+    Returns:
+        一致しない（またはスナップショットにない）年分。RULES_VERSION が違う場合は全年分
+    """
+    years = _read_snapshot(path) or {}
+    return tuple(
+        year for year, definition in sorted(RULE_DEFINITIONS.items())
+        if year not in years or marshal.loads(years[year]) != TaxRules(year, definition).to_snapshot()
+    )
+
+
+def _read_snapshot(path: str = SNAPSHOT_PATH) -> Optional[Dict[int, bytes]]:
+    """スナップショットの年分ごとのルール（ないか、形式・定義の版が違う場合は None）"""
+    try:
+        with open(path, "rb") as f:
+            snapshot = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        # ないか壊れている場合は変換し直す
+        return None
+    if (
+        not isinstance(snapshot, dict)
+        or snapshot.get("format") != _SNAPSHOT_FORMAT
+        or snapshot.get("version") != RULES_VERSION
+    ):
+        return None
+    return snapshot["rules"]
+
+
+def _snapshot_rules(year: int) -> Optional[TaxRules]:
+    """スナップショットから年分のルールを復元（スナップショットを使わない・ない場合は None）"""
+    global _snapshot_checked, _snapshot_years
+    if not _snapshot_checked:
+        _snapshot_checked = True
+        if os.environ.get("TAXCHECK_RULE_SNAPSHOT", "") != "0":
+            _snapshot_years = _read_snapshot()
+
+    state = _snapshot_years.get(year) if _snapshot_years else None
+    return None if state is None else TaxRules.from_snapshot(marshal.loads(state))
+
+
+def get_rules(tax_year: Optional[int] = None) -> TaxRules:
+    """
+    年分のルールを取得
+
+    Args:
+        tax_year: 年分（省略時は DEFAULT_TAX_YEAR）
+
+    Returns:
+        変換済みのルール
+    """
+    year = DEFAULT_TAX_YEAR if tax_year is None else tax_year
+    rules = _COMPILED.get(year)
+    if rules is None:
+        if year not in RULE_DEFINITIONS:
+            raise ValueError(f"対応していない年分です: {tax_year}")
+        rules = _snapshot_rules(year) or TaxRules(year, RULE_DEFINITIONS[year])
+        rules = _COMPILED.setdefault(year, rules)
+    return rules
+
+
+def available_tax_years() -> Tuple[int, ...]:
+    """対応している年分"""
+    return tuple(sorted(RULE_DEFINITIONS))
+
+
+if __name__ == "__main__":
+    import sys
+
+    if "--build-snapshot" in sys.argv[1:]:
+        print(f"スナップショットを保存しました: {build_snapshot()}")
+        sys.exit(0)
+    if "--check-snapshot" in sys.argv[1:]:
+        stale = check_snapshot()
+        if stale:
+            print(f"スナップショットが定義と一致しません: {list(stale)}（RULES_VERSION を上げて --build-snapshot で作り直してください）")
+            sys.exit(1)
+        print("スナップショットは定義と一致しています")
+        sys.exit(0)
+
+    # テスト実行
+    print("=== 年分ごとのルール ===")
+    for year in available_tax_years():
+        rules = get_rules(year)
+        no_tax = rules.employment_income_deduction(0) + rules.basic_deduction(0)
+        print(
+            f"{year}年分: 基礎控除 {rules.basic_deduction(0):,}円 / 給与所得控除の最低額 "
+            f"{rules.employment_income_deduction(0):,}円 / 所得税がかからない年収 {no_tax:,}円 / "
+            f"壁 {', '.join(wall['name'] for wall in rules.walls['parttime'].walls)}"
+        )
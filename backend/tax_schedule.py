@@ -0,0 +1,118 @@
+"""
+区分線形の税率表（所得税の速算表・給与所得控除など）
+"""
+
+from bisect import bisect_left
+from math import lcm
+from typing import Sequence, Tuple
+
+from .fixed_point import as_rate, div_trunc
+
+
+class PiecewiseLinearSchedule:
+    """
+    区分線形の税率表
+
+    thresholds[i] 以下の区間で x * slopes[i] + intercepts[i] を0方向へ切り捨てた値を返す。
+    最後の閾値を超える区間は slopes[-1] / intercepts[-1] を使う。
+    スカラーは二分探索、配列は searchsorted で区間を引く。配列は傾き・切片を10進の表記どおりの
+    有理数として整数（int64）だけで計算する（浮動小数点の丸めによる1円のずれが出ない）。
+    """
+
+    __slots__ = ("thresholds", "slopes", "intercepts", "_arrays")
+
+    def __init__(
+        self,
+        thresholds: Sequence[int],
+        slopes: Sequence[float],
+        intercepts: Sequence[float]
+    ):
+        """
+        Args:
+            thresholds: 各区間の上限（昇順・その値を含む）
+            slopes: 各区間の傾き（len(thresholds) + 1 個）
+            intercepts: 各区間の切片（len(thresholds) + 1 個）
+        """
+        if len(slopes) != len(thresholds) + 1 or len(intercepts) != len(thresholds) + 1:
+            raise ValueError("slopes と intercepts は thresholds より1つ多く指定してください")
+        if list(thresholds) != sorted(thresholds):
+            raise ValueError("thresholds は昇順で指定してください")
+
+        self.thresholds: Tuple[int, ...] = tuple(thresholds)
+        self.slopes: Tuple[float, ...] = tuple(float(slope) for slope in slopes)
+        self.intercepts: Tuple[float, ...] = tuple(float(intercept) for intercept in intercepts)
+        self._arrays = None
+
+    def __getstate__(self):
+        # numpy の配列はキャッシュのため保存しない（スナップショットの読み込みで numpy を使わない）
+        return self.thresholds, self.slopes, self.intercepts
+
+    def __setstate__(self, state):
+        self.thresholds, self.slopes, self.intercepts = state
+        self._arrays = None
+
+    def segment_index(self, x: int) -> int:
+        """x が属する区間のインデックス"""
+        return bisect_left(self.thresholds, x)
+
+    def __call__(self, x: int) -> int:
+        """スカラーを評価"""
+        i = bisect_left(self.thresholds, x)
+        return int(x * self.slopes[i] + self.intercepts[i])
+
+    def fixed_point(self) -> Tuple[int, Tuple[int, ...], Tuple[int, ...]]:
+        """
+        整数だけで評価するための係数
+
+        Returns:
+            (共通の分母, 各区間の傾き×分母, 各区間の切片×分母)
+        """
+        slopes = [as_rate(slope) for slope in self.slopes]
+        intercepts = [as_rate(intercept) for intercept in self.intercepts]
+        denominator = lcm(*(rate[1] for rate in slopes + intercepts))
+        return (
+            denominator,
+            tuple(numerator * (denominator // rate_denominator) for numerator, rate_denominator in slopes),
+            tuple(numerator * (denominator // rate_denominator) for numerator, rate_denominator in intercepts)
+        )
+
+    def evaluate_array(self, x):
+        """
+        配列を一括評価
+
+        Args:
+            x: 整数の配列
+
+        Returns:
+            評価結果（int64 の配列）
+        """
+        import numpy as np
+
+        if self._arrays is None:
+            denominator, numerators, offsets = self.fixed_point()
+            self._arrays = (
+                np.array(self.thresholds, dtype=np.int64),
+                np.array(numerators, dtype=np.int64),
+                np.array(offsets, dtype=np.int64),
+                denominator
+            )
+        thresholds, numerators, offsets, denominator = self._arrays
+
+        x = np.asarray(x, dtype=np.int64)
+        i = np.searchsorted(thresholds, x, side="left")
+        return div_trunc(x * numerators[i] + offsets[i], denominator)
+
+
+# 所得税の速算表（課税所得 → 所得税額）
+INCOME_TAX_SCHEDULE = PiecewiseLinearSchedule(
+    thresholds=[0, 1950000, 3300000, 6950000, 9000000],
+    slopes=[0, 0.05, 0.10, 0.20, 0.23, 0.33],
+    intercepts=[0, 0, -97500, -427500, -636000, -1536000]
+)
+
+# 給与所得控除（年収 → 控除額）
+EMPLOYMENT_INCOME_DEDUCTION_SCHEDULE = PiecewiseLinearSchedule(
+    thresholds=[1625000, 1800000, 3600000, 6600000, 8500000],
+    slopes=[0, 0.4, 0.3, 0.2, 0.1, 0],
+    intercepts=[550000, -100000, 80000, 440000, 1100000, 1950000]
+)
@@ -0,0 +1,172 @@
+"""
+年末までに収入の壁を超える確率（モンテカルロ法）
+
+入力済みの月の収入はそのまま使い、未入力の月の収入を変動のモデルから乱数で引いて
+年末までの累計の経路を数万本まとめて作る（経路 × 月の配列で一括計算）。壁ごとに
+年末の累計が壁を超える確率、超える月の期待値、各月末までに超えている確率を求める。
+
+変動のモデル:
+    "lognormal"  月収は入力済みの月の平均を平均とする対数正規分布（volatility は月収の変動係数）
+    "bootstrap"  入力済みの月の収入から重複を許して引く
+
+IncomeTracker.projected_crossings() が平均のペースで超える月を1つ予測するのに対し、
+収入のぶれを含めた確率を返す。
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .tax_rules import get_rules
+
+
+# 変動のモデル
+MODELS = ("lognormal", "bootstrap")
+
+# 既定の経路の本数
+DEFAULT_PATHS = 20000
+
+# 入力済みの月が少なく変動係数を推定しない場合の月収の変動係数
+DEFAULT_VOLATILITY = 0.25
+
+# 変動係数を入力済みの月から推定するのに必要な月数
+MIN_MONTHS_FOR_VOLATILITY = 3
+
+
+def _first_crossing(reached: np.ndarray) -> np.ndarray:
+    """月末の累計が壁以上の月のうち最初の月（1〜12。経路 × 壁）"""
+    return reached.argmax(axis=1) + 1
+
+
+def simulate_wall_crossings(
+    monthly_incomes: Sequence[Optional[int]],
+    wall_type: str = "parttime",
+    tax_year: Optional[int] = None,
+    volatility: Optional[float] = None,
+    model: str = "lognormal",
+    paths: int = DEFAULT_PATHS,
+    deduction: int = 0,
+    monthly_mean: Optional[int] = None,
+    seed: Optional[int] = None
+) -> Dict:
+    """
+    年末までに各壁を超える確率と超える月をシミュレーション
+
+    Args:
+        monthly_incomes: 1〜12月の収入（None は未入力＝これから乱数で引く月）。業務委託版は売上−経費
+        wall_type: "parttime" または "freelance"
+        tax_year: 年分（省略時は tax_rules.DEFAULT_TAX_YEAR）
+        volatility: 月収の変動係数（標準偏差 / 平均。省略時は入力済みの月から推定、
+            入力済みの月が MIN_MONTHS_FOR_VOLATILITY 未満なら DEFAULT_VOLATILITY）
+        model: 変動のモデル（"lognormal" | "bootstrap"）
+        paths: 経路の本数
+        deduction: 壁と比べる前に累計から引く額（業務委託版の青色申告特別控除など）
+        monthly_mean: 未入力の月の平均月収（省略時は入力済みの月の平均）
+        seed: 乱数のシード（同じ入力で同じ結果にする場合に指定）
+
+    Returns:
+        壁ごとの確率（walls）と年間収入の分布（annual）。walls の各要素は
+        amount, name, alreadyExceeded, probability（年末に超えている確率）,
+        expectedMonth（超える経路での超える月の平均）, byMonth（各月末までに超えている確率）
+    """
+    if len(monthly_incomes) != 12:
+        raise ValueError("monthly_incomes は1〜12月の12か月分を指定してください")
+    if model not in MODELS:
+        raise ValueError(f"model は {' / '.join(MODELS)} のいずれかを指定してください: {model!r}")
+    if paths <= 0:
+        raise ValueError("paths は1以上で指定してください")
+
+    rules = get_rules(tax_year)
+    wall_index = rules.walls["parttime" if wall_type == "parttime" else "freelance"]
+
+    entered = np.array([amount is not None for amount in monthly_incomes])
+    entered_values = np.array([amount for amount in monthly_incomes if amount is not None], dtype=np.float64)
+    future_months = int((~entered).sum())
+
+    if monthly_mean is None:
+        if not entered_values.size:
+            raise ValueError("入力済みの月がない場合は monthly_mean を指定してください")
+        monthly_mean = float(entered_values.mean())
+    if volatility is None:
+        volatility = (
+            float(entered_values.std(ddof=1) / entered_values.mean())
+            if entered_values.size >= MIN_MONTHS_FOR_VOLATILITY and entered_values.mean() > 0
+            else DEFAULT_VOLATILITY
+        )
+
+    # 経路 × 月の収入（入力済みの月は全経路で同じ値）
+    rng = np.random.default_rng(seed)
+    incomes = np.empty((paths, 12), dtype=np.float64)
+    incomes[:, entered] = entered_values
+    if future_months:
+        if model == "bootstrap":
+            if not entered_values.size:
+                raise ValueError("bootstrap は入力済みの月が1か月以上必要です")
+            draws = rng.choice(entered_values, size=(paths, future_months))
+        elif monthly_mean > 0 and volatility > 0:
+            # 平均が monthly_mean、変動係数が volatility の対数正規分布
+            sigma = np.sqrt(np.log1p(volatility ** 2))
+            draws = monthly_mean * np.exp(rng.standard_normal((paths, future_months)) * sigma - sigma ** 2 / 2)
+        else:
+            draws = np.full((paths, future_months), monthly_mean, dtype=np.float64)
+        incomes[:, ~entered] = draws
+
+    # 月末の累計が各壁以上か（経路 × 月 × 壁）
+    cumulative = np.cumsum(incomes, axis=1) - deduction
+    amounts = np.array(wall_index.amounts, dtype=np.float64)
+    reached = cumulative[:, :, np.newaxis] >= amounts
+    crossed = reached[:, -1, :]
+    probability = crossed.mean(axis=0)
+    by_month = reached.mean(axis=0)
+    first_month = _first_crossing(reached)
+
+    # 入力済みの月だけで超えている壁（入力済みの月の累計）
+    entered_cumulative = np.cumsum(np.where(entered, [amount or 0 for amount in monthly_incomes], 0)) - deduction
+
+    walls: List[Dict] = []
+    for i, wall in enumerate(wall_index.walls):
+        hits = crossed[:, i]
+        walls.append({
+            "amount": wall["amount"],
+            "name": wall["name"],
+            "alreadyExceeded": bool(entered_cumulative[-1] >= wall["amount"]),
+            "probability": float(probability[i]),
+            "expectedMonth": float(first_month[hits, i].mean()) if hits.any() else None,
+            "byMonth": by_month[:, i].tolist()
+        })
+
+    annual = cumulative[:, -1] + deduction
+    p10, p50, p90 = np.percentile(annual, [10, 50, 90])
+    return {
+        "wallType": wall_type,
+        "taxYear": rules.year,
+        "model": model,
+        "paths": paths,
+        "volatility": volatility,
+        "monthlyMean": monthly_mean,
+        "enteredMonths": int(entered.sum()),
+        "enteredTotal": int(entered_values.sum()),
+        "annual": {"mean": float(annual.mean()), "p10": float(p10), "p50": float(p50), "p90": float(p90)},
+        "walls": walls
+    }
+
+
+if __name__ == "__main__":
+    # テスト実行
+    import time
+
+    monthly_incomes = [80000, 95000, 70000, 110000, 90000, None, None, None, None, None, None, None]
+    started = time.perf_counter()
+    forecast = simulate_wall_crossings(monthly_incomes, seed=0)
+    elapsed = (time.perf_counter() - started) * 1000
+
+    print(f"=== 年末までに壁を超える確率（{forecast['paths']:,}本・{elapsed:.1f}ms） ===")
+    print(
+        f"入力済み {forecast['enteredMonths']}か月 / 累計 {forecast['enteredTotal']:,}円 / "
+        f"月平均 {forecast['monthlyMean']:,.0f}円 / 変動係数 {forecast['volatility']:.2f}"
+    )
+    annual = forecast["annual"]
+    print(f"年収の見込み: 中央値 {annual['p50']:,.0f}円（10%〜90%: {annual['p10']:,.0f}〜{annual['p90']:,.0f}円）")
+    for wall in forecast["walls"]:
+        month = f"{wall['expectedMonth']:.1f}月ごろ" if wall["expectedMonth"] is not None else "-"
+        print(f"  {wall['name']}: {wall['probability']:6.1%}  {month}")
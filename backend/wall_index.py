@@ -0,0 +1,183 @@
+"""
+収入の壁の索引
+
+壁のマスターデータ（walls_data）を昇順の索引に変換したもの。変換済みの索引は
+tax_rules のスナップショットに含まれるため、このモジュールはマスターデータを読み込まない。
+"""
+
+from bisect import bisect_right
+from typing import Mapping, Optional, Sequence, Tuple
+
+
+class FrozenRecord(dict):
+    """読み取り専用の dict（JSON化や dict との比較はそのまま使える）"""
+
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("読み取り専用のため変更できません")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        # 既定の復元は空の dict に __setitem__ で詰め直すため、中身ごと作り直す
+        return FrozenRecord, (dict(self),)
+
+
+def freeze_record(value):
+    """共有用に読み取り専用へ変換（dict → FrozenRecord, list → tuple）"""
+    if isinstance(value, dict):
+        return FrozenRecord({key: freeze_record(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze_record(item) for item in value)
+    return value
+
+
+class WallIndex:
+    """
+    収入の壁の索引
+
+    壁の金額を昇順に保持し、二分探索で「超えた壁」「次の壁」を引く。
+    壁のレコードは読み取り専用で、呼び出しごとにコピーせず共有する。
+    """
+
+    __slots__ = ("walls", "amounts", "summaries", "_amount_array")
+
+    def __init__(self, walls: Sequence[dict]):
+        """
+        Args:
+            walls: 壁のマスターデータ（INCOME_WALLS_PARTTIME など）
+        """
+        self.walls: Tuple[Mapping, ...] = tuple(
+            freeze_record(wall) for wall in sorted(walls, key=lambda wall: wall["amount"])
+        )
+        self.amounts: Tuple[int, ...] = tuple(wall["amount"] for wall in self.walls)
+        self.summaries = self._summarize(self.walls)
+        self._amount_array = None
+
+    @staticmethod
+    def _summarize(walls: Tuple[Mapping, ...]) -> Tuple[Mapping, ...]:
+        """計算結果の wallsExceeded に載せる壁の概要（金額・名前・影響）"""
+        return tuple(
+            FrozenRecord({
+                "amount": wall["amount"],
+                "name": wall["name"],
+                "impact": wall["impacts"]["self"] or wall["impacts"]["family"]
+            })
+            for wall in walls
+        )
+
+    def __getstate__(self):
+        # numpy の配列はキャッシュのため保存しない
+        return self.walls, self.amounts
+
+    def __setstate__(self, state):
+        self.walls, self.amounts = state
+        self.summaries = self._summarize(self.walls)
+        self._amount_array = None
+
+    def level(self, current_income: int) -> int:
+        """超えた壁の数（= 次の壁のインデックス）"""
+        return bisect_right(self.amounts, current_income)
+
+    def exceeded(self, current_income: int) -> Tuple[Mapping, ...]:
+        """超えた壁（先頭からのスライス）"""
+        return self.walls[:bisect_right(self.amounts, current_income)]
+
+    def next(self, current_income: int) -> Optional[Tuple[int, int]]:
+        """
+        次の壁
+
+        Returns:
+            (壁のインデックス, 残り金額) または None
+        """
+        i = bisect_right(self.amounts, current_income)
+        if i == len(self.amounts):
+            return None
+        return i, self.amounts[i] - current_income
+
+    def next_wall(self, current_income: int) -> Optional[dict]:
+        """
+        次の壁のレコードに残り金額（remaining）を加えたもの
+
+        Returns:
+            次の壁の情報（dict）または None
+        """
+        i = bisect_right(self.amounts, current_income)
+        if i == len(self.amounts):
+            return None
+        return {
+            **self.walls[i],
+            "remaining": self.amounts[i] - current_income
+        }
+
+    def _amounts_as_array(self):
+        import numpy as np
+
+        if self._amount_array is None:
+            self._amount_array = np.array(self.amounts, dtype=np.int64)
+        return self._amount_array
+
+    def levels(self, incomes):
+        """
+        超えた壁の数を一括計算
+
+        Args:
+            incomes: 収入（円）の配列
+
+        Returns:
+            壁のレベル（超えた壁の数）の配列
+        """
+        import numpy as np
+
+        return np.searchsorted(self._amounts_as_array(), np.asarray(incomes, dtype=np.int64), side="right")
+
+    def next_remaining(self, incomes):
+        """
+        次の壁のインデックスと残り金額を一括計算
+
+        Args:
+            incomes: 収入（円）の配列
+
+        Returns:
+            (次の壁のインデックス, 残り金額) の配列の組。次の壁がない行は
+            インデックスが len(walls)、残り金額が0になる
+        """
+        import numpy as np
+
+        amounts = self._amounts_as_array()
+        incomes = np.asarray(incomes, dtype=np.int64)
+        levels = np.searchsorted(amounts, incomes, side="right")
+        has_next = levels < len(amounts)
+        remaining = np.where(has_next, amounts[np.minimum(levels, len(amounts) - 1)] - incomes, 0)
+        return levels, remaining
+
+
+def generate_wall_advice(
+    current_income: int,
+    exceeded_walls: Sequence[Mapping],
+    next_wall: Optional[Mapping] = None,
+    income_label: str = "年収"
+) -> str:
+    """
+    壁のマスターデータからアドバイス文を作る（年分ごとの専用の文がない場合に使う）
+
+    Args:
+        current_income: 現在の収入（円）
+        exceeded_walls: 超えた壁
+        next_wall: 次の壁（None の場合は次の壁の案内を省く）
+        income_label: 収入の呼び方（"年収" | "所得"）
+
+    Returns:
+        アドバイス文
+    """
+    if exceeded_walls:
+        wall = exceeded_walls[-1]
+        advice = f"{wall['name']}を超えています。{wall['description']}。"
+    else:
+        advice = f"現在の{income_label}は{current_income:,}円で、まだ壁を超えていません。"
+
+    if next_wall:
+        advice += f"次の壁は{next_wall['name']}（あと{next_wall['remaining']:,}円）です。"
+    return advice
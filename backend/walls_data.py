@@ -2,6 +2,12 @@
 収入の壁マスターデータ
 """
 
+from typing import Mapping, Optional, Sequence
+
+# 索引と共有用のレコードは wall_index に置き、既存の呼び出し元のためにここからも参照できるようにする
+from .wall_index import FrozenRecord, freeze_record, WallIndex, generate_wall_advice
+from .tax_rules import DEFAULT_TAX_YEAR
+
 # アルバイト・パート版の収入の壁（5本柱）
 INCOME_WALLS_PARTTIME = [
     {
@@ -140,6 +146,149 @@ INCOME_WALLS_FREELANCE = [
     }
 ]
 
+# アルバイト・パート版の収入の壁（2025年分〜：基礎控除・給与所得控除の引き上げ後）
+INCOME_WALLS_PARTTIME_2025 = [
+    {
+        "amount": 1060000,
+        "name": "106万円の壁",
+        "category": "社会保険",
+        "description": "大企業（従業員51人以上）で週20時間以上勤務＋月収8.8万円以上で社会保険加入義務",
+        "conditions": [
+            "週20時間以上勤務",
+            "月88,000円以上",
+            "2ヶ月超雇用",
+            "学生でない（学生除外特例あり）",
+            "従業員51人以上の企業"
+        ],
+        "impacts": {
+            "self": "本人に年間約15〜17万円の社会保険料負担（学生除外特例あり）",
+            "family": None
+        },
+        "color": "#FFAB91",  # オレンジ
+        "level": 1
+    },
+    {
+        "amount": 1230000,
+        "name": "123万円の壁",
+        "category": "扶養控除",
+        "description": "合計所得58万円（給与所得控除65万円＋58万円）を超え、親の扶養控除の対象から外れる",
+        "impacts": {
+            "self": None,
+            "family": "親の扶養控除（19〜22歳は特定親族特別控除に移行）"
+        },
+        "color": "#FFE082",  # 黄色
+        "level": 2
+    },
+    {
+        "amount": 1300000,
+        "name": "130万円の壁",
+        "category": "扶養・社会保険",
+        "description": "親の社会保険の扶養から外れる",
+        "impacts": {
+            "self": "国民健康保険・年金に加入必要",
+            "family": "親の健康保険料が上がる"
+        },
+        "color": "#EF5350",  # 赤
+        "level": 3
+    },
+    {
+        "amount": 1500000,
+        "name": "150万円の壁",
+        "category": "特定親族特別控除",
+        "description": "19〜22歳の子の特定親族特別控除（63万円）が満額でなくなり、段階的に減少",
+        "impacts": {
+            "self": None,
+            "family": "親の税負担が増加（特定親族特別控除の減額）"
+        },
+        "color": "#C62828",  # 濃い赤
+        "level": 4
+    },
+    {
+        "amount": 1600000,
+        "name": "160万円の壁",
+        "category": "所得税",
+        "description": "基礎控除95万円＋給与所得控除65万円を超え、所得税が発生",
+        "impacts": {
+            "self": "本人に所得税が発生（源泉徴収）",
+            "family": None
+        },
+        "color": "#4A148C",  # 紫
+        "level": 5
+    }
+]
+
+# 業務委託版の収入の壁（2025年分〜）
+INCOME_WALLS_FREELANCE_2025 = [
+    {
+        "amount": 580000,
+        "name": "58万円の壁",
+        "category": "扶養控除",
+        "description": "合計所得58万円を超え、親の扶養控除の対象から外れる",
+        "impacts": {
+            "self": None,
+            "family": "親の扶養控除（19〜22歳は特定親族特別控除に移行）"
+        },
+        "color": "#FFE082",  # 黄色
+        "level": 1
+    },
+    {
+        "amount": 950000,
+        "name": "95万円の壁",
+        "category": "所得税",
+        "description": "基礎控除95万円を超え、所得税が発生",
+        "impacts": {
+            "self": "本人に所得税が発生",
+            "family": None
+        },
+        "color": "#FFAB91",  # オレンジ
+        "level": 2
+    },
+    {
+        "amount": 1300000,
+        "name": "130万円の壁",
+        "category": "社会保険扶養",
+        "description": "親の社会保険の扶養から外れる",
+        "impacts": {
+            "self": "国民健康保険・国民年金に加入必要",
+            "family": "親の健康保険料が上がる"
+        },
+        "color": "#EF5350",  # 赤
+        "level": 3
+    },
+    {
+        "amount": 1600000,
+        "name": "160万円の壁",
+        "category": "所得税",
+        "description": "青色申告特別控除65万円を使っても所得税が発生",
+        "note": "160万円 - 65万円（青色控除）- 95万円（基礎控除）= 0円",
+        "impacts": {
+            "self": "青色申告でも所得税が発生",
+            "family": None
+        },
+        "color": "#FFB74D",  # 薄いオレンジ
+        "level": 4
+    },
+    {
+        "amount": 2900000,
+        "name": "290万円の壁",
+        "category": "個人事業税",
+        "description": "個人事業税が発生（事業主控除290万円）",
+        "note": "業種により税率3〜5%",
+        "impacts": {
+            "self": "個人事業税が発生（所得×税率3〜5%）",
+            "family": None
+        },
+        "color": "#4A148C",  # 紫
+        "level": 5
+    }
+]
+
+# 年分ごとの収入の壁
+INCOME_WALLS_BY_YEAR = {
+    2024: {"parttime": INCOME_WALLS_PARTTIME, "freelance": INCOME_WALLS_FREELANCE},
+    2025: {"parttime": INCOME_WALLS_PARTTIME_2025, "freelance": INCOME_WALLS_FREELANCE_2025}
+}
+
 # 業種別経費率マスターデータ
 EXPENSE_RATES_BY_BUSINESS = {
     "writer": {
@@ -205,45 +354,71 @@ EXPENSE_RATES_BY_BUSINESS = {
 }
 
 
-def get_next_wall(current_income: int, wall_type: str = "parttime") -> dict:
+# 既定の年分の壁の索引
+WALL_INDEXES = {
+    wall_type: WallIndex(walls) for wall_type, walls in INCOME_WALLS_BY_YEAR[DEFAULT_TAX_YEAR].items()
+}
+
+# (壁の種類, 年分) → 索引（既定の年分以外は初回の利用時に作る）
+_WALL_INDEXES_BY_YEAR = {
+    (wall_type, DEFAULT_TAX_YEAR): index for wall_type, index in WALL_INDEXES.items()
+}
+
+
+def get_wall_index(wall_type: str = "parttime", tax_year: Optional[int] = None) -> WallIndex:
+    """
+    壁の索引を取得
+
+    Args:
+        wall_type: "parttime" または "freelance"
+        tax_year: 年分（省略時は tax_rules.DEFAULT_TAX_YEAR）
+
+    Returns:
+        壁の索引
+    """
+    year = DEFAULT_TAX_YEAR if tax_year is None else tax_year
+    index = _WALL_INDEXES_BY_YEAR.get((wall_type, year))
+    if index is not None:
+        return index
+
+    key = ("parttime" if wall_type == "parttime" else "freelance", year)
+    index = _WALL_INDEXES_BY_YEAR.get(key)
+    if index is None:
+        if key[1] not in INCOME_WALLS_BY_YEAR:
+            raise ValueError(f"対応していない年分です: {tax_year}")
+        index = _WALL_INDEXES_BY_YEAR.setdefault(key, WallIndex(INCOME_WALLS_BY_YEAR[key[1]][key[0]]))
+    return index
+
+
+def get_next_wall(current_income: int, wall_type: str = "parttime", tax_year: Optional[int] = None) -> dict:
     """
     現在の収入から次の壁を取得
 
     Args:
         current_income: 現在の収入（円）
         wall_type: "parttime" または "freelance"
+        tax_year: 年分（省略時は tax_rules.DEFAULT_TAX_YEAR）
 
     Returns:
         次の壁の情報（dict）または None
     """
-    walls = INCOME_WALLS_PARTTIME if wall_type == "parttime" else INCOME_WALLS_FREELANCE
+    return get_wall_index(wall_type, tax_year).next_wall(current_income)
 
-    for wall in walls:
-        if current_income < wall["amount"]:
-            return {
-                **wall,
-                "remaining": wall["amount"] - current_income
-            }
 
-    return None
-
-
-def get_exceeded_walls(current_income: int, wall_type: str = "parttime") -> list:
+def get_exceeded_walls(
+    current_income: int,
+    wall_type: str = "parttime",
+    tax_year: Optional[int] = None
+) -> Sequence[Mapping]:
     """
     現在の収入で超えた壁を取得
 
     Args:
         current_income: 現在の収入（円）
         wall_type: "parttime" または "freelance"
+        tax_year: 年分（省略時は tax_rules.DEFAULT_TAX_YEAR）
 
     Returns:
-        超えた壁のリスト
+        超えた壁（読み取り専用レコードのタプル）
     """
-    walls = INCOME_WALLS_PARTTIME if wall_type == "parttime" else INCOME_WALLS_FREELANCE
-
-    exceeded = []
-    for wall in walls:
-        if current_income >= wall["amount"]:
-            exceeded.append(wall)
-
-    return exceeded
+    return get_wall_index(wall_type, tax_year).exceeded(current_income)
@@ -0,0 +1,237 @@
+"""
+計算ロジックのベンチマーク（回帰チェック付き）
+
+calculate_parttime_tax / calculate_freelance_tax / compare_blue_vs_white /
+get_next_wall / get_exceeded_walls / アドバイス生成を、実際の入力に近い分布の
+データで計測し、1秒あたりの処理回数と1回あたりのメモリ確保量を表示する。
+保存したベースラインより処理回数が閾値を超えて落ちた場合は終了コード1で終わる。
+
+使い方:
+    python benchmarks/bench_calculators.py                  # ベースラインと比較
+    python benchmarks/bench_calculators.py --save-baseline  # ベースラインを保存
+    python benchmarks/bench_calculators.py --threshold 0.2 --only parttime
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+# バックエンドモジュールをインポート
+sys.path.append(str(Path(__file__).parent.parent))
+from backend.calculator_parttime import calculate_parttime_tax, generate_advice
+from backend.calculator_freelance import calculate_freelance_tax, compare_blue_vs_white, generate_advice_freelance
+from backend.walls_data import get_next_wall, get_exceeded_walls
+
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+
+# 入力の件数（1回の計測で全件を処理する）
+SAMPLE_SIZE = 2000
+
+
+def _income_near_walls(rng: random.Random, walls: List[int], spread: int, upper: int) -> int:
+    """壁の付近に集まり、キリのいい金額が多い収入を生成"""
+    roll = rng.random()
+    if roll < 0.5:
+        amount = rng.choice(walls) + rng.randint(-spread, spread)
+    elif roll < 0.8:
+        amount = rng.randrange(0, upper, 10000)
+    else:
+        amount = rng.randint(0, upper)
+    return max(amount, 0)
+
+
+def make_parttime_inputs(rng: random.Random) -> List[Dict]:
+    """アルバイト・パート版の入力"""
+    walls = [1030000, 1060000, 1300000, 1500000, 2010000]
+    return [
+        {
+            "age": rng.randint(18, 24),
+            "annual_income": _income_near_walls(rng, walls, 100000, 3000000),
+            "is_student": rng.random() < 0.7,
+            "dependent_type": rng.choice(["parent", "parent", "none", "spouse"]),
+            "company_size": rng.choice(["small", "medium", "large"]),
+            "weekly_hours": rng.choice([10, 15, 20, 25, 30])
+        }
+        for _ in range(SAMPLE_SIZE)
+    ]
+
+
+def make_freelance_inputs(rng: random.Random) -> List[Dict]:
+    """業務委託版の入力"""
+    walls = [480000, 1030000, 1130000, 1300000, 2900000]
+    inputs = []
+    for _ in range(SAMPLE_SIZE):
+        revenue = _income_near_walls(rng, walls, 200000, 8000000)
+        inputs.append({
+            "age": rng.randint(18, 30),
+            "annual_revenue": revenue,
+            "annual_expense": int(revenue * rng.uniform(0.05, 0.4)),
+            "is_student": rng.random() < 0.4,
+            "dependent_type": rng.choice(["parent", "none"]),
+            "tax_filing_type": rng.choice(["white", "blue10", "blue65"]),
+            "business_type": rng.choice(["writer", "designer", "engineer", "video_editor", "other"])
+        })
+    return inputs
+
+
+def build_cases(seed: int) -> Dict[str, Tuple[Callable[[object], object], List]]:
+    """ベンチマークの対象と入力"""
+    rng = random.Random(seed)
+    parttime_inputs = make_parttime_inputs(rng)
+    freelance_inputs = make_freelance_inputs(rng)
+
+    # 比較・壁・アドバイスは計算結果から引数を作る
+    parttime_results = [calculate_parttime_tax(**kwargs) for kwargs in parttime_inputs]
+    freelance_results = [calculate_freelance_tax(**kwargs) for kwargs in freelance_inputs]
+
+    comparison_args = [
+        (
+            kwargs["annual_revenue"], kwargs["annual_expense"], result["businessIncome"],
+            result["incomeTax"], result["totalTax"], result["netIncome"], kwargs["tax_filing_type"],
+            result["residentTax"]
+        )
+        for kwargs, result in zip(freelance_inputs, freelance_results)
+    ]
+    wall_args = [
+        (kwargs["annual_income"], "parttime") for kwargs in parttime_inputs
+    ] + [
+        (result["businessIncome"], "freelance") for result in freelance_results
+    ]
+    advice_args = [
+        (
+            kwargs["annual_income"],
+            get_exceeded_walls(kwargs["annual_income"], "parttime"),
+            get_next_wall(kwargs["annual_income"], "parttime"),
+            kwargs["is_student"],
+            kwargs["dependent_type"]
+        )
+        for kwargs in parttime_inputs
+    ]
+    advice_freelance_args = [
+        (
+            result["businessIncome"],
+            get_exceeded_walls(result["businessIncome"], "freelance"),
+            get_next_wall(result["businessIncome"], "freelance"),
+            kwargs["is_student"],
+            kwargs["dependent_type"],
+            kwargs["tax_filing_type"],
+            result["expenseRate"],
+            result["industryAverageExpenseRate"],
+            result["remainingExpenseCapacity"]
+        )
+        for kwargs, result in zip(freelance_inputs, freelance_results)
+    ]
+
+    return {
+        "calculate_parttime_tax": (lambda kwargs: calculate_parttime_tax(**kwargs), parttime_inputs),
+        "calculate_freelance_tax": (lambda kwargs: calculate_freelance_tax(**kwargs), freelance_inputs),
+        "compare_blue_vs_white": (lambda args: compare_blue_vs_white(*args), comparison_args),
+        "get_next_wall": (lambda args: get_next_wall(*args), wall_args),
+        "get_exceeded_walls": (lambda args: get_exceeded_walls(*args), wall_args),
+        "generate_advice": (lambda args: generate_advice(*args), advice_args),
+        "generate_advice_freelance": (lambda args: generate_advice_freelance(*args), advice_freelance_args)
+    }
+
+
+def measure(func: Callable[[object], object], inputs: List, repeat: int) -> Dict:
+    """
+    1つの対象を計測する
+
+    Returns:
+        1秒あたりの処理回数（repeat 回中の最速）と1回あたりのメモリ確保量（ピークの平均）
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for item in inputs:
+            func(item)
+        best = min(best, time.perf_counter() - started)
+
+    # 1回ごとにピークを測り直し、一時的に確保したメモリ量の平均を求める
+    tracemalloc.start()
+    total_peak = 0
+    for item in inputs:
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        func(item)
+        _, peak = tracemalloc.get_traced_memory()
+        total_peak += peak - before
+    tracemalloc.stop()
+
+    return {
+        "opsPerSec": len(inputs) / best,
+        "peakBytesPerCall": total_peak // len(inputs)
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="計算ロジックのベンチマーク")
+    parser.add_argument("--repeat", type=int, default=5, help="計測の繰り返し回数（最速を採用）")
+    parser.add_argument("--seed", type=int, default=20240101, help="入力生成の乱数シード")
+    parser.add_argument("--threshold", type=float, default=0.25, help="回帰とみなす処理回数の低下率")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="ベースラインのファイル")
+    parser.add_argument("--save-baseline", action="store_true", help="計測結果をベースラインとして保存")
+    parser.add_argument("--only", help="名前にこの文字列を含む対象だけ計測")
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    args = parser.parse_args(argv)
+
+    cases = build_cases(args.seed)
+    if args.only:
+        cases = {name: case for name, case in cases.items() if args.only in name}
+
+    results = {name: measure(func, inputs, args.repeat) for name, (func, inputs) in cases.items()}
+
+    baseline = {}
+    if args.baseline.exists() and not args.save_baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["results"]
+
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base:
+            result["change"] = result["opsPerSec"] / base["opsPerSec"] - 1
+            if result["change"] < -args.threshold:
+                regressions.append(name)
+
+    if args.json:
+        print(json.dumps({"results": results, "regressions": regressions}, indent=2))
+    else:
+        print(f"=== 計算ロジックのベンチマーク（{SAMPLE_SIZE:,}件 × 最速{args.repeat}回） ===")
+        print(f"{'対象':<28}{'回/秒':>14}{'確保バイト/回':>14}{'ベースライン比':>14}")
+        for name, result in results.items():
+            change = f"{result['change']:+.1%}" if "change" in result else "-"
+            mark = "  ← 回帰" if name in regressions else ""
+            print(f"{name:<28}{result['opsPerSec']:>14,.0f}{result['peakBytesPerCall']:>14,}{change:>14}{mark}")
+
+    if args.save_baseline:
+        args.baseline.write_text(
+            json.dumps({
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "seed": args.seed,
+                "results": {
+                    name: {"opsPerSec": round(result["opsPerSec"]), "peakBytesPerCall": result["peakBytesPerCall"]}
+                    for name, result in results.items()
+                }
+            }, indent=2) + "\n",
+            encoding="utf-8"
+        )
+        print(f"ベースラインを保存しました: {args.baseline}")
+    elif not baseline:
+        print("ベースラインがありません。--save-baseline で保存してください。")
+
+    if regressions:
+        print(f"処理回数が{args.threshold:.0%}以上低下しました: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+計算履歴のストア（SQLite）のベンチマーク
+
+利用者 × 年分 × 12か月の月別入力を一時ファイルにまとめて書き込み、書き込み速度と
+よく使う問い合わせ（利用者の1年分の読み込み・10月までの累計が100万円を超えた利用者・
+月ごとの集計）の応答時間を表示する。利用者数を変えて、件数が増えても応答時間が
+伸びにくいこと（索引が効いていること）を確認する。
+
+使い方:
+    python benchmarks/bench_history.py
+    python benchmarks/bench_history.py --users 1000 10000 100000 --years 3
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.append(str(Path(__file__).parent.parent))
+from backend.history_store import HistoryStore
+
+
+def _median_ms(func: Callable[[], object], repeat: int) -> float:
+    """repeat 回実行した中央値（ミリ秒）"""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - started)
+    return statistics.median(times) * 1000
+
+
+def run(users: int, years: int, repeat: int, seed: int) -> Dict:
+    """利用者数 users の履歴を作って計測"""
+    rng = random.Random(seed)
+    first_year = 2025 - years
+    rows = [
+        (f"user{i:07d}", year, month, rng.randrange(0, 200000, 1000))
+        for i in range(users)
+        for year in range(first_year, first_year + years)
+        for month in range(1, 13)
+    ]
+
+    with tempfile.TemporaryDirectory() as directory:
+        with HistoryStore(Path(directory) / "history.sqlite3") as store:
+            started = time.perf_counter()
+            store.save_monthly_inputs(rows)
+            insert_seconds = time.perf_counter() - started
+
+            year = first_year + years - 1
+            sample_users = [f"user{rng.randrange(users):07d}" for _ in range(repeat)]
+            user_iter = iter(sample_users * 2)
+            return {
+                "users": users,
+                "rows": len(rows),
+                "insertRowsPerSecond": len(rows) / insert_seconds,
+                "loadYearMs": _median_ms(lambda: store.monthly_inputs(next(user_iter), year), repeat),
+                "yearlyTotalsMs": _median_ms(lambda: store.yearly_totals(next(user_iter)), repeat),
+                "usersOverMs": _median_ms(lambda: store.users_over(year, 10, 1000000), repeat),
+                "monthlyStatisticsMs": _median_ms(lambda: store.monthly_statistics(year), repeat)
+            }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="計算履歴のストアのベンチマーク")
+    parser.add_argument("--users", type=int, nargs="+", default=[1000, 10000, 50000], help="利用者数（複数指定可）")
+    parser.add_argument("--years", type=int, default=2, help="利用者ごとの年分の数")
+    parser.add_argument("--repeat", type=int, default=20, help="問い合わせの繰り返し回数（中央値を採用）")
+    parser.add_argument("--seed", type=int, default=20240101, help="入力生成の乱数シード")
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    args = parser.parse_args(argv)
+
+    results: List[Dict] = [run(users, args.years, args.repeat, args.seed) for users in args.users]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"=== 計算履歴のストアのベンチマーク（{args.years}年分・中央値） ===")
+    print(
+        f"{'利用者数':>10}{'行数':>12}{'書き込み行/秒':>16}{'1年分ms':>10}"
+        f"{'年別合計ms':>12}{'累計100万超ms':>16}{'月別集計ms':>12}"
+    )
+    for result in results:
+        print(
+            f"{result['users']:>10,}{result['rows']:>12,}{result['insertRowsPerSecond']:>16,.0f}"
+            f"{result['loadYearMs']:>10.3f}{result['yearlyTotalsMs']:>12.3f}"
+            f"{result['usersOverMs']:>16.1f}{result['monthlyStatisticsMs']:>12.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
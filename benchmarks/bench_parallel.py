@@ -0,0 +1,80 @@
+"""
+並列一括計算のベンチマーク（直列実行との比較）
+
+使い方:
+    python benchmarks/bench_parallel.py --rows 200000 --workers 1 2 4 8 16 32
+"""
+
+import argparse
+import os
+import random
+import sys
+from pathlib import Path
+
+# バックエンドモジュールをインポート
+sys.path.append(str(Path(__file__).parent.parent))
+from backend.bulk_cli import process_records
+from backend.parallel import run_parallel
+
+
+def generate_records(kind: str, rows: int, seed: int = 0):
+    """ベンチマーク用の入力行を生成"""
+    rng = random.Random(seed)
+    for line_no in range(1, rows + 1):
+        if kind == "parttime":
+            yield line_no, {
+                "id": line_no,
+                "annual_income": rng.randrange(0, 3000000, 1000),
+                "is_student": rng.random() < 0.5,
+                "company_size": rng.choice(["small", "medium", "large"]),
+                "weekly_hours": rng.choice([10, 15, 20, 25, 30])
+            }
+        else:
+            revenue = rng.randrange(0, 8000000, 1000)
+            yield line_no, {
+                "id": line_no,
+                "annual_revenue": revenue,
+                "annual_expense": int(revenue * rng.uniform(0.1, 0.4)),
+                "is_student": rng.random() < 0.3,
+                "tax_filing_type": rng.choice(["white", "blue10", "blue65"]),
+                "business_type": rng.choice(["writer", "designer", "engineer", "video_editor", "other"])
+            }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="並列一括計算のベンチマーク")
+    parser.add_argument("--kind", choices=["parttime", "freelance"], default="parttime")
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    parser.add_argument("--workers", type=int, nargs="+", default=None)
+    args = parser.parse_args()
+
+    cpu_count = os.cpu_count() or 1
+    worker_counts = args.workers or sorted({1, 2, 4, 8, 16, 32, cpu_count} & set(range(1, cpu_count + 1)))
+
+    def discard(row):
+        pass
+
+    serial = process_records(args.kind, generate_records(args.kind, args.rows), discard)
+    serial_rate = serial["rows"] / serial["elapsedSeconds"]
+
+    print(f"=== 並列一括計算ベンチマーク（{args.kind}・{args.rows:,}行・CPU {cpu_count}） ===")
+    print(f"直列:          {serial['elapsedSeconds']:7.2f}秒  {serial_rate:10,.0f}行/秒")
+
+    for workers in worker_counts:
+        stats = run_parallel(
+            args.kind,
+            generate_records(args.kind, args.rows),
+            discard,
+            workers=workers,
+            chunk_size=args.chunk_size
+        )
+        rate = stats["rows"] / stats["elapsedSeconds"]
+        print(
+            f"並列 {workers:2d}プロセス: {stats['elapsedSeconds']:7.2f}秒  {rate:10,.0f}行/秒"
+            f"  速度比 {rate / serial_rate:5.2f}倍"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+起動時間のベンチマーク（新しいプロセスでの import と初回の計算）
+
+対象ごとに新しい Python プロセスを起動し、`import backend` から初回の計算が終わるまでの
+時間を計測する（インタプリタ自体の起動時間は含めない）。ルールのスナップショットの
+有無による差も計測し、--budget-ms を超えた対象があれば終了コード1で終わる。
+
+使い方:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 20 --budget-ms 300
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).parent.parent
+
+# 対象 → 子プロセスで計測するコード
+CASES = {
+    "import backend": "import backend",
+    "first parttime call": (
+        "import backend\n"
+        "backend.calculate_parttime_tax(age=20, annual_income=1200000, is_student=True)"
+    ),
+    "first freelance call": (
+        "import backend\n"
+        "backend.calculate_freelance_tax(age=25, annual_revenue=3000000, annual_expense=600000,"
+        " tax_filing_type='blue65', business_type='designer')"
+    )
+}
+
+# 子プロセスで実行するスクリプト（計測結果を JSON で出力）
+CHILD_TEMPLATE = """
+import json, sys, time
+started = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - started
+print(json.dumps({{
+    "ms": elapsed * 1000,
+    "numpy": "numpy" in sys.modules,
+    "wallsData": "backend.walls_data" in sys.modules
+}}))
+"""
+
+
+def run_once(code: str, snapshot: bool) -> Dict:
+    """新しいプロセスで1回計測"""
+    env = dict(os.environ, TAXCHECK_RULE_SNAPSHOT="1" if snapshot else "0")
+    completed = subprocess.run(
+        [sys.executable, "-c", CHILD_TEMPLATE.format(code=code)],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(completed.stdout)
+
+
+def measure(code: str, snapshot: bool, runs: int) -> Dict:
+    """
+    1つの対象を計測する
+
+    Returns:
+        処理時間の中央値・最小値（ミリ秒）と、読み込まれたモジュール
+    """
+    samples: List[Dict] = [run_once(code, snapshot) for _ in range(runs)]
+    times = [sample["ms"] for sample in samples]
+    return {
+        "medianMs": statistics.median(times),
+        "minMs": min(times),
+        "numpy": samples[-1]["numpy"],
+        "wallsData": samples[-1]["wallsData"]
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="起動時間のベンチマーク")
+    parser.add_argument("--runs", type=int, default=10, help="対象ごとのプロセス起動回数（中央値を採用）")
+    parser.add_argument("--budget-ms", type=float, help="スナップショットありの中央値の上限（ミリ秒）")
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    args = parser.parse_args(argv)
+
+    # スナップショットがなければ作る
+    snapshot_path = ROOT / "backend" / "data" / "rules_snapshot.marshal"
+    if not snapshot_path.exists():
+        subprocess.run([sys.executable, "-m", "backend.tax_rules", "--build-snapshot"], cwd=ROOT, check=True)
+
+    results = {}
+    for name, code in CASES.items():
+        for snapshot in (True, False):
+            label = f"{name} ({'snapshot' if snapshot else 'no snapshot'})"
+            results[label] = measure(code, snapshot, args.runs)
+
+    over_budget = []
+    if args.budget_ms is not None:
+        over_budget = [
+            label for label, result in results.items()
+            if label.endswith("(snapshot)") and result["medianMs"] > args.budget_ms
+        ]
+
+    if args.json:
+        print(json.dumps({"results": results, "overBudget": over_budget}, indent=2))
+    else:
+        print(f"=== 起動時間のベンチマーク（{args.runs}回の中央値） ===")
+        print(f"{'対象':<42}{'中央値ms':>10}{'最小ms':>10}{'numpy':>8}{'壁データ':>10}")
+        for label, result in results.items():
+            mark = "  ← 予算超過" if label in over_budget else ""
+            print(
+                f"{label:<42}{result['medianMs']:>10.1f}{result['minMs']:>10.1f}"
+                f"{'yes' if result['numpy'] else 'no':>8}{'yes' if result['wallsData'] else 'no':>10}{mark}"
+            )
+
+    if over_budget:
+        print(f"起動時間が{args.budget_ms:g}msを超えました: {', '.join(over_budget)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
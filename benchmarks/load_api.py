@@ -0,0 +1,272 @@
+"""
+JSON HTTP API の負荷テスト
+
+起動中の API（backend/api.py）に単票・一括計算のリクエストを並行して送り、
+1秒あたりの処理件数と応答時間の分布を表示する。HTTP クライアントは標準ライブラリの
+asyncio で実装しているため、追加のパッケージは不要。
+
+使い方:
+    uvicorn backend.api:app --port 8000 &
+    python benchmarks/load_api.py --url http://127.0.0.1:8000
+    python benchmarks/load_api.py --serve --workers 4   # uvicorn をこのスクリプトから起動
+    python benchmarks/load_api.py --requests 5000 --concurrency 64 --batch-rows 20000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+ROOT = Path(__file__).parent.parent
+
+
+class Connection:
+    """HTTP/1.1 の keep-alive 接続（1度に1リクエスト）"""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def request(self, method: str, path: str, body: bytes = b"", content_type: str = "application/json") -> Tuple[int, bytes, float]:
+        """
+        リクエストを送って応答を読む
+
+        Returns:
+            (状態コード, 本文, 最初の1バイトが届くまでの秒数)
+        """
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+        started = time.perf_counter()
+        head = (
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+            f"Content-Type: {content_type}\r\nContent-Length: {len(body)}\r\n\r\n"
+        ).encode("latin-1")
+        self.writer.write(head + body)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        first_byte = time.perf_counter() - started
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            parts = []
+            while True:
+                size = int((await self.reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await self.reader.readline()
+                    break
+                parts.append(await self.reader.readexactly(size))
+                await self.reader.readline()
+            payload = b"".join(parts)
+        else:
+            payload = await self.reader.readexactly(int(headers.get("content-length", "0")))
+
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status, payload, first_byte
+
+    async def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+def make_parttime_record(rng: random.Random, i: int) -> Dict:
+    """アルバイト・パート版の入力（壁の付近が多い）"""
+    if rng.random() < 0.5:
+        income = rng.choice([1030000, 1060000, 1300000, 1500000]) + rng.randint(-100000, 100000)
+    else:
+        income = rng.randrange(0, 3000000, 10000)
+    return {
+        "id": i,
+        "age": rng.randint(18, 24),
+        "annual_income": income,
+        "is_student": rng.random() < 0.7,
+        "company_size": rng.choice(["small", "medium", "large"]),
+        "weekly_hours": rng.choice([10, 15, 20, 25, 30])
+    }
+
+
+def make_freelance_record(rng: random.Random, i: int) -> Dict:
+    """業務委託版の入力"""
+    revenue = rng.randrange(0, 8000000, 10000)
+    return {
+        "id": i,
+        "age": rng.randint(18, 30),
+        "annual_revenue": revenue,
+        "annual_expense": int(revenue * rng.uniform(0.05, 0.4)),
+        "tax_filing_type": rng.choice(["white", "blue10", "blue65"]),
+        "business_type": rng.choice(["writer", "designer", "engineer", "video_editor", "other"])
+    }
+
+
+def percentile(values: List[float], q: float) -> float:
+    """q 分位点（0〜1）"""
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+async def run_single(host: str, port: int, requests: int, concurrency: int, seed: int) -> Dict:
+    """単票のリクエストを concurrency 本の接続から並行して送る"""
+    rng = random.Random(seed)
+    bodies = [
+        ("/parttime", make_parttime_record(rng, i)) if i % 2 == 0 else ("/freelance", make_freelance_record(rng, i))
+        for i in range(requests)
+    ]
+    for _, body in bodies:
+        body.pop("id")
+    queue = iter(bodies)
+    latencies: List[float] = []
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        connection = Connection(host, port)
+        for path, body in queue:
+            started = time.perf_counter()
+            status, _, _ = await connection.request("POST", path, json.dumps(body).encode("utf-8"))
+            latencies.append(time.perf_counter() - started)
+            errors += status != 200
+        await connection.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": requests,
+        "errors": errors,
+        "perSecond": requests / elapsed,
+        "p50Ms": percentile(latencies, 0.5) * 1000,
+        "p95Ms": percentile(latencies, 0.95) * 1000,
+        "p99Ms": percentile(latencies, 0.99) * 1000
+    }
+
+
+async def run_batch(host: str, port: int, kind: str, rows: int, advice: bool, repeat: int, seed: int) -> Dict:
+    """一括計算のリクエストを順に送り、行数あたりの処理速度を求める"""
+    rng = random.Random(seed)
+    make = make_parttime_record if kind == "parttime" else make_freelance_record
+    body = "".join(json.dumps(make(rng, i)) + "\n" for i in range(rows)).encode("utf-8")
+    path = f"/batch/{kind}" + ("" if advice else "?advice=0")
+
+    connection = Connection(host, port)
+    times, first_bytes = [], []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        status, payload, first_byte = await connection.request("POST", path, body, "application/x-ndjson")
+        times.append(time.perf_counter() - started)
+        first_bytes.append(first_byte)
+        returned = payload.count(b"\n")
+        if status != 200 or returned != rows:
+            raise RuntimeError(f"{path} の応答が不正です（状態 {status}、{returned}行）")
+    await connection.close()
+
+    best = min(times)
+    return {
+        "rows": rows,
+        "rowsPerSecond": rows / best,
+        "bestSeconds": best,
+        "firstByteMs": statistics.median(first_bytes) * 1000
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers: int) -> Tuple[subprocess.Popen, str]:
+    """uvicorn で API を起動し、応答するまで待つ"""
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.api:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT,
+        env={**os.environ, "TAXCHECK_API_WORKERS": str(workers)}
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("uvicorn を起動できませんでした（pip install uvicorn）")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return process, f"http://127.0.0.1:{port}"
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("API が起動しませんでした")
+
+
+async def run(args) -> Dict:
+    url = urlsplit(args.url)
+    host, port = url.hostname, url.port or 80
+
+    results = {"single": await run_single(host, port, args.requests, args.concurrency, args.seed)}
+    for kind in ("parttime", "freelance"):
+        for advice in (True, False):
+            name = f"batch {kind}" + ("" if advice else " (advice=0)")
+            results[name] = await run_batch(host, port, kind, args.batch_rows, advice, args.batch_repeat, args.seed)
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="JSON HTTP API の負荷テスト")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="API の URL")
+    parser.add_argument("--serve", action="store_true", help="uvicorn で API を起動してから計測")
+    parser.add_argument("--workers", type=int, default=1, help="--serve 時の TAXCHECK_API_WORKERS")
+    parser.add_argument("--requests", type=int, default=2000, help="単票のリクエスト数")
+    parser.add_argument("--concurrency", type=int, default=32, help="単票の同時接続数")
+    parser.add_argument("--batch-rows", type=int, default=10000, help="一括計算1回の行数")
+    parser.add_argument("--batch-repeat", type=int, default=3, help="一括計算の繰り返し回数（最速を採用）")
+    parser.add_argument("--seed", type=int, default=20240101, help="入力生成の乱数シード")
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.serve:
+        server, args.url = start_server(args.workers)
+    try:
+        results = asyncio.run(run(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    single = results.pop("single")
+    print(f"=== API の負荷テスト（{args.url}） ===")
+    print(
+        f"単票 {single['requests']:,}件・同時{args.concurrency}接続: {single['perSecond']:,.0f}件/秒 "
+        f"p50 {single['p50Ms']:.1f}ms / p95 {single['p95Ms']:.1f}ms / p99 {single['p99Ms']:.1f}ms "
+        f"（エラー {single['errors']}件）"
+    )
+    print(f"{'一括計算':<32}{'行/秒':>12}{'1回の秒数':>12}{'最初の応答ms':>14}")
+    for name, result in results.items():
+        print(f"{name:<32}{result['rowsPerSecond']:>12,.0f}{result['bestSeconds']:>12.2f}{result['firstByteMs']:>14.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())